@@ -1 +1,2 @@
+from .async_directus import AsyncDirectus
 from .directus import Directus
@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import asyncio
+import mimetypes
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterator, AsyncIterator, Union
+
+from DirectusPyWrapper.cache import Validated
+from DirectusPyWrapper.directus_response import DirectusResponse, DirectusException
+
+CHUNK_SIZE = 1024 * 1024
+PART_SIZE = 16 * 1024 * 1024
+
+Destination = Union[str, os.PathLike, BinaryIO]
+
+
+def form_data_name(name: str) -> str:
+    # quotes and line breaks would end the header, they are percent-encoded as browsers do
+    return name.replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+class MultipartBody:
+    """
+    multipart/form-data body of a file upload, streamed from the file in chunks instead of read into memory.
+    It can be iterated again, so the request can be resent after a token refresh or a retry.
+    The fields come before the file, Directus ignores the fields that follow it.
+    """
+
+    def __init__(self, file: BinaryIO, filename: str, content_type: str | None = None, fields: dict = None,
+                 chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        head = b''
+        for name, value in (fields or {}).items():
+            head += (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{form_data_name(name)}"\r\n\r\n'
+                     f'{value}\r\n').encode()
+        head += (f'--{self.boundary}\r\nContent-Disposition: form-data; name="file"; '
+                 f'filename="{form_data_name(filename)}"\r\nContent-Type: {content_type}\r\n\r\n').encode()
+        self.head = head
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self.start = file.tell() if file.seekable() else None
+        if self.start is not None:
+            # requests reads the length from the `len` attribute, without it the body is sent chunked
+            self.len = len(self.head) + file.seek(0, os.SEEK_END) - self.start + len(self.tail)
+            file.seek(self.start)
+
+    @property
+    def headers(self) -> dict:
+        headers = {'Content-Type': f'multipart/form-data; boundary={self.boundary}'}
+        if hasattr(self, 'len'):
+            headers['Content-Length'] = str(self.len)
+        return headers
+
+    def _rewind(self):
+        if self.start is not None:
+            self.file.seek(self.start)
+
+    def __iter__(self) -> Iterator[bytes]:
+        self._rewind()
+        yield self.head
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+        yield self.tail
+
+
+class AsyncMultipartBody(MultipartBody):
+    # httpx sends anything iterable as a sync stream, which an AsyncClient refuses
+    __iter__ = None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # the file is read in a thread, so a slow disk doesn't block the event loop
+        await asyncio.to_thread(self._rewind)
+        yield self.head
+        while chunk := await asyncio.to_thread(self.file.read, self.chunk_size):
+            yield chunk
+        yield self.tail
+
+
+def open_upload(file: Destination) -> tuple[BinaryIO, str, bool]:
+    """
+    The file object, its name and whether it was opened here and has to be closed
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, 'rb'), os.path.basename(file), True
+    return file, os.path.basename(getattr(file, 'name', None) or 'file'), False
+
+
+def content_range_total(response) -> int | None:
+    # Content-Range: bytes 0-0/1234
+    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+    return int(total) if total.isdigit() else None
+
+
+def raise_for_status(response):
+    if response.status_code not in [200, 206]:
+        if hasattr(response, 'read'):
+            # httpx streamed responses have to be read before their json
+            response.read()
+        raise DirectusException(DirectusResponse(response))
+
+
+def range_validator(response) -> str | None:
+    # If-Range takes a strong ETag or the Last-Modified date
+    etag = response.headers.get('ETag')
+    return etag if etag and not etag.startswith('W/') else response.headers.get('Last-Modified')
+
+
+def if_range(validator: str | None) -> dict:
+    return {} if validator is None else {'If-Range': validator}
+
+
+def iter_chunks(response, chunk_size: int) -> Iterator[bytes]:
+    # requests.Response or, with the HTTP/2 transport, httpx.Response
+    return (getattr(response, 'iter_content', None) or response.iter_bytes)(chunk_size)
+
+
+class ResumeState:
+    """
+    The validator of a partial download, kept next to the file to resume it with If-Range,
+    so that an asset changed in the meantime is downloaded again from the start
+    """
+
+    def __init__(self, path: str):
+        self.path = f'{path}.validator'
+
+    def load(self) -> str | None:
+        try:
+            with open(self.path) as f:
+                return f.read() or None
+        except OSError:
+            return None
+
+    def save(self, response):
+        validator = range_validator(response)
+        if validator is None:
+            self.remove()
+            return
+        with open(self.path, 'w') as f:
+            f.write(validator)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class PartsState:
+    """
+    The parts of a parallel download that are already written, kept next to the file to resume it
+    """
+
+    def __init__(self, path: str, size: int, part_size: int, validator: str | None = None):
+        self.path = f'{path}.parts'
+        self.header = f'{size} {part_size} {validator or ""}'.rstrip()
+        self.done: set[int] = set()
+        self.lock = threading.Lock()
+
+    def load(self) -> bool:
+        try:
+            with open(self.path) as f:
+                header, *done = f.read().splitlines()
+        except (OSError, ValueError):
+            return False
+        if header != self.header:
+            return False
+        self.done = {int(start) for start in done if start.isdigit()}
+        return True
+
+    def create(self):
+        with open(self.path, 'w') as f:
+            f.write(f'{self.header}\n')
+
+    def mark(self, start: int):
+        with self.lock, open(self.path, 'a') as f:
+            f.write(f'{start}\n')
+
+    def remove(self):
+        os.remove(self.path)
+
+
+class AssetDownloader:
+    """
+    Streams assets to files in chunks of `chunk_size` bytes.
+
+    :param chunk_size: Bytes read from the response at a time
+    :param part_size: Bytes per Range request of a parallel download
+    """
+
+    def __init__(self, directus, chunk_size: int = CHUNK_SIZE, part_size: int = PART_SIZE):
+        self.directus = directus
+        self.chunk_size = chunk_size
+        self.part_size = part_size
+
+    def url(self, file_id: str) -> str:
+        return f'{self.directus.url}/assets/{file_id}'
+
+    def download(self, file_id: str, destination: Destination, resume: bool = False, parallel: int = 1,
+                 params: dict = None) -> int:
+        """
+        :param resume: Continue a previous download to the same path instead of starting over
+        :param parallel: Download the asset in parts of `part_size` bytes with this many concurrent Range requests
+        :return: The size of the file
+        """
+        url = self.url(file_id)
+        if parallel > 1 and isinstance(destination, (str, os.PathLike)):
+            size, validator = self._probe(url, params)
+            if size is not None and size > self.part_size:
+                return self._download_parts(url, os.fspath(destination), size, validator, resume, parallel, params)
+        return self._download_stream(url, destination, resume, params)
+
+    def _conditional(self, url: str, params: dict, path: str | None = None) -> tuple[str | None, Validated | None]:
+        # the key and the stored validators of an asset, for a path only if it still is the file that was downloaded
+        conditional = self.directus.conditional
+        if conditional is None:
+            return None, None
+        key = conditional.key('directus_files', self.directus.token, url, params, path)
+        entry = conditional.backend.get(key)
+        if entry is not None and path is not None and \
+                (not os.path.exists(path) or os.path.getsize(path) != entry.value):
+            entry = None
+        return key, entry
+
+    def fetch(self, file_id: str, params: dict = None):
+        """
+        The response with the whole asset, the stored one if the asset has not been modified since
+        """
+        url = self.url(file_id)
+        key, entry = self._conditional(url, params)
+        response = self.directus.request('get', url, params=params, headers=entry.headers if entry else None)
+        if key is None:
+            return response
+        if self.directus.conditional.is_not_modified(entry, response):
+            return entry.value
+        self.directus.conditional.store(key, response, response, 'directus_files')
+        return response
+
+    def _probe(self, url: str, params: dict) -> tuple[int | None, str | None]:
+        # the size of the asset, if the server supports Range requests, and its validator
+        response = self.directus.request('get', url, params=params, headers={'Range': 'bytes=0-0'}, stream=True)
+        try:
+            raise_for_status(response)
+            if response.status_code != 206:
+                return None, None
+            return content_range_total(response), range_validator(response)
+        finally:
+            response.close()
+
+    def _stream_request(self, url: str, params: dict, path: str | None,
+                        resume: bool) -> tuple[int, dict | None, ResumeState | None, str | None, Validated | None]:
+        # the offset, headers, resume state and conditional key and entry of a streamed download
+        state = ResumeState(path) if path is not None else None
+        offset = os.path.getsize(path) if resume and path is not None and os.path.exists(path) else 0
+        key, entry = self._conditional(url, params, path) if path is not None and not offset else (None, None)
+        if offset:
+            return offset, {'Range': f'bytes={offset}-', **if_range(state.load())}, state, key, entry
+        return offset, entry.headers if entry else None, state, key, entry
+
+    def _download_stream(self, url: str, destination: Destination, resume: bool, params: dict) -> int:
+        path = None if hasattr(destination, 'write') else os.fspath(destination)
+        offset, headers, state, key, entry = self._stream_request(url, params, path, resume)
+        response = self.directus.request('get', url, params=params, headers=headers, stream=True)
+        if response.status_code == 416 and offset:
+            response.close()
+            if content_range_total(response) == offset:
+                # the previous download was already complete
+                state.remove()
+                return offset
+            # the partial file is larger than the asset, it is downloaded again
+            return self._download_stream(url, destination, False, params)
+        try:
+            if key is not None and self.directus.conditional.is_not_modified(entry, response):
+                return entry.value
+            raise_for_status(response)
+            if response.status_code != 206:
+                # a whole asset, also when it changed since the partial download
+                offset = 0
+                if state is not None:
+                    state.save(response)
+            file = open(path, 'ab' if offset else 'wb') if path is not None else destination
+            try:
+                for chunk in iter_chunks(response, self.chunk_size):
+                    file.write(chunk)
+                    offset += len(chunk)
+            finally:
+                if path is not None:
+                    file.close()
+            if state is not None:
+                state.remove()
+            if key is not None:
+                self.directus.conditional.store(key, response, offset, 'directus_files')
+            return offset
+        finally:
+            response.close()
+
+    def _parts(self, path: str, size: int, validator: str | None, resume: bool) -> tuple[PartsState, list[int]]:
+        # the parts of a changed asset don't match the state, it is downloaded again
+        state = PartsState(path, size, self.part_size, validator)
+        if not (resume and os.path.exists(path) and state.load()):
+            with open(path, 'wb') as f:
+                f.truncate(size)
+            state.create()
+        return state, [start for start in range(0, size, self.part_size) if start not in state.done]
+
+    def _download_part(self, url: str, path: str, start: int, size: int, validator: str | None, params: dict,
+                       state: PartsState):
+        end = min(start + self.part_size, size) - 1
+        response = self.directus.request('get', url, params=params,
+                                         headers={'Range': f'bytes={start}-{end}', **if_range(validator)}, stream=True)
+        try:
+            raise_for_status(response)
+            if response.status_code != 206:
+                raise ValueError(f"The server ignored the Range request of {url}, or the asset changed")
+            with open(path, 'r+b') as file:
+                file.seek(start)
+                for chunk in iter_chunks(response, self.chunk_size):
+                    file.write(chunk)
+        finally:
+            response.close()
+        state.mark(start)
+
+    def _download_parts(self, url: str, path: str, size: int, validator: str | None, resume: bool, parallel: int,
+                        params: dict) -> int:
+        state, starts = self._parts(path, size, validator, resume)
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            for future in [executor.submit(self._download_part, url, path, start, size, validator, params, state)
+                           for start in starts]:
+                future.result()
+        state.remove()
+        return size
+
+    def download_many(self, files: dict[str, Destination], concurrency: int = 4, **options) -> dict[str, int]:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {file_id: executor.submit(self.download, file_id, destination, **options)
+                       for file_id, destination in files.items()}
+            return {file_id: future.result() for file_id, future in futures.items()}
+
+
+class AsyncAssetDownloader(AssetDownloader):
+    """
+    AssetDownloader for AsyncDirectus, the chunks are written in a thread so the event loop is not blocked
+    """
+
+    async def download(self, file_id: str, destination: Destination, resume: bool = False, parallel: int = 1,
+                       params: dict = None) -> int:
+        url = self.url(file_id)
+        if parallel > 1 and isinstance(destination, (str, os.PathLike)):
+            size, validator = await self._probe(url, params)
+            if size is not None and size > self.part_size:
+                return await self._download_parts(url, os.fspath(destination), size, validator, resume, parallel,
+                                                  params)
+        return await self._download_stream(url, destination, resume, params)
+
+    async def fetch(self, file_id: str, params: dict = None):
+        url = self.url(file_id)
+        key, entry = self._conditional(url, params)
+        response = await self.directus.request('get', url, params=params, headers=entry.headers if entry else None)
+        if key is None:
+            return response
+        if self.directus.conditional.is_not_modified(entry, response):
+            return entry.value
+        self.directus.conditional.store(key, response, response, 'directus_files')
+        return response
+
+    async def _probe(self, url: str, params: dict) -> tuple[int | None, str | None]:
+        response = await self.directus.request('get', url, params=params, headers={'Range': 'bytes=0-0'},
+                                               stream=True)
+        try:
+            await _araise_for_status(response)
+            if response.status_code != 206:
+                return None, None
+            return content_range_total(response), range_validator(response)
+        finally:
+            await response.aclose()
+
+    async def _download_stream(self, url: str, destination: Destination, resume: bool, params: dict) -> int:
+        path = None if hasattr(destination, 'write') else os.fspath(destination)
+        offset, headers, state, key, entry = self._stream_request(url, params, path, resume)
+        response = await self.directus.request('get', url, params=params, headers=headers, stream=True)
+        if response.status_code == 416 and offset:
+            await response.aclose()
+            if content_range_total(response) == offset:
+                state.remove()
+                return offset
+            return await self._download_stream(url, destination, False, params)
+        try:
+            if key is not None and self.directus.conditional.is_not_modified(entry, response):
+                return entry.value
+            await _araise_for_status(response)
+            if response.status_code != 206:
+                offset = 0
+                if state is not None:
+                    state.save(response)
+            file = await asyncio.to_thread(open, path, 'ab' if offset else 'wb') if path is not None else destination
+            try:
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    await asyncio.to_thread(file.write, chunk)
+                    offset += len(chunk)
+            finally:
+                if path is not None:
+                    await asyncio.to_thread(file.close)
+            if state is not None:
+                state.remove()
+            if key is not None:
+                self.directus.conditional.store(key, response, offset, 'directus_files')
+            return offset
+        finally:
+            await response.aclose()
+
+    async def _download_part(self, url: str, path: str, start: int, size: int, validator: str | None,
+                             params: dict, state: PartsState):
+        end = min(start + self.part_size, size) - 1
+        response = await self.directus.request('get', url, params=params,
+                                               headers={'Range': f'bytes={start}-{end}', **if_range(validator)},
+                                               stream=True)
+        try:
+            await _araise_for_status(response)
+            if response.status_code != 206:
+                raise ValueError(f"The server ignored the Range request of {url}, or the asset changed")
+            file = await asyncio.to_thread(open, path, 'r+b')
+            try:
+                await asyncio.to_thread(file.seek, start)
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    await asyncio.to_thread(file.write, chunk)
+            finally:
+                await asyncio.to_thread(file.close)
+        finally:
+            await response.aclose()
+        state.mark(start)
+
+    async def _download_parts(self, url: str, path: str, size: int, validator: str | None, resume: bool,
+                              parallel: int, params: dict) -> int:
+        state, starts = self._parts(path, size, validator, resume)
+        semaphore = asyncio.Semaphore(parallel)
+
+        async def download_part(start: int):
+            async with semaphore:
+                await self._download_part(url, path, start, size, validator, params, state)
+
+        await asyncio.gather(*[download_part(start) for start in starts])
+        state.remove()
+        return size
+
+    async def download_many(self, files: dict[str, Destination], concurrency: int = 4, **options) -> dict[str, int]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def download(file_id: str, destination: Destination) -> int:
+            async with semaphore:
+                return await self.download(file_id, destination, **options)
+
+        sizes = await asyncio.gather(*[download(file_id, destination) for file_id, destination in files.items()])
+        return dict(zip(files, sizes))
+
+
+async def _araise_for_status(response):
+    if response.status_code not in [200, 206]:
+        await response.aread()
+        raise DirectusException(DirectusResponse(response))
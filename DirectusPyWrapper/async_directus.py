@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from typing import Optional
+
+import httpx
+
+from DirectusPyWrapper.async_directus_request import AsyncDirectusRequest
+from DirectusPyWrapper.assets import AsyncAssetDownloader, AsyncMultipartBody, Destination, open_upload, \
+    CHUNK_SIZE, PART_SIZE
+from DirectusPyWrapper.bulk import BulkReport
+from DirectusPyWrapper.cache import ResponseCache, ConditionalCache
+from DirectusPyWrapper.directus_batch import AsyncDirectusBatch
+from DirectusPyWrapper.directus_response import DirectusResponse, DirectusException
+from DirectusPyWrapper.instrumentation import Instrumentation
+from DirectusPyWrapper.json_codec import JsonCodec, get_codec
+from DirectusPyWrapper.loader import AsyncDataLoader
+from DirectusPyWrapper.models import User
+from DirectusPyWrapper.realtime import Realtime
+from DirectusPyWrapper.retry import RetryPolicy, TokenBucket
+from DirectusPyWrapper.transport import create_async_client
+from DirectusPyWrapper.translations import AsyncTranslationCache, parse_translations, translations_request
+
+
+class AsyncBearerAuth(httpx.Auth):
+    def __init__(self, token: str):
+        self.token = token
+
+    def auth_flow(self, request):
+        if self.token is not None:
+            request.headers["authorization"] = f"Bearer {self.token}"
+        yield request
+
+
+class AsyncDirectus:
+    """
+    Async counterpart of Directus, backed by an httpx.AsyncClient.
+
+    Login is not performed in the constructor, either await login() or use the client as an async context manager:
+
+        async with AsyncDirectus(url, email, password) as directus:
+            response = await directus.items("directus_users").read()
+    """
+
+    def __init__(self, url, email=None, password=None, token=None, refresh_token=None,
+                 session: httpx.AsyncClient = None, cache: ResponseCache = None, codec: str | JsonCodec = None,
+                 refresh_margin: float = 30, retry: RetryPolicy = None, rate_limiter: TokenBucket = None,
+                 timeout: float | httpx.Timeout | None = None, pool_size: int = None, max_keepalive: int = None,
+                 keepalive_expiry: float = 5.0, http2: bool = False, instrumentation: Instrumentation = None,
+                 conditional: ConditionalCache = None):
+        self.expires = None
+        self.expiration_time = None
+        self.refresh_token = refresh_token
+        self.url: str = url
+        self._token: Optional[str] = None
+        self.email = email
+        self.password = password
+        self.static_token = token
+        self.session = session or create_async_client(timeout, pool_size, max_keepalive, keepalive_expiry, http2)
+        self.auth = AsyncBearerAuth(self._token)
+        self.token = self.static_token or None
+        self._user: User | None = None
+        self.cache: ResponseCache | None = cache
+        self.conditional: ConditionalCache | None = conditional
+        self.codec: JsonCodec = get_codec(codec)
+        self.refresh_margin = refresh_margin
+        self._refresh_lock = asyncio.Lock()
+        self.retry: RetryPolicy | None = retry
+        self.rate_limiter: TokenBucket | None = rate_limiter
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.translations: AsyncTranslationCache = AsyncTranslationCache(self)
+
+    def collection(self, directus_collection) -> AsyncDirectusRequest:
+        assert directus_collection.Config.collection is not None
+        return self.items(directus_collection.Config.collection, directus_collection)
+
+    def items(self, collection, directus_collection=None) -> AsyncDirectusRequest:
+        return AsyncDirectusRequest(self, collection, directus_collection)
+
+    def batch(self) -> AsyncDirectusBatch:
+        """
+        Collect several reads and send them in a single GraphQL request, see AsyncDirectusBatch
+        """
+        return AsyncDirectusBatch(self)
+
+    def loader(self, **options) -> AsyncDataLoader:
+        """
+        A AsyncDataLoader coalescing the reads by id, create one per unit of work since it memoizes the items
+
+        :param options: The AsyncDataLoader options, window, max_batch, primary_keys, fields
+        """
+        return AsyncDataLoader(self, **options)
+
+    def realtime(self, **options) -> Realtime:
+        """
+        Subscriptions to the changes of collections over the realtime WebSocket API, see Realtime
+
+        :param options: The Realtime options, url, reconnect_delay, max_reconnect_delay, heartbeat
+        """
+        return Realtime(self, **options)
+
+    async def read_me(self):
+        return await AsyncDirectusRequest(self, "directus_users").read("me")
+
+    async def read_settings(self):
+        return await AsyncDirectusRequest(self, "directus_settings").read(method='get')
+
+    async def update_settings(self, data):
+        return await AsyncDirectusRequest(self, "directus_settings").update_one(None, data)
+
+    async def read_translations(self) -> dict[str, dict[str, str]]:
+        response = await translations_request(self).read()
+        return parse_translations(response.items)
+
+    async def download_file(self, file_id: str, destination: Destination = None, resume: bool = False,
+                            parallel: int = 1, params: dict = None, chunk_size: int = CHUNK_SIZE,
+                            part_size: int = PART_SIZE):
+        """
+        Download an asset to `destination`, a path or a binary file object, in chunks of `chunk_size` bytes.
+        Without a destination the response is returned with the whole file in memory.
+        With a ConditionalCache the asset is downloaded again only if it was modified since the last download.
+
+        :param resume: Continue a previous download to the same path, with a Range request from its current size
+                               and If-Range, so that a changed asset is downloaded from the start
+        :param parallel: Download large assets to a path in parts of `part_size` bytes,
+                         with this many concurrent Range requests
+        :param params: Transformations of the asset, e.g. {"key": "thumbnail"} or {"width": 200, "format": "webp"}
+
+        :return: The size of the downloaded file
+        """
+        if destination is None:
+            return await AsyncAssetDownloader(self, chunk_size, part_size).fetch(file_id, params)
+        downloader = AsyncAssetDownloader(self, chunk_size, part_size)
+        return await downloader.download(file_id, destination, resume, parallel, params)
+
+    async def download_files(self, files: dict[str, Destination], concurrency: int = 4,
+                             **options) -> dict[str, int]:
+        """
+        Download several assets concurrently
+
+        :param files: The destination of every file id
+        :param options: The options of download_file
+        """
+        downloader = AsyncAssetDownloader(self, options.pop('chunk_size', CHUNK_SIZE),
+                                          options.pop('part_size', PART_SIZE))
+        return await downloader.download_many(files, concurrency, **options)
+
+    async def upload_file(self, file: Destination, filename: str = None, content_type: str = None,
+                          chunk_size: int = CHUNK_SIZE, **fields) -> DirectusResponse:
+        """
+        Upload a file to /files, streamed from disk in chunks instead of read into memory
+
+        :param file: A path or a binary file object
+        :param filename: The name of the file, by default the name of the path
+        :param content_type: By default guessed from the filename
+        :param fields: Fields of the directus_files item, e.g. title="Cover", folder=folder_id
+        """
+        file, name, close = open_upload(file)
+        body = AsyncMultipartBody(file, filename or name, content_type, fields, chunk_size)
+        try:
+            response = await self.request('post', f'{self.url}/files', content=body, headers=body.headers)
+        finally:
+            if close:
+                file.close()
+        AsyncDirectusRequest(self, 'directus_files')._invalidate_cache()
+        return DirectusResponse(response, codec=self.codec)
+
+    async def create_translations(self, keys: list[str]) -> BulkReport:
+        return await self.translations.create(keys)
+
+    async def _send(self, method: str, url: str, json=None, stream: bool = False, **kwargs) -> httpx.Response:
+        if json is not None:
+            kwargs['content'] = self.codec.dumps(json)
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+        auth = kwargs.pop('auth', self.auth)
+        request = self.session.build_request(method, url, **kwargs)
+        return await self.session.send(request, auth=auth, stream=stream)
+
+    async def request(self, method: str, url: str, json=None, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Send a request authenticated as this client, `json` is encoded with the client's codec.
+        With `stream` the body is not read, the caller has to read and close the response.
+        The token is refreshed shortly before it expires, and once more if the server still rejects it as expired.
+        Failed requests are retried according to the retry policy of the client.
+        """
+        if self.instrumentation is None:
+            return await self._request(method, url, json, stream, None, **kwargs)
+        metrics = self.instrumentation.start(method, url, kwargs)
+        kwargs['extensions'] = {'trace': metrics.atrace}
+        try:
+            response = await self._request(method, url, json, stream, metrics, **kwargs)
+        except Exception as e:
+            self.instrumentation.finish(metrics, error=e)
+            raise
+        self.instrumentation.finish(metrics, response)
+        return response
+
+    async def _request(self, method: str, url: str, json=None, stream: bool = False, metrics=None,
+                       **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self._request_once(method, url, json, stream, **kwargs)
+            except httpx.TransportError:
+                if self.retry is None or not self.retry.should_retry(method, attempt):
+                    raise
+                delay = self.retry.backoff(attempt)
+            else:
+                if self.retry is None or not self.retry.should_retry(method, attempt, response.status_code):
+                    return response
+                delay = self.retry.backoff(attempt, response.headers.get('Retry-After'))
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+            if metrics is not None:
+                metrics.retries = attempt
+
+    async def _request_once(self, method: str, url: str, json=None, stream: bool = False,
+                            **kwargs) -> httpx.Response:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        await self._refresh_if_expiring()
+        token = self.token
+        response = await self._send(method, url, json, stream, **kwargs)
+        if response.status_code == 401 and self._can_refresh:
+            await response.aclose()
+            await self._refresh_once(token)
+            response = await self._send(method, url, json, stream, **kwargs)
+        return response
+
+    @property
+    def _can_refresh(self) -> bool:
+        return not self.static_token and (self.refresh_token is not None or bool(self.email and self.password))
+
+    def _is_expiring(self) -> bool:
+        return self.expiration_time is not None and \
+            datetime.datetime.now() >= self.expiration_time - datetime.timedelta(seconds=self.refresh_margin)
+
+    async def _refresh_if_expiring(self):
+        if self._can_refresh and self._is_expiring():
+            async with self._refresh_lock:
+                if self._is_expiring():
+                    await self._renew()
+
+    async def _refresh_once(self, token: str | None):
+        async with self._refresh_lock:
+            if self.token == token:
+                await self._renew()
+
+    async def _renew(self):
+        try:
+            await self.refresh()
+        except DirectusException:
+            if not (self.email and self.password):
+                raise
+            await self.login()
+
+    async def __aenter__(self):
+        if self.email and self.password:
+            await self.login()
+        return self
+
+    @property
+    def token(self):
+        return self._token
+
+    @token.setter
+    def token(self, token):
+        self._token = token
+        self.auth = AsyncBearerAuth(self._token)
+
+    @property
+    def user(self):
+        """
+        Awaitable, `user = await directus.user`
+        """
+        return self._read_user()
+
+    async def _read_user(self) -> User:
+        if self._user is None:
+            self._user = User(**(await self.read_me()).item)
+        return self._user
+
+    async def login(self):
+
+        if self.static_token:
+            self.token = self.static_token
+            return
+
+        url = f'{self.url}/auth/login'
+        payload = {
+            'email': self.email,
+            'password': self.password
+        }
+
+        r = await self._send("post", url, json=payload, auth=None)
+        response = DirectusResponse(r, codec=self.codec)
+        self.token = response.item['access_token']
+        self.refresh_token = response.item['refresh_token']
+        self.expires = response.item['expires']  # in milliseconds
+        self.expiration_time: datetime.datetime = datetime.datetime.now() + datetime.timedelta(
+            milliseconds=self.expires)
+
+    async def refresh(self):
+        url = f'{self.url}/auth/refresh'
+        payload = {
+            'refresh_token': self.refresh_token,
+            "mode": "json"
+        }
+        r = await self._send("post", url, json=payload, auth=None)
+        response = DirectusResponse(r, codec=self.codec)
+        self.token = response.item['access_token']
+        self.refresh_token = response.item['refresh_token']
+        self.expires = response.item['expires']
+        self.expiration_time = datetime.datetime.now() + datetime.timedelta(milliseconds=self.expires)
+
+    async def logout(self):
+        url = f'{self.url}/auth/logout'
+        response = await self.session.post(url, auth=self.auth)
+        self.session.auth = None
+        return response.status_code == 200
+
+    async def close_session(self):
+        await self.session.aclose()
+
+    async def __aexit__(self, *args):
+        await self.logout()
+        await self.close_session()
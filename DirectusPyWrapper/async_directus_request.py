@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, AsyncIterator, Iterable
+
+from DirectusPyWrapper.bulk import AsyncBulkWriter, BulkReport
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.directus_response import DirectusResponse
+from DirectusPyWrapper.directus_stream_response import AsyncDirectusStreamResponse
+
+
+class AsyncDirectusRequest(DirectusRequest):
+    """
+    Async counterpart of DirectusRequest.
+    The builder methods (filter, sort, fields, limit, aggregate, ...) are inherited unchanged,
+    only the methods that hit the network are awaitable.
+    """
+
+    def __init__(self, directus: "AsyncDirectus", collection: str, collection_class=None):
+        super().__init__(directus, collection, collection_class)
+
+    async def read(self, id: Optional[int | str] = None, method="search",
+                   stream: bool = False) -> DirectusResponse | AsyncDirectusStreamResponse:
+        return await self._read(self._query(), id, method, stream)
+
+    async def _read(self, query: dict, id: Optional[int | str] = None, method="search", stream: bool = False,
+                    body: bytes = None, query_params: dict = None) -> DirectusResponse | AsyncDirectusStreamResponse:
+        method = "get" if id is not None else method
+        cached, cache_key = self._cached(id, method, query if body is None else body, stream)
+        if cached is not None:
+            return cached
+        method, url, kwargs = self._read_request(query, id, method, body, query_params)
+        if 'data' in kwargs:
+            # httpx takes raw bytes as content
+            kwargs['content'] = kwargs.pop('data')
+        entry, conditional_key = self._prepare_conditional(id, method, query if body is None else body, stream, kwargs)
+        response = await self.directus.request(method, url, stream=stream, **kwargs)
+        if stream:
+            return await AsyncDirectusStreamResponse.create(response, query=query, collection=self.collection_class)
+        if conditional_key is not None and self.directus.conditional.is_not_modified(entry, response):
+            response = entry.value._with_metrics(getattr(response, 'directus_metrics', None))
+        else:
+            response = self._response(response, query=query)
+            if conditional_key is not None:
+                self.directus.conditional.store(conditional_key, response.response, response, self.collection)
+        if cache_key is not None:
+            self.directus.cache.set(cache_key, response, self.collection)
+        return response
+
+    async def create_one(self, item: dict) -> DirectusResponse:
+        response = await self.directus.request("post", self.uri, json=item)
+        self._invalidate_cache()
+        return self._response(response)
+
+    async def create_many(self, items: list[dict]) -> DirectusResponse:
+        response = await self.directus.request("post", self.uri, json=items)
+        self._invalidate_cache()
+        return self._response(response)
+
+    async def update_one(self, id: int | str | None, item: dict) -> DirectusResponse:
+        if id is None:
+            response = await self.directus.request("patch", self.uri, json=item)
+        else:
+            response = await self.directus.request("patch", f'{self.uri}/{id}', json=item)
+        self._invalidate_cache()
+        return self._response(response)
+
+    async def update_many(self, ids: list[int | str], items) -> DirectusResponse:
+        payload = {
+            "keys": ids,
+            "data": items
+        }
+        response = await self.directus.request("patch", self.uri, json=payload)
+        self._invalidate_cache()
+        return self._response(response)
+
+    async def update_batch(self, items: list[dict]) -> DirectusResponse:
+        response = await self.directus.request("patch", self.uri, json=items)
+        self._invalidate_cache()
+        return self._response(response)
+
+    async def delete_one(self, id: int | str) -> DirectusResponse:
+        response = await self.directus.request("delete", f'{self.uri}/{id}')
+        self._invalidate_cache()
+        return self._response(response)
+
+    async def delete_many(self, ids: list[int | str]) -> DirectusResponse:
+        response = await self.directus.request("delete", self.uri, json=ids)
+        self._invalidate_cache()
+        return self._response(response)
+
+    async def iter_pages(self, page_size: int = 100, keyset: str | None = None) -> AsyncIterator[DirectusResponse]:
+        page, last = 1, None
+        while True:
+            response = await self._page_request(page_size, page, keyset, last).read()
+            data = response.items_as_dict() or []
+            if not data:
+                return
+            yield response
+            if len(data) < page_size:
+                return
+            page += 1
+            if keyset is not None:
+                last = data[-1][keyset]
+
+    async def iter_items(self, page_size: int = 100, keyset: str | None = None) -> AsyncIterator[dict | object]:
+        async for response in self.iter_pages(page_size, keyset):
+            for item in response.items:
+                yield item
+
+    async def iter_rows(self, page_size: int = 1000, keyset: str | None = None) -> AsyncIterator[tuple]:
+        async for response in self.iter_pages(page_size, keyset):
+            for row in response.items_as_rows():
+                yield row
+
+    async def iter_batches(self, page_size: int = 1000, keyset: str | None = None) -> AsyncIterator:
+        async for response in self.iter_pages(page_size, keyset):
+            for batch in response.to_arrow().to_batches():
+                yield batch
+
+    async def read_arrow(self, page_size: int = 1000, keyset: str | None = None):
+        from DirectusPyWrapper.columnar import concat_batches
+        return concat_batches([batch async for batch in self.iter_batches(page_size, keyset)])
+
+    async def read_all(self, concurrency: int = 4, page_size: int = 1000) -> DirectusResponse:
+        first = await self._first_page_request(page_size).read()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def read_page(request: AsyncDirectusRequest) -> DirectusResponse:
+            async with semaphore:
+                return await request.read()
+
+        rest = await asyncio.gather(*[read_page(request) for request in self._rest_page_requests(first, page_size)])
+        return self._merge_pages(first, rest)
+
+    async def bulk_create(self, items: Iterable[dict], **options) -> BulkReport:
+        return await AsyncBulkWriter(**self._bulk_options(options, idempotent=False)).run(items, self.create_many)
+
+    async def bulk_update(self, items: Iterable[dict], **options) -> BulkReport:
+        return await AsyncBulkWriter(**self._bulk_options(options)).run(items, self.update_batch)
+
+    async def bulk_delete(self, ids: Iterable[int | str], **options) -> BulkReport:
+        return await AsyncBulkWriter(**self._bulk_options(options)).run(ids, self.delete_many)
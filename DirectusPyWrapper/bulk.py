@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, Awaitable
+
+import httpx
+import requests
+
+from DirectusPyWrapper.directus_response import DirectusResponse, DirectusException
+
+
+class ChunkResult:
+    """
+    Outcome of one chunk of a bulk write
+
+    :param offset: Position of the first item of the chunk in the input
+    :param size: Number of items in the chunk
+    :param response: The response, if the chunk succeeded
+    :param error: The last exception, if the chunk failed
+    :param items: The items of the chunk, kept only when it failed
+    :param attempts: How many times the chunk was sent
+    """
+
+    def __init__(self, offset: int, size: int, response: DirectusResponse | None = None,
+                 error: Exception | None = None, items: list | None = None, attempts: int = 1):
+        self.offset = offset
+        self.size = size
+        self.response = response
+        self.error = error
+        self.items = items
+        self.attempts = attempts
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def ids(self) -> list:
+        if self.response is None:
+            return []
+        return [item['id'] for item in self.response.items_as_dict() or [] if isinstance(item, dict) and 'id' in item]
+
+    def __repr__(self):
+        status = 'ok' if self.ok else f'failed ({self.error})'
+        return f'ChunkResult(offset={self.offset}, size={self.size}, {status})'
+
+
+class BulkReport:
+    def __init__(self, chunks: list[ChunkResult]):
+        self.chunks = sorted(chunks, key=lambda chunk: chunk.offset)
+
+    @property
+    def succeeded(self) -> list[ChunkResult]:
+        return [chunk for chunk in self.chunks if chunk.ok]
+
+    @property
+    def failed(self) -> list[ChunkResult]:
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def ids(self) -> list:
+        return [id for chunk in self.succeeded for id in chunk.ids]
+
+    @property
+    def errors(self) -> list[Exception]:
+        return [chunk.error for chunk in self.failed]
+
+    def __repr__(self):
+        return f'BulkReport({len(self.succeeded)} succeeded, {len(self.failed)} failed chunks)'
+
+
+# the errors of a chunk that end up in the report, any other exception is raised
+WRITE_ERRORS = (DirectusException, requests.RequestException, httpx.HTTPError)
+
+
+def is_retryable(error: Exception, idempotent: bool = True) -> bool:
+    if isinstance(error, DirectusException):
+        # a 429 was rejected before being processed, after a 5xx the items may have been written anyway
+        return error.status_code == 429 or (idempotent and error.status_code >= 500)
+    return idempotent and isinstance(error, (requests.RequestException, httpx.TransportError))
+
+
+def _checked(response: DirectusResponse) -> DirectusResponse:
+    # an error without a json body (e.g. the html page of a 502) is not raised by DirectusResponse
+    if response.is_error:
+        raise DirectusException(response)
+    return response
+
+
+def is_client_error(error: Exception) -> bool:
+    return isinstance(error, DirectusException) and 400 <= error.status_code < 500 and error.status_code != 429
+
+
+class BulkWriter:
+    """
+    Splits the items in chunks and sends them with bounded concurrency.
+    The input is consumed lazily, so at most `concurrency` chunks are held in memory.
+
+    :param batch_size: Maximum number of items per chunk
+    :param max_bytes: Maximum encoded size of a chunk, None for no limit
+    :param concurrency: Number of chunks sent at the same time
+    :param retries: How many times a chunk is resent after a server or network error
+    :param idempotent: Whether the chunks can be sent twice, if not only a 429 is retried, as in RetryPolicy
+    :param retry_delay: Seconds before the first retry, doubled on every retry
+    :param isolate_failures: When a chunk is rejected by the server (4xx), split it in halves and send them again,
+                             so that only the bad items end up in the failed chunks
+    :param codec: Used to measure the size of the items when max_bytes is set
+    """
+
+    def __init__(self, batch_size: int = 100, max_bytes: int | None = None, concurrency: int = 4,
+                 retries: int = 2, retry_delay: float = 0.5, isolate_failures: bool = False, codec=None,
+                 idempotent: bool = True):
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.isolate_failures = isolate_failures
+        self.codec = codec
+        self.idempotent = idempotent
+
+    def chunks(self, items: Iterable) -> Iterator[tuple[int, list]]:
+        offset, chunk, chunk_bytes = 0, [], 0
+        for item in items:
+            item_bytes = len(self.codec.dumps(item)) + 1 if self.max_bytes is not None else 0
+            if chunk and (len(chunk) >= self.batch_size or
+                          (self.max_bytes is not None and chunk_bytes + item_bytes > self.max_bytes)):
+                yield offset, chunk
+                offset, chunk, chunk_bytes = offset + len(chunk), [], 0
+            chunk.append(item)
+            chunk_bytes += item_bytes
+        if chunk:
+            yield offset, chunk
+
+    def _send(self, send: Callable[[list], DirectusResponse], offset: int, chunk: list) -> list[ChunkResult]:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return [ChunkResult(offset, len(chunk), response=_checked(send(chunk)), attempts=attempt)]
+            except WRITE_ERRORS as e:
+                if is_retryable(e, self.idempotent) and attempt <= self.retries:
+                    time.sleep(self.retry_delay * 2 ** (attempt - 1))
+                    continue
+                if self.isolate_failures and is_client_error(e) and len(chunk) > 1:
+                    half = len(chunk) // 2
+                    return self._send(send, offset, chunk[:half]) + self._send(send, offset + half, chunk[half:])
+                return [ChunkResult(offset, len(chunk), error=e, items=chunk, attempts=attempt)]
+
+    def run(self, items: Iterable, send: Callable[[list], DirectusResponse]) -> BulkReport:
+        results, pending = [], set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for offset, chunk in self.chunks(items):
+                if len(pending) >= self.concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results.extend(future.result())
+                pending.add(executor.submit(self._send, send, offset, chunk))
+            for future in pending:
+                results.extend(future.result())
+        return BulkReport(results)
+
+
+class AsyncBulkWriter(BulkWriter):
+    async def _send(self, send: Callable[[list], Awaitable[DirectusResponse]], offset: int,
+                    chunk: list) -> list[ChunkResult]:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return [ChunkResult(offset, len(chunk), response=_checked(await send(chunk)), attempts=attempt)]
+            except WRITE_ERRORS as e:
+                if is_retryable(e, self.idempotent) and attempt <= self.retries:
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+                    continue
+                if self.isolate_failures and is_client_error(e) and len(chunk) > 1:
+                    half = len(chunk) // 2
+                    return (await self._send(send, offset, chunk[:half])) + \
+                        (await self._send(send, offset + half, chunk[half:]))
+                return [ChunkResult(offset, len(chunk), error=e, items=chunk, attempts=attempt)]
+
+    async def run(self, items: Iterable, send: Callable[[list], Awaitable[DirectusResponse]]) -> BulkReport:
+        results: list[ChunkResult] = []
+        pending: set[asyncio.Task] = set()
+        for offset, chunk in self.chunks(items):
+            if len(pending) >= self.concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results.extend(task.result())
+            pending.add(asyncio.create_task(self._send(send, offset, chunk)))
+        for task in pending:
+            results.extend(await task)
+        return BulkReport(results)
+
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by the ResponseCache.
+    Implement this to keep the responses in a shared cache, values must be stored per collection
+    so that all the entries of a collection can be dropped when it is written to.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, collection: str, ttl: float | None = None):
+        pass
+
+    @abstractmethod
+    def invalidate(self, collection: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """
+    In process LRU backend, keeping at most `max_size` entries
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[Any, str, float | None]] = OrderedDict()
+        self._keys: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            value, collection, expires_at = self._entries[key]
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, collection: str, ttl: float | None = None):
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, collection, expires_at)
+            self._keys.setdefault(collection, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, collection: str):
+        with self._lock:
+            for key in self._keys.pop(collection, set()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+
+    def _remove(self, key: str):
+        _, collection, _ = self._entries.pop(key)
+        keys = self._keys.get(collection)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[collection]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResponseCache:
+    """
+    Read-through cache for DirectusRequest.read
+
+    Responses are keyed on the collection, the query and the identity of the client (its token),
+    and dropped whenever the same client creates, updates or deletes items of the collection.
+
+    :param backend: Where the responses are stored, defaults to an in-memory LRU
+    :param ttl: Default time to live in seconds, None for no expiration
+    :param collection_ttls: Time to live per collection, overriding the default one
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttl: float | None = None,
+                 collection_ttls: dict[str, float] = None):
+        self.backend = backend or MemoryCache()
+        self.ttl = ttl
+        self.collection_ttls = collection_ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(collection: str, identity: str | None, *query: Any) -> str:
+        serialized = json.dumps([identity, *query], sort_keys=True, default=str)
+        return f'{collection}:{hashlib.sha256(serialized.encode()).hexdigest()}'
+
+    def get(self, key: str) -> Any | None:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, collection: str):
+        self.backend.set(key, value, collection, self.collection_ttls.get(collection, self.ttl))
+
+    def invalidate(self, collection: str):
+        self.backend.invalidate(collection)
+
+    def clear(self):
+        self.backend.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class Validated:
+    """
+    A stored response with the validators the server sent along with it
+    """
+    __slots__ = ('etag', 'last_modified', 'value')
+
+    def __init__(self, etag: str | None, last_modified: str | None, value: Any):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.value = value
+
+    @property
+    def headers(self) -> dict:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ConditionalCache:
+    """
+    Remembers the ETag and Last-Modified of the responses to reads and asset downloads, and sends them back as
+    If-None-Match and If-Modified-Since. When the server answers 304 Not Modified the stored response is returned,
+    without downloading or parsing the body again.
+
+    Unlike the ResponseCache every read still reaches the server, so the data is never stale.
+
+    :param backend: Where the responses are stored, defaults to an in-memory LRU
+    """
+
+    def __init__(self, backend: CacheBackend = None):
+        self.backend = backend or MemoryCache()
+        self.not_modified = 0
+        self.modified = 0
+        self._lock = threading.Lock()
+
+    key = staticmethod(ResponseCache.key)
+
+    def prepare(self, key: str, headers: dict | None) -> tuple[Validated | None, dict | None]:
+        """
+        The stored entry of the key and the request headers with its validators
+        """
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, headers
+        return entry, {**(headers or {}), **entry.headers}
+
+    def is_not_modified(self, entry: Validated | None, response) -> bool:
+        not_modified = entry is not None and response.status_code == 304
+        with self._lock:
+            if not_modified:
+                self.not_modified += 1
+            elif entry is not None:
+                self.modified += 1
+        return not_modified
+
+    def store(self, key: str, response, value: Any, collection: str):
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag is not None or last_modified is not None):
+            self.backend.set(key, Validated(etag, last_modified, value), collection)
+
+    def invalidate(self, collection: str):
+        self.backend.invalidate(collection)
+
+    def clear(self):
+        self.backend.clear()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import types
+from typing import Any, Iterable, Sequence, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+
+def _pyarrow():
+    # pyarrow is optional, only these exports need it
+    import pyarrow
+    return pyarrow
+
+
+def _arrow_type(annotation) -> Any | None:
+    """
+    The Arrow type of a model field, None to let Arrow infer it
+    """
+    pa = _pyarrow()
+    if get_origin(annotation) in (Union, getattr(types, 'UnionType', Union)):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _arrow_type(args[0]) if len(args) == 1 else None
+    return {bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string(),
+            decimal.Decimal: pa.string(), datetime.datetime: pa.timestamp('ms', tz='UTC'),
+            datetime.date: pa.date32()}.get(annotation)
+
+
+def arrow_types(names: Sequence[str], T=None) -> dict[str, Any]:
+    """
+    The Arrow types of the fields, from the annotations of T when it is a pydantic model
+    """
+    if not (isinstance(T, type) and issubclass(T, BaseModel)):
+        return {}
+    types_ = {}
+    for name, field in T.model_fields.items():
+        key = field.alias or name
+        if key in names and (arrow_type := _arrow_type(field.annotation)) is not None:
+            types_[key] = arrow_type
+    return types_
+
+
+def arrow_column(values: list, arrow_type=None):
+    """
+    An Arrow array of the values of a field. Directus sends dates as strings, so they are parsed by Arrow.
+    """
+    pa = _pyarrow()
+    if arrow_type is None:
+        return pa.array(values)
+    if pa.types.is_timestamp(arrow_type) or pa.types.is_date(arrow_type):
+        strings = pa.array(values, pa.string())
+        try:
+            return strings.cast(arrow_type)
+        except pa.ArrowInvalid:
+            # "datetime" fields have no zone, "timestamp" fields are in UTC
+            return strings.cast(pa.timestamp('ms')) if pa.types.is_timestamp(arrow_type) else pa.array(values)
+    errors = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError)
+    try:
+        return pa.array(values, arrow_type)
+    except errors:
+        pass
+    # bigInteger and decimal fields come as strings, which Arrow parses when casting
+    try:
+        return pa.array(values).cast(arrow_type)
+    except errors:
+        pass
+    # mixed values are converted one by one, as pydantic would
+    python_type = {pa.bool_(): bool, pa.int64(): int, pa.float64(): float}.get(arrow_type)
+    convert = TypeAdapter(python_type).validate_python if python_type is not None else str
+    return pa.array([None if value is None else convert(value) for value in values], arrow_type)
+
+
+def record_batch(data: list[dict], names: Sequence[str], T=None):
+    """
+    An Arrow RecordBatch of the items, built column by column straight from the decoded data
+    """
+    pa = _pyarrow()
+    types_ = arrow_types(names, T)
+    columns = [arrow_column([item.get(name) for item in data], types_.get(name)) for name in names]
+    return pa.RecordBatch.from_arrays(columns, names=list(names))
+
+
+def concat_batches(batches: Iterable):
+    """
+    A Table of the batches, the columns that were null in some of them get the type of the others
+    """
+    pa = _pyarrow()
+    tables = [pa.Table.from_batches([batch]) for batch in batches]
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(tables, promote_options='permissive')
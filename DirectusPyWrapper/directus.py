@@ -1,13 +1,28 @@
 from __future__ import annotations
 
 import datetime
+import threading
+import time
 from typing import Optional
 
+import httpx
 import requests
 
+from DirectusPyWrapper.directus_batch import DirectusBatch
 from DirectusPyWrapper.directus_request import DirectusRequest
-from DirectusPyWrapper.directus_response import DirectusResponse
+from DirectusPyWrapper.assets import AssetDownloader, MultipartBody, Destination, open_upload, CHUNK_SIZE, \
+    PART_SIZE
+from DirectusPyWrapper.bulk import BulkReport
+from DirectusPyWrapper.cache import ResponseCache, ConditionalCache
+from DirectusPyWrapper.directus_response import DirectusResponse, DirectusException
+from DirectusPyWrapper.instrumentation import Instrumentation
+from DirectusPyWrapper.json_codec import JsonCodec, get_codec
+from DirectusPyWrapper.loader import DataLoader
 from DirectusPyWrapper.models import User
+from DirectusPyWrapper.realtime import Realtime
+from DirectusPyWrapper.retry import RetryPolicy, TokenBucket
+from DirectusPyWrapper.transport import HttpxSession, create_session
+from DirectusPyWrapper.translations import TranslationCache, parse_translations, translations_request
 
 
 class BearerAuth(requests.auth.AuthBase):
@@ -20,18 +35,13 @@ class BearerAuth(requests.auth.AuthBase):
         return r
 
 
-def parse_translations(all_translations: list[dict]) -> dict[str, dict[str, str]] | None:
-    if all_translations is None or not all_translations:
-        return None
-
-    return {translations['key']: {translation['languages_code']: translation['translation']
-                                  for translation in
-                                  translations['translations']} for translations in all_translations}
-
-
 class Directus:
     def __init__(self, url, email=None, password=None, token=None, refresh_token=None,
-                 session: requests.Session = None):
+                 session: requests.Session = None, cache: ResponseCache = None, codec: str | JsonCodec = None,
+                 refresh_margin: float = 30, retry: RetryPolicy = None, rate_limiter: TokenBucket = None,
+                 timeout: float | tuple[float, float] | None = None, pool_size: int = None, max_keepalive: int = None,
+                 keepalive_expiry: float = 5.0, http2: bool = False, instrumentation: Instrumentation = None,
+                 conditional: ConditionalCache = None):
         self.expires = None
         self.expiration_time = None
         self.refresh_token = refresh_token
@@ -40,10 +50,20 @@ class Directus:
         self.email = email
         self.password = password
         self.static_token = token
-        self.session = session or requests.Session()
+        self.session = session or create_session(pool_size, max_keepalive, keepalive_expiry, http2)
+        self.timeout = timeout
         self.auth = BearerAuth(self._token)
         self.token = self.static_token or None
         self._user: User | None = None
+        self.cache: ResponseCache | None = cache
+        self.conditional: ConditionalCache | None = conditional
+        self.codec: JsonCodec = get_codec(codec)
+        self.refresh_margin = refresh_margin  # seconds before the expiration to refresh the token
+        self._refresh_lock = threading.Lock()
+        self.retry: RetryPolicy | None = retry
+        self.rate_limiter: TokenBucket | None = rate_limiter
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.translations: TranslationCache = TranslationCache(self)
         if self.email and self.password:
             self.login()
 
@@ -54,6 +74,28 @@ class Directus:
     def items(self, collection, directus_collection=None) -> DirectusRequest:
         return DirectusRequest(self, collection, directus_collection)
 
+    def batch(self) -> DirectusBatch:
+        """
+        Collect several reads and send them in a single GraphQL request, see DirectusBatch
+        """
+        return DirectusBatch(self)
+
+    def loader(self, **options) -> DataLoader:
+        """
+        A DataLoader coalescing the reads by id, create one per unit of work since it memoizes the items
+
+        :param options: The DataLoader options, window, max_batch, primary_keys, fields
+        """
+        return DataLoader(self, **options)
+
+    def realtime(self, **options) -> Realtime:
+        """
+        Subscriptions to the changes of collections over the realtime WebSocket API, see Realtime
+
+        :param options: The Realtime options, url, reconnect_delay, max_reconnect_delay, heartbeat
+        """
+        return Realtime(self, **options)
+
     def read_me(self):
         return DirectusRequest(self, "directus_users").read("me")
 
@@ -64,15 +106,154 @@ class Directus:
         return DirectusRequest(self, "directus_settings").update_one(None, data)
 
     def read_translations(self) -> dict[str, dict[str, str]]:
-        items = self.items("translations").fields('key', 'translations.languages_code',
-                                                  'translations.translation').read().items
-        return parse_translations(items)
+        """
+        Fetch all the translations, for repeated lookups use the cached directus.translations instead
+        """
+        return parse_translations(translations_request(self).read().items)
+
+    def download_file(self, file_id: str, destination: Destination = None, resume: bool = False, parallel: int = 1,
+                      params: dict = None, chunk_size: int = CHUNK_SIZE, part_size: int = PART_SIZE):
+        """
+        Download an asset to `destination`, a path or a binary file object, in chunks of `chunk_size` bytes.
+        Without a destination the response is returned with the whole file in memory.
+        With a ConditionalCache the asset is downloaded again only if it was modified since the last download.
+
+        :param resume: Continue a previous download to the same path, with a Range request from its current size
+                               and If-Range, so that a changed asset is downloaded from the start
+        :param parallel: Download large assets to a path in parts of `part_size` bytes,
+                         with this many concurrent Range requests
+        :param params: Transformations of the asset, e.g. {"key": "thumbnail"} or {"width": 200, "format": "webp"}
+
+        :return: The size of the downloaded file
+        """
+        if destination is None:
+            return AssetDownloader(self, chunk_size, part_size).fetch(file_id, params)
+        return AssetDownloader(self, chunk_size, part_size).download(file_id, destination, resume, parallel, params)
+
+    def download_files(self, files: dict[str, Destination], concurrency: int = 4, **options) -> dict[str, int]:
+        """
+        Download several assets concurrently
+
+        :param files: The destination of every file id
+        :param options: The options of download_file
+        """
+        downloader = AssetDownloader(self, options.pop('chunk_size', CHUNK_SIZE), options.pop('part_size', PART_SIZE))
+        return downloader.download_many(files, concurrency, **options)
 
-    def download_file(self, file_id):
-        return self.session.get(f'{self.url}/assets/{file_id}')
+    def upload_file(self, file: Destination, filename: str = None, content_type: str = None,
+                    chunk_size: int = CHUNK_SIZE, **fields) -> DirectusResponse:
+        """
+        Upload a file to /files, streamed from disk in chunks instead of read into memory
 
-    def create_translations(self, keys: list[str]):
-        return self.items("translations").create_many([{"key": key} for key in keys])
+        :param file: A path or a binary file object
+        :param filename: The name of the file, by default the name of the path
+        :param content_type: By default guessed from the filename
+        :param fields: Fields of the directus_files item, e.g. title="Cover", folder=folder_id
+        """
+        file, name, close = open_upload(file)
+        body = MultipartBody(file, filename or name, content_type, fields, chunk_size)
+        try:
+            response = self.request('post', f'{self.url}/files', data=body, headers=body.headers)
+        finally:
+            if close:
+                file.close()
+        DirectusRequest(self, 'directus_files')._invalidate_cache()
+        return DirectusResponse(response, codec=self.codec)
+
+    def create_translations(self, keys: list[str]) -> BulkReport:
+        """
+        Create the translation keys that do not exist yet, in batches
+        """
+        return self.translations.create(keys)
+
+    def _send(self, method: str, url: str, json=None, **kwargs) -> requests.Response:
+        if json is not None:
+            kwargs['data'] = self.codec.dumps(json)
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+        kwargs.setdefault('auth', self.auth)
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def request(self, method: str, url: str, json=None, **kwargs) -> requests.Response:
+        """
+        Send a request authenticated as this client, `json` is encoded with the client's codec.
+        The token is refreshed shortly before it expires, and once more if the server still rejects it as expired.
+        Failed requests are retried according to the retry policy of the client.
+        """
+        if self.instrumentation is None:
+            return self._request(method, url, json, None, **kwargs)
+        metrics = self.instrumentation.start(method, url, kwargs)
+        if isinstance(self.session, HttpxSession):
+            kwargs['extensions'] = {'trace': metrics.trace}
+        try:
+            response = self._request(method, url, json, metrics, **kwargs)
+        except Exception as e:
+            self.instrumentation.finish(metrics, error=e)
+            raise
+        self.instrumentation.finish(metrics, response)
+        return response
+
+    def _request(self, method: str, url: str, json=None, metrics=None, **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._request_once(method, url, json, **kwargs)
+            except (requests.ConnectionError, requests.Timeout, httpx.TransportError):
+                if self.retry is None or not self.retry.should_retry(method, attempt):
+                    raise
+                delay = self.retry.backoff(attempt)
+            else:
+                if self.retry is None or not self.retry.should_retry(method, attempt, response.status_code):
+                    return response
+                delay = self.retry.backoff(attempt, response.headers.get('Retry-After'))
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+            if metrics is not None:
+                metrics.retries = attempt
+
+    def _request_once(self, method: str, url: str, json=None, **kwargs) -> requests.Response:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self._refresh_if_expiring()
+        token = self.token
+        response = self._send(method, url, json, **kwargs)
+        if response.status_code == 401 and self._can_refresh:
+            response.close()
+            self._refresh_once(token)
+            response = self._send(method, url, json, **kwargs)
+        return response
+
+    @property
+    def _can_refresh(self) -> bool:
+        return not self.static_token and (self.refresh_token is not None or bool(self.email and self.password))
+
+    def _is_expiring(self) -> bool:
+        return self.expiration_time is not None and \
+            datetime.datetime.now() >= self.expiration_time - datetime.timedelta(seconds=self.refresh_margin)
+
+    def _refresh_if_expiring(self):
+        if self._can_refresh and self._is_expiring():
+            with self._refresh_lock:
+                # another thread may have refreshed while this one was waiting for the lock
+                if self._is_expiring():
+                    self._renew()
+
+    def _refresh_once(self, token: str | None):
+        with self._refresh_lock:
+            # only the first of the concurrent requests that got rejected with the same token refreshes it
+            if self.token == token:
+                self._renew()
+
+    def _renew(self):
+        try:
+            self.refresh()
+        except DirectusException:
+            # the refresh token expired as well, start over if possible
+            if not (self.email and self.password):
+                raise
+            self.login()
 
     def __enter__(self):
         return self
@@ -104,8 +285,8 @@ class Directus:
             'password': self.password
         }
 
-        r = self.session.post(url, json=payload)
-        response = DirectusResponse(r)
+        r = self._send("post", url, json=payload, auth=None)
+        response = DirectusResponse(r, codec=self.codec)
         self._token = response.item['access_token']
         self.refresh_token = response.item['refresh_token']
         self.expires = response.item['expires']  # in milliseconds
@@ -119,11 +300,12 @@ class Directus:
             'refresh_token': self.refresh_token,
             "mode": "json"
         }
-        r = self.session.post(url, json=payload)
-        response = DirectusResponse(r)
+        r = self._send("post", url, json=payload, auth=None)
+        response = DirectusResponse(r, codec=self.codec)
         self.token = response.item['access_token']
         self.refresh_token = response.item['refresh_token']
         self.expires = response.item['expires']
+        self.expiration_time = datetime.datetime.now() + datetime.timedelta(milliseconds=self.expires)
 
     def logout(self):
         url = f'{self.url}/auth/logout'
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.directus_response import DirectusResponse, DirectusException
+
+SUPPORTED_PARAMS = {'fields', 'filter', 'sort', 'limit', 'offset', 'page', 'search', 'aggregate', 'groupBy'}
+
+
+def graphql_value(value: Any) -> str:
+    """
+    A python value as a GraphQL input literal, e.g. a filter dictionary as an input object
+    """
+    if isinstance(value, dict):
+        return '{' + ', '.join(f'{key}: {graphql_value(item)}' for key, item in value.items()) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ', '.join(graphql_value(item) for item in value) + ']'
+    return json.dumps(value)
+
+
+def graphql_selection(fields: str) -> str:
+    """
+    Directus fields ('id,title,author.name') as a GraphQL selection set ('id title author { name }')
+    """
+    tree: dict = {}
+    for path in fields.split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part == '*':
+                raise ValueError("Wildcard fields can't be batched, select the fields explicitly")
+            node = node.setdefault(part, {})
+
+    def render(node: dict) -> str:
+        return ' '.join(key if not children else f'{key} {{ {render(children)} }}' for key, children in node.items())
+
+    return render(tree)
+
+
+class BatchRead:
+    """
+    Placeholder of a read added to a batch, its response is available once the batch has been executed
+    """
+
+    def __init__(self, request: DirectusRequest, alias: str, id: Optional[int | str] = None):
+        self.request = request
+        self.alias = alias
+        self.id = id
+        self._response: DirectusResponse | None = None
+
+    @property
+    def system(self) -> bool:
+        return self.request.collection.startswith('directus_')
+
+    @property
+    def response(self) -> DirectusResponse:
+        if self._response is None:
+            raise RuntimeError("The batch has not been executed yet")
+        return self._response
+
+    def to_graphql(self) -> str:
+        params = self.request._query()
+        unsupported = set(params) - SUPPORTED_PARAMS
+        if unsupported:
+            raise ValueError(f"Parameters not supported in a batch: {', '.join(sorted(unsupported))}")
+
+        name = self.request.collection.replace('directus_', '', 1) if self.system else self.request.collection
+        arguments = {key: params[key] for key in ['filter', 'sort', 'limit', 'offset', 'page', 'search']
+                     if key in params}
+        if 'aggregate' in params:
+            name = f'{name}_aggregated'
+            selection = []
+            for operator, field in params['aggregate'].items():
+                # count('*') is countAll in GraphQL, the other operators need fields
+                count_all = operator == 'countAll' or (operator == 'count' and field == '*')
+                selection.append('countAll' if count_all else f'{operator} {{ {graphql_selection(field)} }}')
+            if 'groupBy' in params:
+                arguments['groupBy'] = params['groupBy'].split(',')
+                selection.append('group')
+            selection = ' '.join(selection)
+        else:
+            if 'fields' not in params:
+                raise ValueError("GraphQL needs the fields to read, set them with fields()")
+            selection = graphql_selection(params['fields'])
+            if self.id == 'me':
+                name = f'{name}_me'
+            elif self.id is not None:
+                name = f'{name}_by_id'
+                arguments = {'id': self.id}
+
+        arguments = ', '.join(f'{key}: {graphql_value(value)}' for key, value in arguments.items())
+        return f'{self.alias}: {name}{f"({arguments})" if arguments else ""} {{ {selection} }}'
+
+    def parse(self, data: Any) -> Any:
+        # bring aggregations to the shape of the REST API, e.g. {"count": 5, "status": "draft"}
+        if 'aggregate' in self.request.params and isinstance(data, list):
+            operator = next(iter(self.request.params['aggregate']))
+            data = [{**row.get('group', {}), **{operator if key == 'countAll' else key: value
+                                                 for key, value in row.items() if key != 'group'}}
+                    for row in data]
+        return data
+
+
+class DirectusBatch:
+    """
+    Collects several reads and sends them as a single GraphQL query, one request per endpoint
+    (/graphql for the collections, /graphql/system for the directus_ ones)
+
+        with directus.batch() as batch:
+            users = batch.read(directus.items("directus_users").fields("id", "email").limit(5))
+            posts = batch.read(directus.items("posts").fields("id", "title").sort("id", False).limit(10))
+        print(users.response.items, posts.response.items)
+    """
+
+    def __init__(self, directus: "Directus"):
+        self.directus = directus
+        self.reads: list[BatchRead] = []
+
+    def read(self, request: DirectusRequest, id: Optional[int | str] = None) -> BatchRead:
+        read = BatchRead(request, f'q{len(self.reads)}', id)
+        self.reads.append(read)
+        return read
+
+    def _queries(self) -> dict[str, list[BatchRead]]:
+        queries = {}
+        for read in self.reads:
+            queries.setdefault(f'{self.directus.url}/graphql{"/system" if read.system else ""}', []).append(read)
+        return queries
+
+    @staticmethod
+    def _payload(reads: list[BatchRead]) -> dict:
+        return {'query': 'query { ' + ' '.join(read.to_graphql() for read in reads) + ' }'}
+
+    def _split(self, response: DirectusResponse, reads: list[BatchRead]):
+        if response.errors:
+            raise DirectusException(response)
+        for read in reads:
+            read._response = response._replace_data(read.parse(response.json['data'][read.alias]),
+                                                    query=read.request._query(),
+                                                    collection=read.request.collection_class)
+
+    def execute(self) -> list[DirectusResponse]:
+        for url, reads in self._queries().items():
+            response = DirectusResponse(self.directus.request("post", url, json=self._payload(reads)),
+                                        codec=self.directus.codec)
+            self._split(response, reads)
+        return [read.response for read in self.reads]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.execute()
+
+
+class AsyncDirectusBatch(DirectusBatch):
+    """
+    DirectusBatch for AsyncDirectus, use it with `async with`
+    """
+
+    async def execute(self) -> list[DirectusResponse]:
+        for url, reads in self._queries().items():
+            response = DirectusResponse(await self.directus.request("post", url, json=self._payload(reads)),
+                                        codec=self.directus.codec)
+            self._split(response, reads)
+        return [read.response for read in self.reads]
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' for the batch of an async client")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, *args):
+        if exc_type is None:
+            await self.execute()
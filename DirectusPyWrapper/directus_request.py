@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional
-
-import json_fix
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Iterator, Iterable
 
 from DirectusPyWrapper._and import _and
 from DirectusPyWrapper.aggregation_operators import AggregationOperators
+from DirectusPyWrapper.bulk import BulkWriter, BulkReport
 from DirectusPyWrapper.directus_response import DirectusResponse
+from DirectusPyWrapper.directus_stream_response import DirectusStreamResponse
 from DirectusPyWrapper.filter import Filter
+from DirectusPyWrapper.filter_base import FilterBase
 from DirectusPyWrapper.logical import Logical
 from DirectusPyWrapper.logical_operators import LogicalOperators
 from DirectusPyWrapper.operators import Operators
@@ -16,11 +18,11 @@ from DirectusPyWrapper.operators import Operators
 class DirectusRequest:
 
     def __init__(self, directus: "Directus", collection: str, collection_class=None):
-        json_fix.fix_it()
         self.directus: "Directus" = directus
         self.collection: str = collection
         self.params: dict = {}
         self.collection_class = collection_class
+        self.use_cache = True
 
     @property
     def uri(self):
@@ -46,27 +48,27 @@ class DirectusRequest:
                 .filter(Operators.Equals, LogicalOperators.Or, first_name="Panos", location=None) \
                 .filter(Operators.Equals, last_name="Stavrianos") \
         """
-        filter_param = Filter(operator, logical_operator, **filters)
-        if 'filter' in self.params:
-            if isinstance(self.params['filter'], Logical):
-                self.params['filter'].filters.append(filter_param)
-            else:
-                self.params['filter'] = _and(self.params['filter'], filter_param)
-        else:
-            self.params['filter'] = filter_param
-        return self
+        return self._add_filters(Filter(operator, logical_operator, **filters))
 
     def filters(self, filters: list[Logical]):
         if 'filter' in self.params:
-            self.params['filter'].filters.extend(filters)
+            return self._add_filters(*filters)
+        self.params['filter'] = _and(*filters)
+        return self
+
+    def _add_filters(self, *filters: FilterBase):
+        # new nodes are created instead of appending to the current ones, which may be shared with other requests
+        current = self.params.get('filter')
+        if current is None:
+            self.params['filter'] = filters[0]
+        elif isinstance(current, Logical):
+            self.params['filter'] = Logical(current.logical_operator, *current.filters, *filters)
         else:
-            self.params['filter'] = _and(*filters)
+            self.params['filter'] = _and(current, *filters)
         return self
 
     def sort(self, field, asc=True):
-        if 'sort' not in self.params:
-            self.params['sort'] = []
-        self.params['sort'].append(f'{"" if asc else "-"}{field}')
+        self.params['sort'] = [*self.params.get('sort', []), f'{"" if asc else "-"}{field}']
         return self
 
     def search(self, search: str | int = None):
@@ -97,6 +99,169 @@ class DirectusRequest:
         self.params['groupBy'] = ','.join(fields)
         return self
 
+    def compile(self) -> "CompiledQuery":
+        """
+        A CompiledQuery of the current params, encoded once with the client's codec to be sent many times
+        """
+        from DirectusPyWrapper.query import Query
+        return Query(self.collection, self.collection_class, self.params).compile(self.directus.codec)
+
+    def _query(self) -> dict:
+        """
+        The params with the filter turned into plain dictionaries
+        """
+        if isinstance(self.params.get('filter'), FilterBase):
+            return {**self.params, 'filter': self.params['filter'].compile()}
+        return self.params
+
+    def _query_params(self, query: dict) -> dict:
+        # the query string can only hold strings, so filters and aggregates are sent as json
+        return {key: self.directus.codec.dumps(value).decode() if isinstance(value, dict) else value
+                for key, value in query.items()}
+
+    def no_cache(self):
+        """
+        Always read from the server, without looking up or storing the responses in the client's ResponseCache
+        """
+        self.use_cache = False
+        return self
+
+    def _cache_key(self, id, method, query: dict) -> str | None:
+        if self.directus.cache is None or not self.use_cache:
+            return None
+        return self.directus.cache.key(self.collection, self.directus.token, method, id, query)
+
+    def _invalidate_cache(self):
+        if self.directus.cache is not None:
+            self.directus.cache.invalidate(self.collection)
+
+    def _clone(self) -> DirectusRequest:
+        request = self.__class__(self.directus, self.collection, self.collection_class)
+        request.params = dict(self.params)
+        request.use_cache = self.use_cache
+        return request
+
+    def _page_request(self, page_size: int, page: int, keyset: str | None, last) -> DirectusRequest:
+        request = self._clone().limit(page_size)
+        request.params.pop('offset', None)
+        request.params.pop('page', None)
+        if keyset is None:
+            return request.page(page)
+
+        if request.params.get('sort', [keyset]) != [keyset]:
+            raise ValueError(f"Keyset pagination requires sorting only by '{keyset}'")
+        request.params['sort'] = [keyset]
+        fields = request.params.get('fields')
+        if fields and keyset not in fields.split(',') and '*' not in fields.split(','):
+            request.params['fields'] = f'{fields},{keyset}'
+        if last is not None:
+            # build a new filter so the one of the original request is not modified
+            keyset_filter = Filter(Operators.GreaterThan, **{keyset: last})
+            request.params['filter'] = keyset_filter if 'filter' not in self.params \
+                else _and(self.params['filter'], keyset_filter)
+        return request
+
+    def iter_pages(self, page_size: int = 100, keyset: str | None = None) -> Iterator[DirectusResponse]:
+        """
+        Lazily fetch the results one page at a time, so only a single page is kept in memory.
+        Any limit, page or offset already set on the request is ignored.
+
+        :param page_size: The number of items per page
+        :param keyset: Paginate by filtering on this unique field (e.g. the primary key) being greater than the
+                       last one seen, instead of using page offsets that get slow deep into large collections
+
+        :return: An iterator of DirectusResponse objects, one per page
+        """
+        page, last = 1, None
+        while True:
+            response = self._page_request(page_size, page, keyset, last).read()
+            data = response.items_as_dict() or []
+            if not data:
+                return
+            yield response
+            if len(data) < page_size:
+                return
+            page += 1
+            if keyset is not None:
+                last = data[-1][keyset]
+
+    def iter_items(self, page_size: int = 100, keyset: str | None = None) -> Iterator[dict | object]:
+        """
+        Same as iter_pages but yields the items one by one, as dictionaries or as collection_class objects
+        """
+        for response in self.iter_pages(page_size, keyset):
+            yield from response.items
+
+    def iter_rows(self, page_size: int = 1000, keyset: str | None = None) -> Iterator[tuple]:
+        """
+        Same as iter_items but yields namedtuples (see DirectusResponse.items_as_rows), only one page of
+        dictionaries is kept in memory at a time
+        """
+        for response in self.iter_pages(page_size, keyset):
+            yield from response.items_as_rows()
+
+    def iter_batches(self, page_size: int = 1000, keyset: str | None = None) -> Iterator:
+        """
+        The items as Arrow RecordBatches, one per page (see DirectusResponse.to_arrow)
+        """
+        for response in self.iter_pages(page_size, keyset):
+            yield from response.to_arrow().to_batches()
+
+    def read_arrow(self, page_size: int = 1000, keyset: str | None = None):
+        """
+        All the items as an Arrow Table, only one page of decoded data is kept in memory besides the columns
+        """
+        from DirectusPyWrapper.columnar import concat_batches
+        return concat_batches(self.iter_batches(page_size, keyset))
+
+    def _merge_pages(self, first: DirectusResponse, pages: list[DirectusResponse]) -> DirectusResponse:
+        # the pages may be shared through the cache, so the merged data goes to a copy
+        data = [item for page in [first, *pages] for item in page.items_as_dict() or []]
+        return first._replace_data(data, query=self._query())
+
+    def _window(self) -> tuple[int, int | None]:
+        # the first item and the number of items the request reads, None for all of them
+        limit = self.params.get('limit')
+        limit = limit if limit is not None and limit >= 0 else None
+        if limit is not None and self.params.get('page'):
+            # like in Directus, the page takes precedence over the offset
+            return (self.params['page'] - 1) * limit, limit
+        return self.params.get('offset') or 0, limit
+
+    def _slice_request(self, offset: int, limit: int) -> DirectusRequest:
+        request = self._clone().limit(limit).offset(offset)
+        request.params.pop('page', None)
+        return request
+
+    def _first_page_request(self, page_size: int) -> DirectusRequest:
+        start, limit = self._window()
+        request = self._slice_request(start, page_size if limit is None else min(page_size, limit))
+        request.params['meta'] = 'filter_count'
+        return request
+
+    def _rest_page_requests(self, first: DirectusResponse, page_size: int) -> list[DirectusRequest]:
+        # the pages after the first one, up to the filter count or the limit of the request
+        start, limit = self._window()
+        end = first.filtered_count or 0
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self._slice_request(offset, min(page_size, end - offset))
+                for offset in range(start + page_size, end, page_size)]
+
+    def read_all(self, concurrency: int = 4, page_size: int = 1000) -> DirectusResponse:
+        """
+        Read the whole result set, fetching the pages concurrently.
+        The first page is read with the filter count, which gives the number of the remaining pages,
+        these are then fetched on a pool of `concurrency` threads and merged back in order.
+        A limit, offset or page set on the request selects the items to read, without a limit all of them are read.
+
+        :return: A single DirectusResponse with the items of all the pages
+        """
+        first = self._first_page_request(page_size).read()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            rest = list(executor.map(lambda request: request.read(), self._rest_page_requests(first, page_size)))
+        return self._merge_pages(first, rest)
+
     # def read_one(self, id: int | str) -> DirectusResponse:
     #     response = self.directus.session.get(f'{self.uri}/{id}', params=self.params, auth=self.directus.auth)
     #     return DirectusResponse(response)
@@ -111,45 +276,147 @@ class DirectusRequest:
     #         raise ValueError(f"Method '{method}' not supported")
     #     return DirectusResponse(response, self.params)
 
-    def read(self, id: Optional[int | str] = None, method="search") -> DirectusResponse:
+    def read(self, id: Optional[int | str] = None, method="search",
+             stream: bool = False) -> DirectusResponse | DirectusStreamResponse:
+        """
+        :param id: Read a single item by its id
+        :param method: "search" sends the query in the body, "get" in the query string
+        :param stream: Return a DirectusStreamResponse that downloads and decodes the items while iterating over it,
+                       instead of loading the whole response in memory
+        """
+        return self._read(self._query(), id, method, stream)
+
+    def _read(self, query: dict, id: Optional[int | str] = None, method="search", stream: bool = False,
+              body: bytes = None, query_params: dict = None) -> DirectusResponse | DirectusStreamResponse:
+        """
+        :param body: The already encoded search body, to skip encoding the query
+        :param query_params: The already encoded query string parameters
+        """
         method = "get" if id is not None else method
+        cached, cache_key = self._cached(id, method, query if body is None else body, stream)
+        if cached is not None:
+            return cached
+        method, url, kwargs = self._read_request(query, id, method, body, query_params)
+        entry, conditional_key = self._prepare_conditional(id, method, query if body is None else body, stream, kwargs)
+        response = self.directus.request(method, url, stream=stream, **kwargs)
+        if stream:
+            return DirectusStreamResponse(response, query=query, collection=self.collection_class)
+        if conditional_key is not None and self.directus.conditional.is_not_modified(entry, response):
+            response = entry.value._with_metrics(getattr(response, 'directus_metrics', None))
+        else:
+            response = self._response(response, query=query)
+            if conditional_key is not None:
+                self.directus.conditional.store(conditional_key, response.response, response, self.collection)
+        if cache_key is not None:
+            self.directus.cache.set(cache_key, response, self.collection)
+        return response
+
+    def _cached(self, id, method: str, query: dict | bytes, stream: bool) -> tuple[DirectusResponse | None, str | None]:
+        cache_key = None if stream else self._cache_key(id, method, query)
+        if cache_key is None:
+            return None, None
+        cached = self.directus.cache.get(cache_key)
+        if cached is not None and self.directus.instrumentation is not None:
+            # the cached response still has the metrics of the call that fetched it
+            cached = cached._with_metrics(
+                self.directus.instrumentation.cache_hit(method, self.uri if id is None else f'{self.uri}/{id}'))
+        return cached, cache_key
+
+    def _read_request(self, query: dict, id, method: str, body: bytes | None,
+                      query_params: dict | None) -> tuple[str, str, dict]:
+        """
+        The method, url and keyword arguments of the request of a read
+        """
+        if method == "search" and body is not None:
+            return "search", self.uri, {'data': body, 'headers': {'Content-Type': 'application/json'}}
         if method == "search":
-            response = self.directus.session.request("search", self.uri, json={"query": self.params},
-                                                     auth=self.directus.auth)
-        elif method == "get":
+            return "search", self.uri, {'json': {"query": query}}
+        if method == "get":
             url = f'{self.uri}/{id}' if id is not None else self.uri
-            response = self.directus.session.get(url, params=self.params, auth=self.directus.auth)
-        else:
-            raise ValueError(f"Method '{method}' not supported")
-        return DirectusResponse(response, query=self.params, collection=self.collection_class)
+            return "get", url, {'params': query_params or self._query_params(query)}
+        raise ValueError(f"Method '{method}' not supported")
+
+    def _prepare_conditional(self, id, method: str, query: dict | bytes, stream: bool, kwargs: dict):
+        """
+        Add the validators of the last response to the same read, returning its entry and key in the ConditionalCache
+        """
+        if stream or self.directus.conditional is None:
+            return None, None
+        key = self.directus.conditional.key(self.collection, self.directus.token, method, id, query)
+        entry, kwargs['headers'] = self.directus.conditional.prepare(key, kwargs.get('headers'))
+        return entry, key
+
+    def _response(self, response, query: dict = None) -> DirectusResponse:
+        return DirectusResponse(response, query=query, collection=self.collection_class, codec=self.directus.codec)
 
     def create_one(self, item: dict) -> DirectusResponse:
-        response = self.directus.session.post(self.uri, json=item, auth=self.directus.auth)
-        return DirectusResponse(response, collection=self.collection_class)
+        response = self.directus.request("post", self.uri, json=item)
+        self._invalidate_cache()
+        return self._response(response)
 
     def create_many(self, items: list[dict]) -> DirectusResponse:
-        response = self.directus.session.post(self.uri, json=items, auth=self.directus.auth)
-        return DirectusResponse(response, collection=self.collection_class)
+        response = self.directus.request("post", self.uri, json=items)
+        self._invalidate_cache()
+        return self._response(response)
 
     def update_one(self, id: int | str | None, item: dict) -> DirectusResponse:
         if id is None:
-            response = self.directus.session.patch(self.uri, json=item, auth=self.directus.auth)
+            response = self.directus.request("patch", self.uri, json=item)
         else:
-            response = self.directus.session.patch(f'{self.uri}/{id}', json=item, auth=self.directus.auth)
-        return DirectusResponse(response, collection=self.collection_class)
+            response = self.directus.request("patch", f'{self.uri}/{id}', json=item)
+        self._invalidate_cache()
+        return self._response(response)
 
     def update_many(self, ids: list[int | str], items) -> DirectusResponse:
         payload = {
             "keys": ids,
             "data": items
         }
-        response = self.directus.session.patch(self.uri, json=payload, auth=self.directus.auth)
-        return DirectusResponse(response, collection=self.collection_class)
+        response = self.directus.request("patch", self.uri, json=payload)
+        self._invalidate_cache()
+        return self._response(response)
+
+    def update_batch(self, items: list[dict]) -> DirectusResponse:
+        """
+        Update several items with different data, each item must contain its primary key
+        """
+        response = self.directus.request("patch", self.uri, json=items)
+        self._invalidate_cache()
+        return self._response(response)
 
     def delete_one(self, id: int | str) -> DirectusResponse:
-        response = self.directus.session.delete(f'{self.uri}/{id}', auth=self.directus.auth)
-        return DirectusResponse(response, collection=self.collection_class)
+        response = self.directus.request("delete", f'{self.uri}/{id}')
+        self._invalidate_cache()
+        return self._response(response)
 
     def delete_many(self, ids: list[int | str]) -> DirectusResponse:
-        response = self.directus.session.delete(self.uri, json=ids, auth=self.directus.auth)
-        return DirectusResponse(response, collection=self.collection_class)
+        response = self.directus.request("delete", self.uri, json=ids)
+        self._invalidate_cache()
+        return self._response(response)
+
+    def bulk_create(self, items: Iterable[dict], **options) -> BulkReport:
+        """
+        Create the items in chunks sent concurrently, the items can be a generator so they are never all in memory.
+
+        :param items: The items to create
+        :param options: The BulkWriter options, batch_size, max_bytes, concurrency, retries, isolate_failures.
+                        The chunks of a create are only retried after a 429, since after a server or network error
+                        the items may have been created anyway
+
+        :return: A BulkReport with the result of every chunk
+        """
+        return BulkWriter(**self._bulk_options(options, idempotent=False)).run(items, self.create_many)
+
+    def bulk_update(self, items: Iterable[dict], **options) -> BulkReport:
+        """
+        Same as bulk_create, each item must contain its primary key
+        """
+        return BulkWriter(**self._bulk_options(options)).run(items, self.update_batch)
+
+    def bulk_delete(self, ids: Iterable[int | str], **options) -> BulkReport:
+        return BulkWriter(**self._bulk_options(options)).run(ids, self.delete_many)
+
+    def _bulk_options(self, options: dict, idempotent: bool = True) -> dict:
+        # with a retry policy the client already resends the failed requests, the chunks are not retried again
+        return {'codec': self.directus.codec, 'idempotent': idempotent,
+                'retries': 0 if self.directus.retry is not None else 2, **options}
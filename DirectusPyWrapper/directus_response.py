@@ -1,33 +1,175 @@
 from __future__ import annotations
 
+import copy
 import json
-from typing import Any, TypeVar, List
+import time
+import types
+from collections import namedtuple
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Callable, TypeVar, List, Union, get_args, get_origin
 
 import requests
-from pydantic import BaseModel, parse_obj_as, TypeAdapter
+from pydantic import BaseModel, TypeAdapter
+
+from DirectusPyWrapper.instrumentation import RequestMetrics
+
+
+@lru_cache(maxsize=None)
+def type_adapter(T) -> TypeAdapter:
+    return TypeAdapter(T)
+
+
+@lru_cache(maxsize=None)
+def list_type_adapter(T) -> TypeAdapter:
+    return TypeAdapter(List[T])
+
+
+def _model_in(annotation) -> tuple[type, bool] | None:
+    """
+    The model an annotation holds and whether it is a list of them, e.g. Optional[Role] or list[Role]
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    origin = get_origin(annotation)
+    if origin in (list, tuple, set, Sequence):
+        found = _model_in(get_args(annotation)[0]) if get_args(annotation) else None
+        return (found[0], True) if found is not None and not found[1] else None
+    if origin is Union or origin is getattr(types, 'UnionType', Union):
+        for arg in get_args(annotation):
+            found = _model_in(arg)
+            if found is not None:
+                return found
+    return None
+
+
+@lru_cache(maxsize=None)
+def _constructor(T) -> Callable[[dict], Any]:
+    """
+    A function building T from data that is trusted to be valid, like model_construct nothing is validated or
+    converted, the expanded related items become their models as well. The instances are filled in directly with
+    what is worked out once per model, model_construct works it out for every instance.
+    """
+    if T.__private_attributes__ or T.model_config.get('extra') == 'allow':
+        return lambda data: T.model_construct(**data)
+    fields = T.model_fields
+    names = frozenset(fields)
+    aliases = {field.alias: name for name, field in fields.items() if field.alias and field.alias != name}
+    defaults, factories = {}, []
+    for name, field in fields.items():
+        if field.default_factory is not None:
+            factories.append((name, field.default_factory))
+        elif not field.is_required():
+            # like pydantic, mutable defaults are copied for every instance
+            default = field.default
+            try:
+                hash(default)
+                defaults[name] = default
+            except TypeError:
+                factories.append((name, lambda default=default: copy.deepcopy(default)))
+    nested = [(name, _constructor(found[0]), found[1]) for name, field in fields.items()
+              if (found := _model_in(field.annotation)) is not None]
+    new, set_attr = T.__new__, object.__setattr__
+
+    def build(data: dict):
+        if aliases:
+            data = {aliases.get(key, key): value for key, value in data.items()}
+        values = {**defaults, **data}
+        fields_set = names & data.keys()
+        if len(fields_set) != len(data):
+            # extra fields are ignored
+            values = {key: value for key, value in values.items() if key in names}
+        for name, factory in factories:
+            if name not in data:
+                values[name] = factory()
+        for name, build_nested, many in nested:
+            value = values.get(name)
+            if many and isinstance(value, list):
+                values[name] = [build_nested(child) if isinstance(child, dict) else child for child in value]
+            elif isinstance(value, dict):
+                values[name] = build_nested(value)
+        instance = new(T)
+        set_attr(instance, '__dict__', values)
+        set_attr(instance, '__pydantic_fields_set__', fields_set)
+        set_attr(instance, '__pydantic_extra__', None)
+        set_attr(instance, '__pydantic_private__', None)
+        return instance
+
+    return build
+
+
+@lru_cache(maxsize=None)
+def row_type(names: tuple[str, ...]) -> type:
+    """
+    A namedtuple of these fields, the names that are not identifiers are renamed to _0, _1...
+    """
+    return namedtuple('Row', names, rename=True)
+
+
+class LazyItems(Sequence):
+    """
+    Sequence over the raw items that validates each one as T only when it is first indexed or iterated
+    """
+    _missing = object()
+
+    def __init__(self, data: list[dict], T):
+        self._data = data
+        self._adapter = type_adapter(T)
+        self._parsed = [self._missing] * len(data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._parsed[index]
+        if item is self._missing:
+            item = self._parsed[index] = self._adapter.validate_python(self._data[index])
+        return item
+
+    def __repr__(self):
+        return f'LazyItems({len(self)} items)'
 
 
 class DirectusResponse:
     T = TypeVar("T", bound=BaseModel)
 
-    def __init__(self, response: requests.Response, query: dict = None, collection: Any = None):
+    def __init__(self, response: requests.Response, query: dict = None, collection: Any = None, codec=None):
         self.response: requests.Response = response
         self.query: dict = query
         self.collection: Any = collection
+        self._parsed: dict = {}
+        self.metrics: RequestMetrics | None = getattr(response, 'directus_metrics', None)
+        start = time.perf_counter() if self.metrics is not None else None
         try:
-            self.json: dict = response.json()
+            self.json: dict = response.json() if codec is None else codec.loads(response.content)
+            if start is not None:
+                self.metrics.observe('decode', time.perf_counter() - start)
             if self.is_error:
                 raise DirectusException(self)
         except json.decoder.JSONDecodeError:
             self.json = {}
 
+    def _validate(self, validate, data):
+        if self.metrics is None:
+            return validate(data)
+        start = time.perf_counter()
+        try:
+            return validate(data)
+        finally:
+            self.metrics.observe('validation', time.perf_counter() - start)
+
     def _parse_item_as_dict(self) -> dict:
         if isinstance(self.json['data'], list):
             return self.json['data'][0]
         return self.json['data']
 
     def _parse_item_as_object(self, T) -> T:
-        return T(**self._parse_item_as_dict())
+        key = ('item', T)
+        if key not in self._parsed:
+            self._parsed[key] = self._validate(lambda data: T(**data), self._parse_item_as_dict())
+        return self._parsed[key]
 
     def _parse_items_as_dict(self) -> list[dict]:
         if isinstance(self.json['data'], list):
@@ -35,7 +177,32 @@ class DirectusResponse:
         return [self.json['data']]
 
     def _parse_items_as_objects(self, T) -> list[T]:
-        return TypeAdapter(List[T]).validate_python(self._parse_items_as_dict())
+        key = ('items', T)
+        if key not in self._parsed:
+            self._parsed[key] = self._validate(list_type_adapter(T).validate_python,
+                                               self._parse_items_as_dict())
+        return self._parsed[key]
+
+    def _replace_data(self, data, query: dict = None, collection: Any = None) -> DirectusResponse:
+        """
+        Copy of this response with other data, the parsed items are not carried over
+        """
+        response = copy.copy(self)
+        response.json = {**self.json, 'data': data}
+        response.query = query if query is not None else self.query
+        response.collection = collection if collection is not None else self.collection
+        response._parsed = {}
+        return response
+
+    def _with_metrics(self, metrics: RequestMetrics | None) -> DirectusResponse:
+        """
+        Copy of this response with the metrics of another call, e.g. a cache hit, the parsed items are shared
+        """
+        if metrics is None:
+            return self
+        response = copy.copy(self)
+        response.metrics = metrics
+        return response
 
     @property
     def item(self) -> dict[Any, Any] | None | Any:  # noqa
@@ -47,7 +214,7 @@ class DirectusResponse:
 
     def item_as(self, T) -> T | None:  # noqa
         item_data = self._parse_item_as_dict()
-        return None if item_data is None else T(**item_data)
+        return None if item_data is None else self._parse_item_as_object(T)
 
     def item_as_dict(self) -> dict | None:  # noqa
         if 'data' not in self.json or self.json['data'] in [None, [], {}]:
@@ -64,7 +231,102 @@ class DirectusResponse:
 
     def items_as(self, T) -> list[T] | None:  # noqa
         items_data = self._parse_items_as_dict()
-        return None if items_data is None else parse_obj_as(List[T], items_data)
+        return None if items_data is None else self._parse_items_as_objects(T)
+
+    @property
+    def lazy_items(self) -> LazyItems | list[dict[Any, Any]] | None:
+        """
+        Like items, but the collection objects are validated only when they are accessed
+        """
+        if 'data' not in self.json or self.json['data'] in [None, [], {}]:
+            return None
+        if self.collection:
+            key = ('lazy', self.collection)
+            if key not in self._parsed:
+                self._parsed[key] = LazyItems(self._parse_items_as_dict(), self.collection)
+            return self._parsed[key]
+        return self._parse_items_as_dict()
+
+    def lazy_items_as(self, T) -> LazyItems | None:  # noqa
+        if 'data' not in self.json or self.json['data'] in [None, [], {}]:
+            return None
+        return LazyItems(self._parse_items_as_dict(), T)
+
+    @property
+    def items_fast(self) -> list[dict[Any, Any]] | None | Any:  # noqa
+        """
+        Like items, but the collection objects are built like model_construct, without validating or converting
+        the values (dates stay strings). It is not faster than items.
+        """
+        if 'data' not in self.json or self.json['data'] in [None, [], {}]:
+            return None
+        if self.collection:
+            return self.items_fast_as(self.collection)
+        return self._parse_items_as_dict()
+
+    def items_fast_as(self, T) -> list[T] | None:  # noqa
+        if 'data' not in self.json or self.json['data'] in [None, [], {}]:
+            return None
+        key = ('fast', T)
+        if key not in self._parsed:
+            build = _constructor(T) if isinstance(T, type) and issubclass(T, BaseModel) else lambda item: T(**item)
+            self._parsed[key] = self._validate(lambda data: [build(item) for item in data], self._parse_items_as_dict())
+        return self._parsed[key]
+
+    def _row_fields(self) -> tuple[str, ...]:
+        fields = (self.query or {}).get('fields')
+        names = [] if not fields else list(dict.fromkeys(field.split('.')[0] for field in fields.split(',')))
+        if not names or '*' in names:
+            # the fields are not known in advance, take them from the items
+            names = list(dict.fromkeys(key for item in self._parse_items_as_dict() for key in item))
+        return tuple(names)
+
+    def items_as_rows(self, fields: Sequence[str] | None = None) -> list[tuple] | None:  # noqa
+        """
+        The items as namedtuples, which take a fraction of the memory of dictionaries.
+        The fields are those of the fields() projection (the related items stay dictionaries), or of the items.
+
+        :param fields: The fields of the rows instead, the missing ones are None
+        """
+        if 'data' not in self.json or self.json['data'] in [None, [], {}]:
+            return None
+        names = tuple(fields) if fields is not None else self._row_fields()
+        key = ('rows', names)
+        if key not in self._parsed:
+            Row = row_type(names)
+            self._parsed[key] = [Row._make([item.get(name) for name in names]) for item in self._parse_items_as_dict()]
+        return self._parsed[key]
+
+    def _columns(self, fields: Sequence[str] | None) -> tuple[list[dict], tuple[str, ...]]:
+        if 'data' not in self.json or self.json['data'] in [None, [], {}]:
+            return [], tuple(fields or ())
+        return self._parse_items_as_dict(), tuple(fields) if fields is not None else self._row_fields()
+
+    def to_arrow(self, fields: Sequence[str] | None = None):
+        """
+        The items as an Arrow Table (needs pyarrow), built column by column from the decoded data without any object
+        per row. The columns are those of the fields() projection, typed after the collection model when there is one.
+
+        :param fields: The columns instead
+        """
+        from DirectusPyWrapper.columnar import record_batch
+        import pyarrow
+        return pyarrow.Table.from_batches([record_batch(*self._columns(fields), self.collection)])
+
+    def to_pandas(self, fields: Sequence[str] | None = None):
+        """
+        The items as a pandas DataFrame, through to_arrow
+        """
+        return self.to_arrow(fields).to_pandas()
+
+    def to_numpy(self, field: str):
+        """
+        The values of a single field as a NumPy array, only that column is built
+        """
+        from DirectusPyWrapper.columnar import arrow_column, arrow_types
+        data, _ = self._columns([field])
+        return arrow_column([item.get(field) for item in data],
+                            arrow_types([field], self.collection).get(field)).to_numpy(zero_copy_only=False)
 
     def items_as_dict(self) -> list[dict] | None:  # noqa
         if 'data' not in self.json or self.json['data'] in [None, [], {}]:
@@ -95,7 +357,8 @@ class DirectusResponse:
 
     @property
     def errors(self) -> list:
-        if self.is_error and 'errors' in self.json:
+        # GraphQL reports its errors with a 200
+        if 'errors' in self.json:
             return self.json['errors']
 
 
@@ -105,10 +368,12 @@ class DirectusException(Exception):
         self.status_code = response.status_code
         self.message = None
         self.code = None
-        if len(response.errors) > 0 and 'message' in response.errors[0] and 'extensions' in response.errors[
-            0] and 'code' in response.errors[0]['extensions']:
-            self.message = response.errors[0]['message']
-            self.code = response.errors[0]['extensions']['code']
+        # an error without a json body has no errors
+        errors = response.errors or []
+        if len(errors) > 0 and 'message' in errors[0] and 'extensions' in errors[0] and \
+                'code' in errors[0]['extensions']:
+            self.message = errors[0]['message']
+            self.code = errors[0]['extensions']['code']
 
     def __str__(self):
         return f'{self.code}: {self.message}'
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Iterator, AsyncIterator
+
+import requests
+
+from DirectusPyWrapper.directus_response import DirectusResponse, DirectusException, type_adapter
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JsonStreamParser:
+    """
+    Incremental parser for a Directus response body.
+    The elements of the top level "data" array are yielded by feed() as soon as they are complete,
+    the rest of the document (meta, ...) is collected in `document`.
+    """
+
+    def __init__(self):
+        self.document: dict = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+
+    def _decode(self, pos: int, final: bool):
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # a number may continue in the next chunk (e.g. "2" of "2.5"), so wait until the delimiter after it arrives
+        if not final and isinstance(value, (int, float)) and not isinstance(value, bool):
+            delimiter = WHITESPACE.match(self._buffer, end).end()
+            if delimiter == len(self._buffer) or self._buffer[delimiter] not in ',]}':
+                return None
+        return value, end
+
+    def feed(self, text: str, final: bool = False) -> Iterator[Any]:
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        while True:
+            pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if pos == len(self._buffer) or self._state == 'end':
+                break
+            char = self._buffer[pos]
+            state = self._state
+
+            if state in ('start', 'colon', 'next_key', 'item_sep') or (state == 'key_or_end' and char == '}'):
+                transitions = {
+                    'start': {'{': 'key_or_end'},
+                    'key_or_end': {'}': 'end'},
+                    'colon': {':': 'value'},
+                    'next_key': {',': 'key', '}': 'end'},
+                    'item_sep': {',': 'item', ']': 'next_key'},
+                }[state]
+                if char not in transitions:
+                    raise json.JSONDecodeError(f"Unexpected character '{char}'", self._buffer, pos)
+                self._state, self._pos = transitions[char], pos + 1
+            elif state in ('key', 'key_or_end'):
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                self._key, self._pos = decoded
+                self._state = 'colon'
+            elif state == 'value' and self._key == 'data' and char == '[':
+                self._state, self._pos = 'item_or_end', pos + 1
+            elif state == 'item_or_end' and char == ']':
+                self._state, self._pos = 'next_key', pos + 1
+            else:
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                value, self._pos = decoded
+                if state == 'value':
+                    self._state = 'next_key'
+                    if self._key != 'data':
+                        self.document[self._key] = value
+                    elif value is not None:
+                        # a single item, e.g. when reading by id
+                        yield value
+                else:
+                    self._state = 'item_sep'
+                    yield value
+
+        if final and self._state != 'end':
+            raise json.JSONDecodeError("Unexpected end of data", self._buffer, len(self._buffer))
+
+
+class DirectusStreamResponse:
+    """
+    Response of `read(stream=True)`.
+    Iterating over it downloads and decodes the items one at a time, so the whole payload is never held in memory.
+    It can be iterated only once, the meta data (counts) are available after the iteration is over.
+    """
+
+    def __init__(self, response: requests.Response, query: dict = None, collection: Any = None,
+                 chunk_size: int = 64 * 1024):
+        self.response = response
+        self.query: dict = query
+        self.collection: Any = collection
+        self.chunk_size = chunk_size
+        self.parser = JsonStreamParser()
+        if response.status_code not in [200, 201, 204, 304]:
+            raise DirectusException(DirectusResponse(response))
+
+    def _parse(self, item):
+        return type_adapter(self.collection).validate_python(item) if self.collection else item
+
+    def __iter__(self) -> Iterator[dict | Any]:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            # requests.Response or, with the HTTP/2 transport, httpx.Response
+            iter_chunks = getattr(self.response, 'iter_content', None) or self.response.iter_bytes
+            for chunk in iter_chunks(self.chunk_size):
+                for item in self.parser.feed(decoder.decode(chunk)):
+                    yield self._parse(item)
+            for item in self.parser.feed(decoder.decode(b'', final=True), final=True):
+                yield self._parse(item)
+        finally:
+            self.response.close()
+
+    @property
+    def meta(self) -> dict | None:
+        return self.parser.document.get('meta')
+
+    @property
+    def total_count(self) -> int:
+        if self.meta and 'total_count' in self.meta:
+            return self.meta['total_count']
+
+    @property
+    def filtered_count(self) -> int:
+        if self.meta and 'filter_count' in self.meta:
+            return self.meta['filter_count']
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+
+class AsyncDirectusStreamResponse(DirectusStreamResponse):
+    """
+    Response of `await read(stream=True)` on the async client, iterate it with `async for`
+    """
+
+    def __init__(self, response, query: dict = None, collection: Any = None, chunk_size: int = 64 * 1024):
+        self.response = response
+        self.query: dict = query
+        self.collection: Any = collection
+        self.chunk_size = chunk_size
+        self.parser = JsonStreamParser()
+
+    @classmethod
+    async def create(cls, response, query: dict = None, collection: Any = None) -> AsyncDirectusStreamResponse:
+        if response.status_code not in [200, 201, 204, 304]:
+            await response.aread()
+            await response.aclose()
+            raise DirectusException(DirectusResponse(response))
+        return cls(response, query, collection)
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' to iterate over an async stream response")
+
+    async def __aiter__(self) -> AsyncIterator[dict | Any]:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            async for chunk in self.response.aiter_bytes(self.chunk_size):
+                for item in self.parser.feed(decoder.decode(chunk)):
+                    yield self._parse(item)
+            for item in self.parser.feed(decoder.decode(b'', final=True), final=True):
+                yield self._parse(item)
+        finally:
+            await self.response.aclose()
@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 from DirectusPyWrapper.filter_base import FilterBase
 from DirectusPyWrapper.logical_operators import LogicalOperators
 from DirectusPyWrapper.operators import Operators
@@ -9,27 +11,28 @@ class Filter(FilterBase):
                  **filters):
         self.operator = operator
         self.logical_operator = logical_operator
-        self.filters = filters
+        self.filters = MappingProxyType(filters)
 
-    def __json__(self):
-        params = {self.logical_operator: []}
+    def to_dict(self) -> dict:
+        logical_operator = getattr(self.logical_operator, 'value', self.logical_operator)
+        params = {logical_operator: []}
 
         for key, value in self.filters.items():
+            operator = self.operator
             if value is None:
-                if self.operator == Operators.Equals:
-                    self.operator = Operators.Null
-                elif self.operator == Operators.NotEqual:
-                    self.operator = Operators.NotNull
-            if "." in key:
-                fields = key.split(".")
-                if len(fields) > 2:
-                    raise NotImplementedError("Filtering depth is limited to 2")
-                params[self.logical_operator].append({fields[0]: {fields[1]: {self.operator: value}}})
-            else:
-                params[self.logical_operator].append({key: {self.operator: value}})
+                if operator == Operators.Equals:
+                    operator = Operators.Null
+                elif operator == Operators.NotEqual:
+                    operator = Operators.NotNull
+            operator = getattr(operator, 'value', operator)
+            # a dotted key filters on the fields of the related items, at any depth
+            node = {operator: value}
+            for field in reversed(key.split(".")):
+                node = {field: node}
+            params[logical_operator].append(node)
 
         # if there is only one filter, remove the logical operator
-        if len(params[self.logical_operator]) == 1:
-            params = params[self.logical_operator][0]
+        if len(params[logical_operator]) == 1:
+            params = params[logical_operator][0]
 
         return params
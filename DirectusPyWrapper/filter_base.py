@@ -1,14 +1,49 @@
 import json
 from abc import ABC, abstractmethod
 
+from DirectusPyWrapper.filter_compiler import Group, Predicate, optimize, parse
+
 
 class FilterBase(ABC):
     def __str__(self):
-        return json.dumps(self.__json__())
+        return json.dumps(self.to_dict(), default=repr)
 
     def __repr__(self):
         return self.__str__()
 
     @abstractmethod
-    def __json__(self):
+    def to_dict(self) -> dict:
+        """
+        The filter as plain dictionaries, lists and values, ready to be serialized
+        """
         pass
+
+    def __setattr__(self, name, value):
+        # the optimized tree is memoized, by this filter and by the ones holding it
+        if not name.startswith('_') and '_optimized' in self.__dict__:
+            raise AttributeError(f"Can't set '{name}' of a filter that has been compiled, create a new one instead")
+        super().__setattr__(name, value)
+
+    def _tree(self) -> Predicate | Group:
+        return optimize(parse(self.to_dict()))
+
+    def tree(self) -> Predicate | Group:
+        """
+        The optimized tree of the filter, built once since the filters are not changed after they are created
+        """
+        tree = getattr(self, '_optimized', None)
+        if tree is None:
+            tree = self._optimized = self._tree()
+        return tree
+
+    def compile(self) -> dict:
+        """
+        The filter in its optimized form, flattened and without repeated conditions
+        """
+        compiled = getattr(self, '_compiled', None)
+        if compiled is None:
+            compiled = self._compiled = self.tree().to_dict()
+        return compiled
+
+    def __json__(self):
+        return self.compile()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import Any, Hashable
+
+LOGICAL_OPERATORS = ('_and', '_or')
+# operators of one-to-many relations that take a filter on the related items instead of a value
+RELATION_OPERATORS = ('_some', '_none')
+
+
+class Predicate:
+    """
+    An operator on the field at `path`, relative to the group holding it
+    """
+    __slots__ = ('path', 'operator', 'value', 'key')
+
+    def __init__(self, path: tuple[str, ...], operator: str, value: Any):
+        self.path = path
+        self.operator = operator
+        self.value = value
+        self.key = (path, operator, _freeze(value))
+
+    def at(self, path: tuple[str, ...]) -> Predicate:
+        return Predicate((*path, *self.path), self.operator, self.value)
+
+    def to_dict(self) -> dict:
+        return _nest(self.path, {self.operator: self.value})
+
+
+class Group:
+    """
+    Nodes joined by _and or _or. The group keeps the path of the relation it was written in, since on a one-to-many
+    relation {"tags": {"_and": [A, B]}} (a tag matching both) is not the same as [{"tags": A}, {"tags": B}]
+    """
+    __slots__ = ('path', 'operator', 'children', 'key')
+
+    def __init__(self, path: tuple[str, ...], operator: str, children: list):
+        self.path = path
+        self.operator = operator
+        self.children = children
+        self.key = (path, operator, tuple(child.key for child in children))
+
+    def at(self, path: tuple[str, ...]) -> Group:
+        return Group((*path, *self.path), self.operator, self.children)
+
+    def to_dict(self) -> dict:
+        children = [child.to_dict() for child in self.children]
+        keys = [key for child in children for key in child]
+        if self.operator == '_and' and children and len(keys) == len(set(keys)):
+            # an _and of different fields is the same as one object with all of them
+            return _nest(self.path, {key: value for child in children for key, value in child.items()})
+        return _nest(self.path, {self.operator: children})
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    A hashable key of the value, equal only for values of the same type, so 1 and True are kept apart
+    """
+    if isinstance(value, dict):
+        return dict, tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return list, tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return type(value), repr(value)
+    return type(value), value
+
+
+def _nest(path: tuple[str, ...], value: dict) -> dict:
+    for field in reversed(path):
+        value = {field: value}
+    return value
+
+
+def _parse(filter: dict) -> list[Predicate | Group]:
+    nodes = []
+    for key, value in filter.items():
+        if key in LOGICAL_OPERATORS:
+            nodes.append(Group((), key, [_single(_parse(child)) for child in value]))
+        elif key.startswith('_') and key not in RELATION_OPERATORS:
+            nodes.append(Predicate((), key, value))
+        elif isinstance(value, dict):
+            # the conditions of a relation apply to the same related item, so they stay together
+            nested = _parse(value)
+            nodes.append(nested[0].at((key,)) if len(nested) == 1 else Group((key,), '_and', nested))
+        else:
+            raise ValueError(f"Invalid filter on '{key}': {value!r}")
+    return nodes
+
+
+def _single(nodes: list) -> Predicate | Group:
+    return nodes[0] if len(nodes) == 1 else Group((), '_and', nodes)
+
+
+def parse(filter: dict) -> Predicate | Group:
+    """
+    The tree of a filter in the Directus format
+    """
+    return _single(_parse(filter))
+
+
+def _merge_equals(children: list) -> list:
+    """
+    Under _or, the _eq and _in of the same field become a single _in
+    """
+    merged, values = [], {}
+    for child in children:
+        # not under _none: "no tag x or no tag y" is not "no tag x or y"
+        if isinstance(child, Predicate) and '_none' not in child.path and (
+                (child.operator == '_eq' and child.value is not None) or
+                (child.operator == '_in' and isinstance(child.value, list))):
+            if child.path not in values:
+                values[child.path] = {}
+                merged.append(child.path)
+            for value in child.value if child.operator == '_in' else [child.value]:
+                values[child.path].setdefault(_freeze(value), value)
+        else:
+            merged.append(child)
+    result = []
+    for item in merged:
+        if isinstance(item, tuple):
+            found = list(values[item].values())
+            operator = '_eq' if len(found) == 1 and not any(
+                isinstance(child, Predicate) and child.path == item and child.operator == '_in' for child in children) \
+                else '_in'
+            result.append(Predicate(item, operator, found[0] if operator == '_eq' else found))
+        else:
+            result.append(item)
+    return result
+
+
+def optimize(node: Predicate | Group) -> Predicate | Group:
+    """
+    Flatten the nested groups of the same operator, drop the repeated conditions, and under _or merge the _eq of the
+    same field into an _in
+    """
+    if isinstance(node, Predicate):
+        return node
+    return simplify(Group(node.path, node.operator, [optimize(child) for child in node.children]))
+
+
+def simplify(group: Group) -> Predicate | Group:
+    """
+    optimize() for a group whose children are already optimized
+    """
+    children = []
+    for child in group.children:
+        if isinstance(child, Group) and child.operator == group.operator and not child.path:
+            children.extend(child.children)
+        else:
+            children.append(child)
+    if group.operator == '_or':
+        children = _merge_equals(children)
+    unique = {}
+    for child in children:
+        unique.setdefault(child.key, child)
+    children = list(unique.values())
+    if len(children) == 1:
+        return children[0].at(group.path)
+    return Group(group.path, group.operator, children)
+
+
+def optimize_filter(filter: dict) -> dict:
+    """
+    The filter in its optimized form, with the same meaning
+    """
+    if not filter:
+        return filter
+    return optimize(parse(filter)).to_dict()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger('DirectusPyWrapper')
+
+
+class RequestMetrics:
+    """
+    Timings and sizes of one call, available as `DirectusResponse.metrics` when the client is instrumented.
+    The times are in seconds, None when the transport doesn't report them (connect and TTFB need the HTTP/2 or the
+    async client, requests only gives the TTFB) or when a kept-alive connection was reused (connect).
+    The connect time includes the DNS resolution, httpx doesn't report it separately.
+    """
+    __slots__ = ('instrumentation', 'method', 'url', 'status_code', 'started_at', 'connect', 'ttfb', 'total',
+                 'request_bytes', 'response_bytes', 'decode', 'validation', 'retries', 'cache_hit', 'error',
+                 '_start', '_events')
+
+    def __init__(self, instrumentation: Instrumentation, method: str, url: str):
+        self.instrumentation = instrumentation
+        self.method = method.upper()
+        self.url = url
+        self.status_code: int | None = None
+        self.started_at = time.time_ns()
+        self.connect: float | None = None
+        self.ttfb: float | None = None
+        self.total: float | None = None
+        self.request_bytes: int | None = None
+        self.response_bytes: int | None = None
+        self.decode: float = 0.0
+        self.validation: float = 0.0
+        self.retries = 0
+        self.cache_hit = False
+        self.error: BaseException | None = None
+        self._start = time.perf_counter()
+        self._events: dict[str, float] = {}
+
+    def trace(self, event: str, info: dict):
+        """
+        httpx trace extension, records when the connection and the response headers started and completed
+        """
+        self._events[event] = time.perf_counter()
+        if event in ('connection.connect_tcp.complete', 'connection.start_tls.complete'):
+            self.connect = self._events[event] - self._events.get('connection.connect_tcp.started', self._start)
+        elif event.endswith('.receive_response_headers.complete'):
+            prefix = event.split('.', 1)[0]
+            self.ttfb = self._events[event] - self._events.get(f'{prefix}.send_request_headers.started', self._start)
+
+    async def atrace(self, event: str, info: dict):
+        self.trace(event, info)
+
+    def finish(self, response: Any = None, error: BaseException | None = None):
+        self.total = time.perf_counter() - self._start
+        self.error = error
+        if response is None:
+            return
+        self.status_code = response.status_code
+        self.request_bytes = int(response.request.headers.get('Content-Length') or 0)
+        if self.ttfb is None and not hasattr(response, 'http_version'):
+            # requests measures the time from sending the request until the headers were parsed
+            self.ttfb = response.elapsed.total_seconds()
+        length = response.headers.get('Content-Length')
+        self.response_bytes = int(length) if length is not None else None
+        if getattr(response, '_content', False) not in (False, None):
+            self.response_bytes = len(response.content)
+
+    def observe(self, stage: str, seconds: float):
+        """
+        Add the time spent decoding or validating the response, `stage` is "decode" or "validation"
+        """
+        setattr(self, stage, getattr(self, stage) + seconds)
+        for exporter in self.instrumentation.exporters:
+            exporter.export_stage(self, stage, seconds)
+
+    def as_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.__slots__
+                if key not in ('instrumentation', '_start', '_events')}
+
+    def __repr__(self):
+        return f'RequestMetrics({self.method} {self.url} {self.status_code}, total={self.total})'
+
+
+class Exporter:
+    """
+    Receives the metrics of every call. export_request is called once the response headers have arrived,
+    export_stage every time the response is decoded or validated.
+    """
+
+    def export_request(self, metrics: RequestMetrics):
+        pass
+
+    def export_stage(self, metrics: RequestMetrics, stage: str, seconds: float):
+        pass
+
+
+class LogExporter(Exporter):
+    def __init__(self, logger: logging.Logger = logger, level: int = logging.DEBUG):
+        self.logger = logger
+        self.level = level
+
+    def export_request(self, metrics: RequestMetrics):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        if metrics.cache_hit:
+            self.logger.log(self.level, '%s %s cache hit', metrics.method, metrics.url)
+            return
+        self.logger.log(self.level, '%s %s %s in %.1fms (ttfb %s, connect %s) sent %s bytes, received %s bytes, '
+                                    '%d retries', metrics.method, metrics.url, metrics.status_code or metrics.error,
+                        metrics.total * 1000, _ms(metrics.ttfb), _ms(metrics.connect), metrics.request_bytes,
+                        metrics.response_bytes, metrics.retries)
+
+    def export_stage(self, metrics: RequestMetrics, stage: str, seconds: float):
+        self.logger.log(self.level, '%s %s %s in %.1fms', metrics.method, metrics.url, stage, seconds * 1000)
+
+
+def _ms(seconds: float | None) -> str:
+    return '-' if seconds is None else f'{seconds * 1000:.1f}ms'
+
+
+class PrometheusExporter(Exporter):
+    """
+    Counters and histograms with prometheus_client (pip install prometheus-client), labelled by method and status
+    """
+
+    def __init__(self, registry=None, namespace: str = 'directus'):
+        from prometheus_client import Counter, Histogram, REGISTRY
+        registry = registry if registry is not None else REGISTRY
+        options = {'namespace': namespace, 'registry': registry}
+        self.requests = Counter('requests', 'Requests sent', ['method', 'status'], **options)
+        self.duration = Histogram('request_duration_seconds', 'Total time of the requests', ['method'], **options)
+        self.ttfb = Histogram('request_ttfb_seconds', 'Time until the response headers arrived', ['method'],
+                              **options)
+        self.connect = Histogram('connect_duration_seconds', 'Time to open a connection', **options)
+        self.sent = Counter('request_bytes', 'Bytes of the request bodies', ['method'], **options)
+        self.received = Counter('response_bytes', 'Bytes of the response bodies', ['method'], **options)
+        self.retries = Counter('retries', 'Requests sent again by the retry policy', ['method'], **options)
+        self.cache_hits = Counter('cache_hits', 'Reads answered by the response cache', **options)
+        self.stages = Histogram('response_processing_seconds', 'Time spent decoding and validating responses',
+                                ['stage'], **options)
+
+    def export_request(self, metrics: RequestMetrics):
+        if metrics.cache_hit:
+            self.cache_hits.inc()
+            return
+        self.requests.labels(metrics.method, str(metrics.status_code or 'error')).inc()
+        self.duration.labels(metrics.method).observe(metrics.total)
+        if metrics.ttfb is not None:
+            self.ttfb.labels(metrics.method).observe(metrics.ttfb)
+        if metrics.connect is not None:
+            self.connect.observe(metrics.connect)
+        self.sent.labels(metrics.method).inc(metrics.request_bytes or 0)
+        self.received.labels(metrics.method).inc(metrics.response_bytes or 0)
+        if metrics.retries:
+            self.retries.labels(metrics.method).inc(metrics.retries)
+
+    def export_stage(self, metrics: RequestMetrics, stage: str, seconds: float):
+        self.stages.labels(stage).observe(seconds)
+
+
+class OpenTelemetryExporter(Exporter):
+    """
+    One span per request with the metrics as attributes (pip install opentelemetry-api),
+    decoding and validation become child spans
+    """
+
+    def __init__(self, tracer=None):
+        from opentelemetry import trace
+        self.trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer('DirectusPyWrapper')
+
+    def export_request(self, metrics: RequestMetrics):
+        span = self.tracer.start_span(f'directus {metrics.method}', start_time=metrics.started_at,
+                                      kind=self.trace.SpanKind.CLIENT)
+        attributes = {'http.request.method': metrics.method, 'url.full': metrics.url,
+                      'directus.cache_hit': metrics.cache_hit, 'directus.retries': metrics.retries}
+        for key, value in [('http.response.status_code', metrics.status_code),
+                           ('http.request.body.size', metrics.request_bytes),
+                           ('http.response.body.size', metrics.response_bytes),
+                           ('directus.ttfb', metrics.ttfb), ('directus.connect', metrics.connect)]:
+            if value is not None:
+                attributes[key] = value
+        span.set_attributes(attributes)
+        if metrics.error is not None:
+            span.record_exception(metrics.error)
+            span.set_status(self.trace.StatusCode.ERROR)
+        span.end(end_time=metrics.started_at + int((metrics.total or 0) * 1e9))
+
+    def export_stage(self, metrics: RequestMetrics, stage: str, seconds: float):
+        end = time.time_ns()
+        span = self.tracer.start_span(f'directus {stage}', start_time=end - int(seconds * 1e9),
+                                      attributes={'url.full': metrics.url})
+        span.end(end_time=end)
+
+
+class Instrumentation:
+    """
+    Hooks and exporters of a client, nothing is measured when a client has none (the default).
+
+    :param exporters: Where the metrics of every call go, e.g. [LogExporter(), PrometheusExporter()]
+    :param before_request: Functions called as hook(method, url, kwargs) before a request is sent,
+                           they may change the kwargs, e.g. add headers
+    :param after_request: Functions called as hook(response, metrics) when a request finished,
+                          the response is None if it failed with a connection error
+    """
+
+    def __init__(self, exporters: list[Exporter] = (), before_request: list[Callable] = (),
+                 after_request: list[Callable] = ()):
+        self.exporters = list(exporters)
+        self.before_request = list(before_request)
+        self.after_request = list(after_request)
+
+    def start(self, method: str, url: str, kwargs: dict) -> RequestMetrics:
+        for hook in self.before_request:
+            hook(method, url, kwargs)
+        return RequestMetrics(self, method, url)
+
+    def finish(self, metrics: RequestMetrics, response: Any = None, error: BaseException | None = None):
+        metrics.finish(response, error)
+        if response is not None:
+            response.directus_metrics = metrics
+        for exporter in self.exporters:
+            exporter.export_request(metrics)
+        for hook in self.after_request:
+            hook(response, metrics)
+
+    def cache_hit(self, method: str, url: str) -> RequestMetrics:
+        metrics = RequestMetrics(self, method, url)
+        metrics.cache_hit = True
+        metrics.total = time.perf_counter() - metrics._start
+        for exporter in self.exporters:
+            exporter.export_request(metrics)
+        return metrics
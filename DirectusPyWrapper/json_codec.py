@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from enum import Enum
+from typing import Any
+
+from DirectusPyWrapper.filter_base import FilterBase
+
+
+def default(obj: Any) -> Any:
+    if isinstance(obj, FilterBase):
+        return obj.compile()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """
+    Encodes the request bodies and decodes the response bodies, using the stdlib json module.
+    Decoding errors are always raised as json.JSONDecodeError.
+    """
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=default, separators=(',', ':')).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.orjson.dumps(obj, default=default)
+
+    def loads(self, data: bytes | str) -> Any:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return self.orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+        self.msgspec = msgspec
+        self.encoder = msgspec.json.Encoder(enc_hook=default)
+        self.decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.encoder.encode(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self.decoder.decode(data)
+        except self.msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), data if isinstance(data, str) else '', 0) from e
+
+
+CODECS = {codec.name: codec for codec in [JsonCodec, OrjsonCodec, MsgspecCodec]}
+
+
+def get_codec(codec: str | JsonCodec | None) -> JsonCodec:
+    """
+    :param codec: A codec instance or one of "json", "orjson", "msgspec"
+    """
+    if codec is None:
+        return JsonCodec()
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec not in CODECS:
+        raise ValueError(f"Codec '{codec}' not supported, use one of {', '.join(CODECS)}")
+    return CODECS[codec]()
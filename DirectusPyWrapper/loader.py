@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Iterable, Sequence, TYPE_CHECKING
+
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.operators import Operators
+
+if TYPE_CHECKING:
+    from DirectusPyWrapper.directus import Directus
+    from DirectusPyWrapper.async_directus import AsyncDirectus
+
+
+class DataLoader:
+    """
+    Coalesces the reads of single items by id. The ids requested within `window` seconds are read with a single
+    request per collection, filtering the primary key with _in, and every caller gets its own item (None if it does
+    not exist). The items are memoized, so create a loader per unit of work, e.g. per incoming request.
+
+        loader = directus.loader()
+        author = loader.load("directus_users", post["user_created"])  # a Future, resolvers in other threads add theirs
+        print(author.result())
+
+    :param directus: The client
+    :param window: Seconds to wait for more ids after the first one
+    :param max_batch: The most ids per request, a full batch is sent right away
+    :param primary_keys: The primary key of the collections that don't use "id"
+    :param fields: The fields to read per collection, all of them by default
+    """
+
+    def __init__(self, directus: Directus | AsyncDirectus, window: float = 0.002, max_batch: int = 100,
+                 primary_keys: dict[str, str] = None, fields: dict[str, Sequence[str]] = None):
+        self.directus = directus
+        self.window = window
+        self.max_batch = max_batch
+        self.primary_keys = primary_keys or {}
+        self.fields = fields or {}
+        self.requests = 0
+        self._memo: dict[tuple[str, Any], Future] = {}
+        self._queue: dict[str, dict[Any, Future]] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def _request(self, collection: str, ids: list) -> DirectusRequest:
+        primary_key = self._primary_key(collection)
+        request = self.directus.items(collection).filter(Operators.In, **{primary_key: ids})
+        if collection in self.fields:
+            fields = list(self.fields[collection])
+            # the items are matched to the ids by their primary key
+            if primary_key not in fields and '*' not in fields:
+                fields.append(primary_key)
+            request.fields(*fields)
+        return request.limit(-1)
+
+    def _primary_key(self, collection: str) -> str:
+        return self.primary_keys.get(collection, 'id')
+
+    def _results(self, collection: str, ids: Iterable, items: list[dict]) -> list[dict | None]:
+        # the ids may be given as strings for integer keys, as in the urls
+        primary_key = self._primary_key(collection)
+        by_key = {str(item.get(primary_key)): item for item in items}
+        return [by_key.get(str(id)) for id in ids]
+
+    def _enqueue(self, collection: str, id, future) -> dict[Any, Any] | None:
+        """
+        Queue the id, returning the batch of the collection when it is full
+        """
+        queue = self._queue.setdefault(collection, {})
+        queue[id] = future
+        if len(queue) >= self.max_batch:
+            return self._queue.pop(collection)
+        return None
+
+    def _take(self) -> dict[str, dict[Any, Any]]:
+        queue, self._queue = self._queue, {}
+        return queue
+
+    def prime(self, collection: str, id, item: dict | None):
+        """
+        Memoize an item that was read some other way
+        """
+        future = Future()
+        future.set_result(item)
+        with self._lock:
+            self._memo[(collection, id)] = future
+
+    def clear(self, collection: str | None = None, id=None):
+        """
+        Forget the memoized items, of a collection or a single one
+        """
+        with self._lock:
+            for key in list(self._memo):
+                if (collection is None or key[0] == collection) and (id is None or key[1] == id):
+                    del self._memo[key]
+
+    def load(self, collection: str, id) -> Future:
+        """
+        The item as a Future, read along with the other ids queued in the same window
+        """
+        key = (collection, id)
+        with self._lock:
+            future = self._memo.get(key)
+            if future is not None:
+                return future
+            future = self._memo[key] = Future()
+            batch = self._enqueue(collection, id, future)
+            if batch is None and self._timer is None:
+                self._timer = threading.Timer(self.window, self.dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch is not None:
+            self._fetch(collection, batch)
+        return future
+
+    def load_many(self, collection: str, ids: Iterable) -> list[dict | None]:
+        """
+        The items of the ids, read right away with the rest of the queue
+        """
+        futures = [self.load(collection, id) for id in ids]
+        self.dispatch()
+        return [future.result() for future in futures]
+
+    def dispatch(self):
+        """
+        Send the queued ids now instead of at the end of the window
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            queue = self._take()
+        for collection, batch in queue.items():
+            self._fetch(collection, batch)
+
+    def _fetch(self, collection: str, batch: dict[Any, Future]):
+        self.requests += 1
+        try:
+            items = self._request(collection, list(batch)).read().items_as_dict() or []
+        except Exception as error:
+            self._failed(collection, batch, error)
+            return
+        for future, item in zip(batch.values(), self._results(collection, batch, items)):
+            future.set_result(item)
+
+    def _failed(self, collection: str, batch: dict, error: Exception):
+        # failed ids are not memoized, loading them again retries
+        with self._lock:
+            for id in batch:
+                self._memo.pop((collection, id), None)
+        for future in batch.values():
+            future.set_exception(error)
+
+
+class AsyncDataLoader(DataLoader):
+    """
+    DataLoader for AsyncDirectus, the ids requested in the same tick of the event loop (or within `window` seconds)
+    are read together
+
+        loader = directus.loader()
+        authors = await asyncio.gather(*(loader.load("directus_users", post["user_created"]) for post in posts))
+    """
+
+    def __init__(self, directus: AsyncDirectus, window: float = 0, max_batch: int = 100,
+                 primary_keys: dict[str, str] = None, fields: dict[str, Sequence[str]] = None):
+        super().__init__(directus, window, max_batch, primary_keys, fields)
+        self._handle: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def prime(self, collection: str, id, item: dict | None):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(item)
+        self._memo[(collection, id)] = future
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, collection: str, batch: dict | None):
+        if batch is not None:
+            self._start(collection, batch)
+        elif self._handle is None:
+            self._handle = loop.call_soon(self.dispatch) if self.window <= 0 \
+                else loop.call_later(self.window, self.dispatch)
+
+    async def load(self, collection: str, id) -> dict | None:
+        key = (collection, id)
+        future = self._memo.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._memo[key] = loop.create_future()
+            self._schedule(loop, collection, self._enqueue(collection, id, future))
+        return await asyncio.shield(future)
+
+    async def load_many(self, collection: str, ids: Iterable) -> list[dict | None]:
+        return list(await asyncio.gather(*(self.load(collection, id) for id in ids)))
+
+    def dispatch(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for collection, batch in self._take().items():
+            self._start(collection, batch)
+
+    def _start(self, collection: str, batch: dict[Any, asyncio.Future]):
+        task = asyncio.ensure_future(self._fetch(collection, batch))
+        # keep a reference, the event loop only holds weak ones
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, collection: str, batch: dict[Any, asyncio.Future]):
+        self.requests += 1
+        try:
+            items = (await self._request(collection, list(batch)).read()).items_as_dict() or []
+        except Exception as error:
+            self._failed(collection, batch, error)
+            return
+        for future, item in zip(batch.values(), self._results(collection, batch, items)):
+            if not future.done():
+                future.set_result(item)
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.directus_response import DirectusResponse
+from DirectusPyWrapper.filter_base import FilterBase
+from DirectusPyWrapper.sync import SyncStore
+
+Predicate = Callable[[dict], bool]
+
+# compiled filters kept per LocalCollection
+PREDICATES_SIZE = 256
+
+
+def _compare(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    # like SQL, comparisons with null and between values of different types are false
+    def operator(value, arg):
+        try:
+            return value is not None and compare(value, arg)
+        except TypeError:
+            return False
+
+    return operator
+
+
+def _text(function: Callable[[str, str], bool]) -> Callable[[Any, Any], bool]:
+    return lambda value, arg: isinstance(value, str) and function(value, str(arg))
+
+
+def _is_null(value, arg) -> bool:
+    return (value is None) == (arg is not False)
+
+
+def _is_empty(value, arg) -> bool:
+    return (value is None or value == '' or value == [] or value == {}) == (arg is not False)
+
+
+def _not(operator: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    return lambda value, arg: not operator(value, arg)
+
+
+def _negated(operator: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    # like SQL, the negated comparisons are false for null too
+    return lambda value, arg: value is not None and not operator(value, arg)
+
+
+_contains = _text(lambda value, arg: arg in value)
+_starts_with = _text(lambda value, arg: value.startswith(arg))
+_ends_with = _text(lambda value, arg: value.endswith(arg))
+_between = _compare(lambda value, arg: arg[0] <= value <= arg[1])
+
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    '_eq': lambda value, arg: value == arg,
+    '_neq': lambda value, arg: value is not None and value != arg,
+    '_lt': _compare(lambda value, arg: value < arg),
+    '_lte': _compare(lambda value, arg: value <= arg),
+    '_gt': _compare(lambda value, arg: value > arg),
+    '_gte': _compare(lambda value, arg: value >= arg),
+    '_in': lambda value, arg: value in arg,
+    '_nin': lambda value, arg: value is not None and value not in arg,
+    '_null': _is_null,
+    '_nnull': _not(_is_null),
+    '_empty': _is_empty,
+    '_nempty': _not(_is_empty),
+    '_contains': _contains,
+    '_ncontains': _negated(_contains),
+    '_icontains': _text(lambda value, arg: arg.lower() in value.lower()),
+    '_starts_with': _starts_with,
+    '_nstarts_with': _negated(_starts_with),
+    '_ends_with': _ends_with,
+    '_nends_with': _negated(_ends_with),
+    '_between': _between,
+    '_nbetween': _negated(_between),
+}
+
+
+def compile_filter(filter: dict | FilterBase | None) -> Predicate:
+    """
+    A function telling whether an item matches a Directus filter, as plain dictionaries or as a Filter/Logical tree.
+    Filters on the fields of a relation ({"author": {"name": {"_eq": "Panos"}}}) need the related items expanded,
+    a one-to-many relation matches if any of its items does, or with _none if none of them does.
+    """
+    if isinstance(filter, FilterBase):
+        filter = filter.to_dict()
+    if not filter:
+        return lambda item: True
+    predicates = [_compile_condition(key, condition) for key, condition in filter.items()]
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda item: all(predicate(item) for predicate in predicates)
+
+
+def _compile_condition(key: str, condition: Any) -> Predicate:
+    if key == '_and':
+        predicates = [compile_filter(item) for item in condition]
+        return lambda item: all(predicate(item) for predicate in predicates)
+    if key == '_or':
+        predicates = [compile_filter(item) for item in condition]
+        return lambda item: any(predicate(item) for predicate in predicates)
+    if not isinstance(condition, dict):
+        raise ValueError(f"Invalid filter on '{key}': {condition!r}")
+
+    if not all(operator.startswith('_') for operator in condition):
+        # a filter on the fields of a related item
+        return _relation(key, compile_filter(condition))
+
+    checks, predicates = [], []
+    for operator, arg in condition.items():
+        if operator == '_some':
+            predicates.append(_relation(key, compile_filter(arg)))
+        elif operator == '_none':
+            some = _relation(key, compile_filter(arg))
+            predicates.append(lambda item, some=some: not some(item))
+        elif operator in OPERATORS:
+            checks.append((OPERATORS[operator], arg))
+        else:
+            raise NotImplementedError(f"The operator {operator} can't be evaluated locally")
+    if len(checks) == 1 and not predicates:
+        (check, arg), = checks
+        return lambda item: check(item.get(key), arg)
+    if checks:
+        predicates.append(lambda item: all(check(item.get(key), arg) for check, arg in checks))
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda item: all(predicate(item) for predicate in predicates)
+
+
+def _relation(key: str, related: Predicate) -> Predicate:
+    def relation(item: dict) -> bool:
+        value = item.get(key) if isinstance(item, dict) else None
+        if isinstance(value, list):
+            return any(isinstance(child, dict) and related(child) for child in value)
+        return isinstance(value, dict) and related(value)
+
+    return relation
+
+
+def select(item: dict, fields: list[str]) -> dict:
+    """
+    The projection of an item on Directus fields, e.g. ["id", "author.name", "tags.*"]
+    """
+    if '*' in fields:
+        return item
+    selected = {}
+    nested: dict[str, list[str]] = {}
+    for field in fields:
+        key, _, rest = field.partition('.')
+        if rest:
+            nested.setdefault(key, []).append(rest)
+        elif key in item:
+            selected[key] = item[key]
+    for key, rest in nested.items():
+        value = item.get(key)
+        if isinstance(value, dict):
+            selected[key] = select(value, rest)
+        elif isinstance(value, list):
+            selected[key] = [select(child, rest) if isinstance(child, dict) else child for child in value]
+        else:
+            selected[key] = value
+    return selected
+
+
+def _sort_key(field: str) -> Callable[[dict], tuple]:
+    # nulls sort last, and first when descending as in PostgreSQL, values of different types are grouped by type name
+    # a dotted field is the field of the related item, as in the filters
+    path = field.split('.')
+
+    def key(item: dict) -> tuple:
+        value = item
+        for part in path:
+            if isinstance(value, list):
+                raise NotImplementedError(f"Sorting on '{field}' of a one-to-many relation can't be evaluated locally")
+            value = value.get(part) if isinstance(value, dict) else None
+        return value is None, type(value).__name__, value
+
+    return key
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class LocalResponse(DirectusResponse):
+    """
+    DirectusResponse of a LocalCollection read, the items are not copied so they should not be modified
+    """
+
+    def __init__(self, data: list[dict] | dict | None, query: dict = None, collection: Any = None,
+                 meta: dict = None):
+        self.response = None
+        self.query = query
+        self.collection = collection
+        self.metrics = None
+        self._parsed = {}
+        self.json = {'data': data} if meta is None else {'data': data, 'meta': meta}
+
+    @property
+    def status_code(self) -> int:
+        return 200 if self.json['data'] is not None else 403
+
+
+class LocalRequest(DirectusRequest):
+    """
+    Request evaluated by a LocalCollection, with the builders of DirectusRequest
+    """
+
+    def __init__(self, local: LocalCollection, collection_class=None):
+        super().__init__(None, local.name, collection_class)
+        self.local = local
+
+    def _clone(self) -> LocalRequest:
+        request = LocalRequest(self.local, self.collection_class)
+        request.params = dict(self.params)
+        return request
+
+    def read(self, id: Optional[int | str] = None, method="search", stream: bool = False) -> LocalResponse:
+        return self.local.query(self._query(), id, self.collection_class)
+
+    def read_all(self, concurrency: int = 4, page_size: int = 1000) -> LocalResponse:
+        query = {key: value for key, value in self._query().items() if key not in ('page', 'offset')}
+        return self.local.query({**query, 'limit': -1}, None, self.collection_class)
+
+    def _write(self, *args, **kwargs):
+        raise TypeError("A LocalCollection is read only, write to Directus and sync it")
+
+    create_one = create_many = update_one = update_many = update_batch = delete_one = delete_many = _write
+    bulk_create = bulk_update = bulk_delete = _write
+
+
+class LocalCollection:
+    """
+    Evaluates queries over a local copy of a collection (a SyncStore or a list of items), in memory.
+    The items are indexed by their primary key and by the `indexes` fields, the filters that are conjunctions of
+    _eq/_in on indexed fields only look at the matching items instead of scanning them all.
+
+        local = LocalCollection(sync.store, indexes=["status", "author"])
+        response = local.items().filter(status="published").sort("date_created", False).limit(10).read()
+
+    Like Directus, a read returns at most 100 items unless a limit is set (limit(-1) for all of them).
+    A SQLiteStore is loaded in memory, call refresh() after syncing it or apply the changes with upsert/remove.
+
+    :param source: The items, a SyncStore is read with its values()
+    :param indexes: The fields that get an index
+    :param primary_key: The primary key of the items
+    :param name: The name of the collection, used as the collection of the requests
+    """
+
+    def __init__(self, source: SyncStore | Iterable[dict], indexes: Sequence[str] = (), primary_key: str = 'id',
+                 name: str = 'local'):
+        self.source = source
+        self.primary_key = primary_key
+        self.name = name
+        self.index_fields = list(indexes)
+        self._lock = threading.RLock()
+        self._predicates: dict[str, Predicate] = {}
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reload the items from the source and rebuild the indexes
+        """
+        items = self.source.values() if isinstance(self.source, SyncStore) else self.source
+        with self._lock:
+            self.rows: dict[Any, dict] = {}
+            self.indexes: dict[str, dict[Any, set]] = {field: {} for field in self.index_fields}
+            # items with values that can't be hashed (lists, objects) are candidates of every lookup
+            self.unindexed: dict[str, set] = {field: set() for field in self.index_fields}
+            self.upsert(items)
+
+    def upsert(self, items: Iterable[dict]):
+        with self._lock:
+            for item in items:
+                key = item[self.primary_key]
+                if key in self.rows:
+                    self._unindex(key, self.rows[key])
+                self.rows[key] = item
+                for field in self.index_fields:
+                    value = item.get(field)
+                    if _hashable(value):
+                        self.indexes[field].setdefault(value, set()).add(key)
+                    else:
+                        self.unindexed[field].add(key)
+
+    def remove(self, keys: Iterable):
+        with self._lock:
+            for key in keys:
+                item = self.rows.pop(key, None)
+                if item is not None:
+                    self._unindex(key, item)
+
+    def _unindex(self, key, item: dict):
+        for field in self.index_fields:
+            value = item.get(field)
+            if _hashable(value):
+                keys = self.indexes[field].get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.indexes[field][value]
+            else:
+                self.unindexed[field].discard(key)
+
+    def items(self, collection_class=None) -> LocalRequest:
+        return LocalRequest(self, collection_class)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _lookup(self, field: str, values: Iterable) -> set | None:
+        if field == self.primary_key:
+            return {value for value in values if _hashable(value) and value in self.rows}
+        if field not in self.indexes:
+            return None
+        index = self.indexes[field]
+        keys = set(self.unindexed[field])
+        for value in values:
+            if _hashable(value):
+                keys |= index.get(value, set())
+        return keys
+
+    def _candidates(self, filter: dict) -> set | None:
+        """
+        The keys of the items that may match the filter according to the indexes, None if they can't narrow it down
+        """
+        candidates = None
+        for key, condition in filter.items():
+            found = None
+            if key == '_and':
+                for child in condition:
+                    keys = self._candidates(child)
+                    if keys is not None:
+                        found = keys if found is None else found & keys
+            elif key == '_or':
+                branches = [self._candidates(child) for child in condition]
+                if branches and all(branch is not None for branch in branches):
+                    found = set().union(*branches)
+            elif isinstance(condition, dict):
+                if '_eq' in condition and condition['_eq'] is not None:
+                    found = self._lookup(key, [condition['_eq']])
+                elif isinstance(condition.get('_in'), list):
+                    found = self._lookup(key, condition['_in'])
+            if found is not None:
+                candidates = found if candidates is None else candidates & found
+        return candidates
+
+    def _predicate(self, filter: dict) -> Predicate:
+        # compiled once per filter, like FilterBase.compile
+        key = json.dumps(filter, sort_keys=True, default=repr)
+        predicate = self._predicates.get(key)
+        if predicate is None:
+            if len(self._predicates) >= PREDICATES_SIZE:
+                self._predicates.clear()
+            predicate = self._predicates[key] = compile_filter(filter)
+        return predicate
+
+    def query(self, query: dict, id=None, collection_class=None) -> LocalResponse:
+        """
+        Evaluate the query params of a DirectusRequest
+        """
+        if 'aggregate' in query:
+            raise NotImplementedError("Aggregations can't be evaluated locally")
+        fields = query.get('fields', '*')
+        fields = fields.split(',') if isinstance(fields, str) else list(fields)
+        if id is not None:
+            item = self.rows.get(id)
+            return LocalResponse(None if item is None else select(item, fields), query, collection_class)
+
+        filter = query.get('filter') or {}
+        if isinstance(filter, str):
+            filter = json.loads(filter)
+        with self._lock:
+            keys = self._candidates(filter) if filter else None
+            rows = list(self.rows.values()) if keys is None else [self.rows[key] for key in keys if key in self.rows]
+        if filter:
+            predicate = self._predicate(filter)
+            rows = [item for item in rows if predicate(item)]
+        if query.get('search') not in (None, ''):
+            search = str(query['search']).lower()
+            rows = [item for item in rows
+                    if any(isinstance(value, (str, int, float)) and search in str(value).lower()
+                           for value in item.values())]
+        filter_count = len(rows)
+
+        sort = query.get('sort') or []
+        sort = sort.split(',') if isinstance(sort, str) else sort
+        if not sort and keys is not None:
+            # the index lookups come out unordered, keep the order of the primary key like Directus
+            sort = [self.primary_key]
+        for field in reversed(sort):
+            rows.sort(key=_sort_key(field.lstrip('-')), reverse=field.startswith('-'))
+
+        limit = int(query.get('limit', 100))
+        # without a limit there is a single page
+        offset = (int(query['page']) - 1) * limit if query.get('page') and limit >= 0 else int(query.get('offset', 0))
+        rows = rows[offset:] if limit < 0 else rows[offset:offset + limit]
+        data = rows if '*' in fields else [select(item, fields) for item in rows]
+
+        meta = None
+        if query.get('meta'):
+            requested = query['meta'].split(',') if isinstance(query['meta'], str) else query['meta']
+            counts = {'filter_count': filter_count, 'total_count': len(self.rows)}
+            meta = {key: value for key, value in counts.items() if '*' in requested or key in requested}
+        return LocalResponse(data, query, collection_class, meta)
@@ -1,14 +1,19 @@
 from DirectusPyWrapper.filter_base import FilterBase
+from DirectusPyWrapper.filter_compiler import Group, Predicate, optimize, parse, simplify
 from DirectusPyWrapper.logical_operators import LogicalOperators
 
 
 class Logical(FilterBase):
     def __init__(self, logical_operator: LogicalOperators, *filters: FilterBase):
         self.logical_operator = logical_operator
-        self.filters = list(filters)
+        self.filters = tuple(filters)
 
-    def __json__(self):
-        params = {self.logical_operator.value: []}
-        for f in self.filters:
-            params[self.logical_operator.value].append(f)
-        return params
+    def to_dict(self) -> dict:
+        logical_operator = getattr(self.logical_operator, 'value', self.logical_operator)
+        return {logical_operator: [f.to_dict() if isinstance(f, FilterBase) else f for f in self.filters]}
+
+    def _tree(self) -> Predicate | Group:
+        # the trees of the nested filters are reused, e.g. when a request adds a filter to the current ones
+        logical_operator = getattr(self.logical_operator, 'value', self.logical_operator)
+        return simplify(Group((), logical_operator, [f.tree() if isinstance(f, FilterBase) else optimize(parse(f))
+                                                     for f in self.filters]))
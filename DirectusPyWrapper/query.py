@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Optional
+
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.directus_response import DirectusResponse
+from DirectusPyWrapper.filter_base import FilterBase
+from DirectusPyWrapper.json_codec import JsonCodec, get_codec
+
+
+class Param:
+    """
+    Placeholder of a value that is given when the compiled query is bound, e.g. filter(status=Param("status"))
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f'Param({self.name!r})'
+
+
+class Query:
+    """
+    Immutable description of a read, every builder returns a new Query so that a base query can be shared and extended
+
+        published = Query("articles").fields("id", "title").filter(status="published")
+        latest = published.sort("date_created", False).limit(10)
+    """
+    __slots__ = ('collection', 'collection_class', 'params')
+
+    def __init__(self, collection: str, collection_class=None, params: dict = None):
+        object.__setattr__(self, 'collection', collection)
+        object.__setattr__(self, 'collection_class', collection_class)
+        object.__setattr__(self, 'params', MappingProxyType(dict(params or {})))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Query is immutable, the builders return a new one")
+
+    def _derive(self, builder, *args, **kwargs) -> Query:
+        request = DirectusRequest(None, self.collection, self.collection_class)
+        request.params = dict(self.params)
+        builder(request, *args, **kwargs)
+        return Query(self.collection, self.collection_class, request.params)
+
+    def fields(self, *fields) -> Query:
+        return self._derive(DirectusRequest.fields, *fields)
+
+    def filter(self, *args, **filters) -> Query:
+        return self._derive(DirectusRequest.filter, *args, **filters)
+
+    def filters(self, filters: list) -> Query:
+        return self._derive(DirectusRequest.filters, filters)
+
+    def sort(self, field, asc=True) -> Query:
+        return self._derive(DirectusRequest.sort, field, asc)
+
+    def search(self, search: str | int | Param = None) -> Query:
+        return self._derive(DirectusRequest.search, search)
+
+    def page(self, page: int | Param = 1) -> Query:
+        return self._derive(DirectusRequest.page, page)
+
+    def limit(self, limit: int | Param = -1) -> Query:
+        return self._derive(DirectusRequest.limit, limit)
+
+    def offset(self, offset: int | Param = 0) -> Query:
+        return self._derive(DirectusRequest.offset, offset)
+
+    def include_count(self) -> Query:
+        return self._derive(DirectusRequest.include_count)
+
+    def aggregate(self, *args, **kwargs) -> Query:
+        return self._derive(DirectusRequest.aggregate, *args, **kwargs)
+
+    def group_by(self, *fields) -> Query:
+        return self._derive(DirectusRequest.group_by, *fields)
+
+    def compile(self, codec: str | JsonCodec = None) -> CompiledQuery:
+        """
+        Turn the filters into plain dictionaries and encode the request body once, to send the query many times
+        """
+        query = {key: value.compile() if isinstance(value, FilterBase) else value for key, value in self.params.items()}
+        return CompiledQuery(self.collection, self.collection_class, query, get_codec(codec))
+
+
+def _param_paths(value: Any, path: tuple = ()) -> list[tuple[tuple, str]]:
+    if isinstance(value, Param):
+        return [(path, value.name)]
+    if isinstance(value, dict):
+        return [found for key, item in value.items() for found in _param_paths(item, (*path, key))]
+    if isinstance(value, list):
+        return [found for index, item in enumerate(value) for found in _param_paths(item, (*path, index))]
+    return []
+
+
+def _replace(container: Any, path: tuple, value: Any) -> Any:
+    # copies only the containers along the path, the rest is shared with the compiled query
+    if not path:
+        return value
+    copy = dict(container) if isinstance(container, dict) else list(container)
+    copy[path[0]] = _replace(container[path[0]], path[1:], value)
+    return copy
+
+
+class CompiledQuery:
+    """
+    A query ready to be sent, with its SEARCH body and query string encoded once.
+    Queries with Param placeholders are bound to values with bind(), which only encodes the new body.
+
+        by_status = Query("articles").fields("id", "title").filter(status=Param("status")).compile()
+        response = by_status.bind(status="published").read(directus)
+    """
+
+    def __init__(self, collection: str, collection_class, query: dict, codec: JsonCodec):
+        self.collection = collection
+        self.collection_class = collection_class
+        self.query = query
+        self.codec = codec
+        self.parameters = _param_paths(query)
+        self.body: bytes | None = None if self.parameters else codec.dumps({'query': query})
+        self._query_params: dict | None = None
+
+    @property
+    def names(self) -> set[str]:
+        return {name for _, name in self.parameters}
+
+    def bind(self, **values) -> CompiledQuery:
+        unknown = set(values) - self.names
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        query = self.query
+        for path, name in self.parameters:
+            if name in values:
+                query = _replace(query, path, values[name])
+        return CompiledQuery(self.collection, self.collection_class, query, self.codec)
+
+    @property
+    def query_params(self) -> dict:
+        if self._query_params is None:
+            self._query_params = {key: self.codec.dumps(value).decode() if isinstance(value, dict) else value
+                                  for key, value in self.query.items()}
+        return self._query_params
+
+    def read(self, directus, id: Optional[int | str] = None, method="search", stream: bool = False) -> DirectusResponse:
+        """
+        Send the query with a Directus or an AsyncDirectus client, with the latter the result has to be awaited
+        """
+        if self.parameters:
+            raise ValueError(f"Unbound parameters: {', '.join(sorted(self.names))}")
+        request = directus.items(self.collection, self.collection_class)
+        return request._read(self.query, id, method, stream, body=self.body, query_params=self.query_params)
@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, TYPE_CHECKING
+
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.directus_response import list_type_adapter
+from DirectusPyWrapper.local_query import LocalCollection
+from DirectusPyWrapper.sync import SyncStore
+
+if TYPE_CHECKING:
+    from DirectusPyWrapper.directus import Directus
+    from DirectusPyWrapper.async_directus import AsyncDirectus
+
+logger = logging.getLogger('DirectusPyWrapper')
+
+Callback = Callable[['RealtimeEvent'], Any | Awaitable[Any]]
+
+
+class RealtimeError(Exception):
+    def __init__(self, message: dict):
+        self.message = message
+        error = message.get('error') or {}
+        super().__init__(f"{error.get('code', 'ERROR')}: {error.get('message', message)}")
+
+
+class RealtimeEvent:
+    """
+    :param subscription: The subscription the event belongs to
+    :param event: "init" with the current items when subscribing, then "create", "update" or "delete"
+    :param data: The items, or the primary keys of the deleted ones
+    """
+
+    def __init__(self, subscription: Subscription, event: str, data: list):
+        self.subscription = subscription
+        self.event = event
+        self.data = data
+
+    @property
+    def collection(self) -> str:
+        return self.subscription.collection
+
+    @property
+    def keys(self) -> list:
+        """
+        The primary keys of the items of the event
+        """
+        if self.event == 'delete':
+            return [item[self.subscription.primary_key] if isinstance(item, dict) else item for item in self.data]
+        return [item.get(self.subscription.primary_key) for item in self.data]
+
+    @property
+    def items(self) -> list[dict] | list[Any]:
+        """
+        The items as dictionaries, or as the collection_class of the subscription
+        """
+        if self.event == 'delete' or self.subscription.collection_class is None:
+            return self.data
+        return list_type_adapter(self.subscription.collection_class).validate_python(self.data)
+
+    def __repr__(self):
+        return f'RealtimeEvent({self.collection}, {self.event}, {len(self.data)} items)'
+
+
+class Subscription:
+    """
+    Events of a collection, delivered to the callback or, without one, through `async for event in subscription`.
+    `ready` is set once the server confirmed the subscription with the "init" event.
+    """
+    _uids = itertools.count(1)
+
+    def __init__(self, realtime: Realtime, collection: str, query: dict | None = None, collection_class=None,
+                 callback: Callback | None = None, event: str | None = None, primary_key: str = 'id'):
+        self.realtime = realtime
+        self.collection = collection
+        self.query = query
+        self.collection_class = collection_class
+        self.callback = callback
+        self.event = event
+        self.primary_key = primary_key
+        self.uid = f'{collection}-{next(self._uids)}'
+        self.ready = threading.Event()
+        self._queue: asyncio.Queue | None = None
+
+    @property
+    def message(self) -> dict:
+        message = {'type': 'subscribe', 'collection': self.collection, 'uid': self.uid}
+        if self.query:
+            message['query'] = self.query
+        if self.event:
+            message['event'] = self.event
+        return message
+
+    async def _deliver(self, event: RealtimeEvent):
+        if self.callback is None:
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._queue.put_nowait(event)
+            return
+        # a failing callback must not end the connection, the other events and subscriptions go on
+        try:
+            result = self.callback(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception('Realtime callback of %s failed on %r', self.collection, event)
+
+    def unsubscribe(self):
+        self.realtime.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> RealtimeEvent:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return await self._queue.get()
+
+
+def _query(request: DirectusRequest) -> dict:
+    # the realtime API takes the query as an object, like a SEARCH request
+    query = dict(request._query())
+    if 'aggregate' not in query:
+        query.pop('groupBy', None)
+    if isinstance(query.get('fields'), str):
+        query['fields'] = query['fields'].split(',')
+    return query
+
+
+class Realtime:
+    """
+    Subscriptions to the create, update and delete events of collections, over the realtime WebSocket API of Directus
+    (needs `pip install websockets`). The connection authenticates with the token of the client, authenticates again
+    when the token is refreshed, and after a disconnection reconnects and subscribes again, with a backoff.
+
+        realtime = directus.realtime()
+        realtime.subscribe(directus.items("posts").fields("id", "title"), lambda event: print(event.event, event.items))
+        realtime.start()  # in a background thread, or `await realtime.run()` in an event loop
+
+    :param directus: The client, Directus or AsyncDirectus
+    :param url: The WebSocket url, by default /websocket on the url of the client
+    :param reconnect_delay: Seconds before the first reconnection attempt, doubled on every failed one
+    :param max_reconnect_delay: The longest wait between attempts
+    :param heartbeat: Seconds between the checks of the token while no message arrives
+    """
+
+    def __init__(self, directus: Directus | AsyncDirectus, url: str | None = None, reconnect_delay: float = 1,
+                 max_reconnect_delay: float = 30, heartbeat: float = 15):
+        self.directus = directus
+        self.url = url or directus.url.replace('http', 'ws', 1).rstrip('/') + '/websocket'
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.heartbeat = heartbeat
+        self.subscriptions: dict[str, Subscription] = {}
+        self.connections = 0
+        self._websocket = None
+        self._token: str | None = None
+        self._renewed = False
+        self._subscribed = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, collection: str | DirectusRequest, callback: Callback | None = None, query: dict = None,
+                  collection_class=None, event: str | None = None, primary_key: str = 'id') -> Subscription:
+        """
+        :param collection: The collection, or a request whose collection, collection_class and query (fields,
+                           filter...) are used
+        :param callback: Called with every RealtimeEvent, may be a coroutine function
+        :param event: Only this event ("create", "update" or "delete"), all of them by default
+        :param primary_key: The primary key of the collection
+        """
+        if isinstance(collection, DirectusRequest):
+            query = query or _query(collection)
+            collection_class = collection_class or collection.collection_class
+            collection = collection.collection
+        subscription = Subscription(self, collection, query, collection_class, callback, event, primary_key)
+        self.subscriptions[subscription.uid] = subscription
+        if self._websocket is not None and self._subscribed:
+            self._submit(self._send(subscription.message))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if self.subscriptions.pop(subscription.uid, None) is not None and self._websocket is not None:
+            self._submit(self._send({'type': 'unsubscribe', 'uid': subscription.uid}))
+
+    def _submit(self, coroutine):
+        # the subscriptions may change from the thread of the event loop or from any other
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            asyncio.ensure_future(coroutine)
+        else:
+            asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def _send(self, message: dict):
+        websocket = self._websocket
+        if websocket is not None:
+            await websocket.send(self.directus.codec.dumps(message).decode())
+
+    async def _refresh_token(self, renew: bool = False) -> str | None:
+        # AsyncDirectus refreshes with coroutines, Directus blocks so it is done in a thread
+        refresh = self.directus._renew if renew else self.directus._refresh_if_expiring
+        if self.directus._can_refresh:
+            if inspect.iscoroutinefunction(refresh):
+                await refresh()
+            else:
+                await asyncio.to_thread(refresh)
+        return self.directus.token
+
+    async def _authenticate(self, websocket, renew: bool = False):
+        self._token = await self._refresh_token(renew)
+        if self._token is not None:
+            await websocket.send(self.directus.codec.dumps({'type': 'auth', 'access_token': self._token}).decode())
+
+    async def _handle(self, websocket, message: dict):
+        message_type = message.get('type')
+        if message_type == 'ping':
+            await self._send({'type': 'pong'})
+        elif message_type == 'auth':
+            if message.get('status') != 'error':
+                self._renewed = False
+                if not self._subscribed:
+                    await self._subscribe_all(websocket)
+                return
+            error = RealtimeError(message)
+            # a token that was just renewed and still fails won't get any better
+            if not self.directus._can_refresh or self._renewed:
+                raise error
+            logger.info('Realtime authentication failed (%s), refreshing the token', error)
+            self._renewed = True
+            await self._authenticate(websocket, renew=True)
+        elif message_type in ('subscribe', 'subscription'):
+            subscription = self.subscriptions.get(message.get('uid'))
+            if subscription is None:
+                return
+            if message.get('status') == 'error':
+                logger.warning('Realtime subscription to %s failed: %s', subscription.collection,
+                               RealtimeError(message))
+                return
+            if message.get('event') == 'init':
+                subscription.ready.set()
+            if message.get('event') is not None:
+                await subscription._deliver(RealtimeEvent(subscription, message['event'], message.get('data') or []))
+
+    async def _subscribe_all(self, websocket):
+        self._subscribed = True
+        for subscription in list(self.subscriptions.values()):
+            await websocket.send(self.directus.codec.dumps(subscription.message).decode())
+
+    async def _session(self, websocket):
+        # the subscriptions are sent once the server accepted the token, without a token right away
+        self._subscribed = False
+        await self._authenticate(websocket)
+        if self._token is None:
+            await self._subscribe_all(websocket)
+        checked = time.monotonic()
+        # wait_for may swallow the cancellation when it arrives along with its timeout, so the flag ends the loop too
+        while not self._closing:
+            try:
+                raw = await asyncio.wait_for(websocket.recv(), self.heartbeat)
+            except asyncio.TimeoutError:
+                raw = None
+            if raw is not None:
+                await self._handle(websocket, self.directus.codec.loads(raw))
+            if time.monotonic() - checked >= self.heartbeat:
+                # authenticate again if the token was refreshed, the connection would be closed when it expires
+                checked = time.monotonic()
+                if await self._refresh_token() != self._token:
+                    await self._authenticate(websocket)
+
+    async def run(self):
+        """
+        Stay connected until close(), delivering the events to the subscriptions. After an error, a rejected token
+        included, it is logged and the connection is opened again
+        """
+        import websockets
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._closing = False
+        delay = self.reconnect_delay
+        while not self._closing:
+            try:
+                async with websockets.connect(self.url) as websocket:
+                    self._websocket = websocket
+                    self.connections += 1
+                    delay = self.reconnect_delay
+                    try:
+                        await self._session(websocket)
+                    except asyncio.CancelledError:
+                        # close normally, leaving the context manager with an exception closes with an error code
+                        await websocket.close()
+                        raise
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as error:
+                logger.info('Realtime connection lost (%s), reconnecting in %ss', error, delay)
+            except RealtimeError as error:
+                logger.warning('Realtime authentication failed (%s), reconnecting in %ss', error, delay)
+            except Exception:
+                logger.exception('Realtime connection failed, reconnecting in %ss', delay)
+            finally:
+                self._websocket = None
+                for subscription in self.subscriptions.values():
+                    subscription.ready.clear()
+            if self._closing:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def close(self):
+        self._closing = True
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def start(self) -> Realtime:
+        """
+        Run in a background thread, the callbacks are called from that thread
+        """
+        started = threading.Event()
+
+        async def main():
+            self._loop, self._task = asyncio.get_running_loop(), asyncio.current_task()
+            started.set()
+            await self.run()
+
+        def target():
+            try:
+                asyncio.run(main())
+            except asyncio.CancelledError:
+                pass
+
+        self._thread = threading.Thread(target=target, name='directus-realtime', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._thread is not None and self._loop is not None:
+            self._closing = True
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join()
+            self._thread = None
+
+
+def invalidate_cache(directus: Directus | AsyncDirectus) -> Callback:
+    """
+    A callback dropping the cached responses of the collection of every change, from the ResponseCache and the
+    ConditionalCache of the client
+    """
+
+    def callback(event: RealtimeEvent):
+        if event.event == 'init':
+            return
+        if directus.cache is not None:
+            directus.cache.invalidate(event.collection)
+        if directus.conditional is not None:
+            directus.conditional.invalidate(event.collection)
+
+    return callback
+
+
+def _stored_keys(keys: list) -> list:
+    # the keys come as strings in the delete events, the stored ones may be integers
+    return [*keys, *(int(key) for key in keys if isinstance(key, str) and key.isdigit())]
+
+
+def mirror(target: SyncStore | LocalCollection) -> Callback:
+    """
+    A callback applying the changes to a SyncStore (e.g. the one of a CollectionSync) or a LocalCollection.
+    The changed fields are merged into the stored items, so the subscription should select the same fields.
+    """
+
+    def callback(event: RealtimeEvent):
+        primary_key = event.subscription.primary_key
+        if event.event == 'delete':
+            keys = _stored_keys(event.keys)
+            if isinstance(target, LocalCollection):
+                target.remove(keys)
+            else:
+                target.delete(set(keys))
+            return
+        if isinstance(target, LocalCollection):
+            target.upsert([{**target.rows.get(item[primary_key], {}), **item} for item in event.data])
+        else:
+            target.upsert({item[primary_key]: {**(target.get(item[primary_key]) or {}), **item}
+                           for item in event.data})
+
+    return callback
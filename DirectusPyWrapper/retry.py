@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'SEARCH', 'PUT', 'PATCH', 'DELETE'})
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before a failed request is sent again.
+
+    Requests are retried on connection errors and on the statuses of `status_forcelist`, but only if their method is
+    idempotent, so a POST that may have created items is never sent twice. A 429 is the exception, the server
+    rejected the request without processing it, so it is retried for every method.
+
+    :param total: Maximum number of retries
+    :param backoff_factor: The delay before the n-th retry is backoff_factor * 2 ** n seconds
+    :param max_backoff: Upper bound of the delay
+    :param jitter: Pick a random delay between 0 and the computed one, so that clients don't retry in lockstep
+    :param status_forcelist: The statuses that are retried
+    :param methods: The methods that are retried on errors other than 429
+    :param respect_retry_after: Wait as long as the Retry-After header says, if the server sent one
+    """
+
+    def __init__(self, total: int = 3, backoff_factor: float = 0.5, max_backoff: float = 30, jitter: bool = True,
+                 status_forcelist=(429, 502, 503, 504), methods=IDEMPOTENT_METHODS, respect_retry_after: bool = True):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(self, method: str, attempt: int, status_code: int | None = None) -> bool:
+        """
+        :param method: The method of the request
+        :param attempt: How many times the request has already been retried
+        :param status_code: The status of the response, None if the request failed with a connection error
+        """
+        if attempt >= self.total:
+            return False
+        if status_code == 429 and 429 in self.status_forcelist:
+            return True
+        if status_code is not None and status_code not in self.status_forcelist:
+            return False
+        return method.upper() in self.methods
+
+    def backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        if self.respect_retry_after and retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.max_backoff)
+        delay = min(self.backoff_factor * 2 ** attempt, self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+def parse_retry_after(retry_after: str) -> float | None:
+    """
+    Retry-After is either a number of seconds or an HTTP date
+    """
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+class TokenBucket:
+    """
+    Client side rate limiter, allowing `rate` requests per second with bursts of up to `capacity` requests.
+    Share one between the clients of a process to keep them all under the server's rate limit.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, returning how many seconds the caller has to wait before using it
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
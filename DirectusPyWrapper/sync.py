@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, Sequence
+
+from DirectusPyWrapper._or import _or
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.filter import Filter
+from DirectusPyWrapper.operators import Operators
+
+
+class SyncStore(ABC):
+    """
+    Local copy of a collection, with the high-water mark of the last sync
+    """
+
+    @abstractmethod
+    def get_mark(self) -> Any | None:
+        pass
+
+    @abstractmethod
+    def set_mark(self, mark: Any):
+        pass
+
+    @abstractmethod
+    def upsert(self, items: dict[Any, dict]):
+        """
+        :param items: The items by their primary key
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, keys: set):
+        pass
+
+    @abstractmethod
+    def keys(self) -> set:
+        pass
+
+    @abstractmethod
+    def get(self, key) -> dict | None:
+        pass
+
+    @abstractmethod
+    def values(self) -> Iterator[dict]:
+        pass
+
+    def __len__(self):
+        return len(self.keys())
+
+
+class MemoryStore(SyncStore):
+    def __init__(self):
+        self.items: dict[Any, dict] = {}
+        self.mark = None
+        self._lock = threading.Lock()
+
+    def get_mark(self) -> Any | None:
+        return self.mark
+
+    def set_mark(self, mark: Any):
+        self.mark = mark
+
+    def upsert(self, items: dict[Any, dict]):
+        with self._lock:
+            self.items.update(items)
+
+    def delete(self, keys: set):
+        with self._lock:
+            for key in keys:
+                self.items.pop(key, None)
+
+    def keys(self) -> set:
+        return set(self.items)
+
+    def get(self, key) -> dict | None:
+        return self.items.get(key)
+
+    def values(self) -> Iterator[dict]:
+        return iter(list(self.items.values()))
+
+    def __len__(self):
+        return len(self.items)
+
+
+class SQLiteStore(SyncStore):
+    """
+    Keeps the items as JSON in a SQLite table, so the mirror survives restarts and can be shared between processes
+
+    :param path: The database file, ":memory:" for a private in-memory database
+    :param table: The table of the collection, several collections can share a database
+    """
+
+    def __init__(self, path: str, table: str):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name '{table}'")
+        self.table = table
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.connection:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (key TEXT PRIMARY KEY, item TEXT NOT NULL)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS sync_marks (name TEXT PRIMARY KEY, mark TEXT)')
+
+    def get_mark(self) -> Any | None:
+        with self._lock:
+            row = self.connection.execute('SELECT mark FROM sync_marks WHERE name = ?', (self.table,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set_mark(self, mark: Any):
+        with self._lock, self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO sync_marks VALUES (?, ?)', (self.table, json.dumps(mark)))
+
+    def upsert(self, items: dict[Any, dict]):
+        with self._lock, self.connection:
+            self.connection.executemany(f'INSERT OR REPLACE INTO "{self.table}" VALUES (?, ?)',
+                                        [(json.dumps(key), json.dumps(item, default=str))
+                                         for key, item in items.items()])
+
+    def delete(self, keys: set):
+        with self._lock, self.connection:
+            self.connection.executemany(f'DELETE FROM "{self.table}" WHERE key = ?',
+                                        [(json.dumps(key),) for key in keys])
+
+    def keys(self) -> set:
+        with self._lock:
+            return {json.loads(key) for key, in self.connection.execute(f'SELECT key FROM "{self.table}"')}
+
+    def get(self, key) -> dict | None:
+        with self._lock:
+            row = self.connection.execute(f'SELECT item FROM "{self.table}" WHERE key = ?',
+                                          (json.dumps(key),)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def values(self) -> Iterator[dict]:
+        with self._lock:
+            rows = self.connection.execute(f'SELECT item FROM "{self.table}"').fetchall()
+        return (json.loads(item) for item, in rows)
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+
+class SyncResult:
+    def __init__(self, upserted: int, deleted: int, mark: Any, reconciled: bool):
+        self.upserted = upserted
+        self.deleted = deleted
+        self.mark = mark
+        self.reconciled = reconciled
+
+    def __repr__(self):
+        return f'SyncResult(upserted={self.upserted}, deleted={self.deleted}, mark={self.mark!r})'
+
+
+class CollectionSync:
+    """
+    Mirrors the items of a request into a SyncStore. The first run copies them all, the next ones fetch only the
+    items changed since the highest mark seen, so the cost of a run follows the rate of change and not the size of
+    the collection. The items at the mark itself are fetched again, since others may be written later with the same
+    mark, and the ones that did not change are skipped. Deletions leave no mark, they are found by comparing the
+    primary keys every `reconcile_every` runs.
+
+        sync = CollectionSync(directus.items("articles").filter(status="published"), MemoryStore())
+        sync.run()
+
+    :param request: The items to mirror, its filter and fields are kept
+    :param store: Where the items are kept
+    :param mark_fields: The fields of the high-water mark, an item changed if any of them is greater than the mark.
+                        date_updated is null until an item is first updated, hence date_created as well by default
+    :param primary_key: The primary key of the collection
+    :param page_size: The items fetched per request
+    :param reconcile_every: Compare the primary keys every this many runs, None to only do it with reconcile()
+    """
+
+    def __init__(self, request: DirectusRequest, store: SyncStore,
+                 mark_fields: str | Sequence[str] = ('date_updated', 'date_created'), primary_key: str = 'id',
+                 page_size: int = 1000, reconcile_every: int | None = 10):
+        self.request = request
+        self.store = store
+        self.mark_fields = [mark_fields] if isinstance(mark_fields, str) else list(mark_fields)
+        self.primary_key = primary_key
+        self.page_size = page_size
+        self.reconcile_every = reconcile_every
+        self.runs = 0
+
+    def _changes_request(self, mark: Any) -> DirectusRequest:
+        # the response cache would hide the changes, and the pages are sorted by the primary key
+        request = self.request._clone().no_cache()
+        request.params.pop('sort', None)
+        fields = request.params.get('fields')
+        if fields and '*' not in fields.split(','):
+            missing = [field for field in [self.primary_key, *self.mark_fields] if field not in fields.split(',')]
+            request.params['fields'] = ','.join([fields, *missing])
+        if mark is not None:
+            changed = [Filter(Operators.GreaterThanOrEqual, **{field: mark}) for field in self.mark_fields]
+            request._add_filters(changed[0] if len(changed) == 1 else _or(*changed))
+        return request
+
+    def _keys_request(self) -> DirectusRequest:
+        request = self.request._clone().no_cache().fields(self.primary_key)
+        request.params.pop('sort', None)
+        return request
+
+    def _mark(self, items: list[dict], mark: Any) -> Any:
+        marks = [item[field] for item in items for field in self.mark_fields if item.get(field) is not None]
+        if mark is not None:
+            marks.append(mark)
+        return max(marks) if marks else None
+
+    def _unchanged(self, item: dict, initial: Any) -> bool:
+        # only the items at the mark may have been synced already
+        return any(item.get(field) == initial for field in self.mark_fields) and \
+            self.store.get(item[self.primary_key]) == item
+
+    def _apply(self, page: list[dict], mark: Any, initial: Any) -> tuple[int, Any]:
+        """
+        Store the changed items of the page, returning how many there were and the new mark
+        """
+        changed = page if initial is None else [item for item in page if not self._unchanged(item, initial)]
+        if changed:
+            self.store.upsert({item[self.primary_key]: item for item in changed})
+        return len(changed), self._mark(page, mark)
+
+    def _reconcile(self, keys: set) -> int:
+        deleted = self.store.keys() - keys
+        if deleted:
+            self.store.delete(deleted)
+        return len(deleted)
+
+    def _should_reconcile(self, mark: Any) -> bool:
+        # the first run copies everything, there is nothing to compare yet
+        return mark is not None and self.reconcile_every is not None and self.runs % self.reconcile_every == 0
+
+    def run(self, reconcile: bool | None = None) -> SyncResult:
+        """
+        :param reconcile: Compare the primary keys to drop the deleted items, by default every `reconcile_every` runs
+        """
+        self.runs += 1
+        mark = initial = self.store.get_mark()
+        upserted = 0
+        for response in self._changes_request(initial).iter_pages(self.page_size, keyset=self.primary_key):
+            changed, mark = self._apply(response.items_as_dict() or [], mark, initial)
+            upserted += changed
+        # the mark is saved after all the pages, an interrupted run starts over from the previous one
+        self.store.set_mark(mark)
+
+        deleted = 0
+        reconcile = self._should_reconcile(initial) if reconcile is None else reconcile
+        if reconcile:
+            deleted = self.reconcile()
+        return SyncResult(upserted, deleted, mark, reconcile)
+
+    def reconcile(self) -> int:
+        """
+        Drop the items that are no longer on the server, returning how many were dropped
+        """
+        # the keys are read from the dicts, the request may build models
+        keys = {item[self.primary_key]
+                for response in self._keys_request().iter_pages(self.page_size * 10, keyset=self.primary_key)
+                for item in response.items_as_dict() or []}
+        return self._reconcile(keys)
+
+
+class AsyncCollectionSync(CollectionSync):
+    """
+    CollectionSync for the requests of AsyncDirectus
+    """
+
+    async def run(self, reconcile: bool | None = None) -> SyncResult:
+        self.runs += 1
+        mark = initial = self.store.get_mark()
+        upserted = 0
+        async for response in self._changes_request(initial).iter_pages(self.page_size, keyset=self.primary_key):
+            changed, mark = self._apply(response.items_as_dict() or [], mark, initial)
+            upserted += changed
+        self.store.set_mark(mark)
+
+        deleted = 0
+        reconcile = self._should_reconcile(initial) if reconcile is None else reconcile
+        if reconcile:
+            deleted = await self.reconcile()
+        return SyncResult(upserted, deleted, mark, reconcile)
+
+    async def reconcile(self) -> int:
+        keys = set()
+        async for response in self._keys_request().iter_pages(self.page_size * 10, keyset=self.primary_key):
+            keys.update(item[self.primary_key] for item in response.items_as_dict() or [])
+        return self._reconcile(keys)
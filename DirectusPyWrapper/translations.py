@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Iterable, Sequence, TYPE_CHECKING
+
+from DirectusPyWrapper.bulk import BulkReport
+from DirectusPyWrapper.directus_request import DirectusRequest
+from DirectusPyWrapper.directus_response import DirectusException
+from DirectusPyWrapper.operators import Operators
+
+if TYPE_CHECKING:
+    from DirectusPyWrapper.directus import Directus
+    from DirectusPyWrapper.async_directus import AsyncDirectus
+
+logger = logging.getLogger('DirectusPyWrapper')
+
+Table = dict[str, dict[str, str]]
+
+
+def parse_translations(all_translations: list[dict]) -> Table | None:
+    if all_translations is None or not all_translations:
+        return None
+
+    return {translations['key']: {translation['languages_code']: translation['translation']
+                                  for translation in
+                                  translations.get('translations') or []} for translations in all_translations}
+
+
+def translations_request(directus) -> DirectusRequest:
+    return directus.items("translations").fields('key', 'translations.languages_code',
+                                                 'translations.translation').limit(-1)
+
+
+def _chunks(keys: list[str], size: int) -> Iterable[list[str]]:
+    for start in range(0, len(keys), size):
+        yield keys[start:start + size]
+
+
+class TranslationCache:
+    """
+    The translations table kept in memory, so a lookup is a dictionary access instead of a request.
+    After `ttl` seconds the next lookup checks whether the table changed, with an aggregate of the count and the latest
+    date_updated of the `probe` collections, and reloads it only if it did. Without probes it is reloaded every `ttl`.
+    Meanwhile the other threads keep reading the current table.
+
+        directus.translations.get("welcome", "el-GR")
+
+    :param directus: The client
+    :param ttl: Seconds between the checks, 0 to check before every lookup
+    :param probe: The collections whose count and date_updated tell if the translations changed. To notice edited
+                  texts, add the collection of the translated strings (e.g. "translations_translations")
+    :param batch_size: The keys sent per request by create
+    """
+
+    def __init__(self, directus: Directus | AsyncDirectus, ttl: float = 60, probe: Sequence[str] = ('translations',),
+                 batch_size: int = 100):
+        self.directus = directus
+        self.ttl = ttl
+        self.probe = list(probe)
+        self.batch_size = batch_size
+        self.version: list | None = None
+        self.checked_at: float | None = None
+        self._table: Table | None = None
+        self._lock = threading.Lock()
+
+    def _version_requests(self) -> list[DirectusRequest]:
+        requests = []
+        for collection in self.probe:
+            # the response cache would hide the changes
+            request = self.directus.items(collection).no_cache()
+            request.params['aggregate'] = {'count': '*', 'max': 'date_updated'}
+            requests.append(request)
+        return requests
+
+    def _probe_failed(self, error: DirectusException):
+        # a collection without date_updated or that can't be read, fall back to reloading every ttl. Other errors
+        # (e.g. a 503) may go away, the probe is kept
+        if error.status_code not in (403, 404):
+            raise error
+        self.probe = []
+
+    def _is_stale(self) -> bool:
+        return self._table is None or self.checked_at is None or time.monotonic() - self.checked_at >= self.ttl
+
+    def _store(self, version: list | None, table: Table | None) -> bool:
+        changed = table is not None
+        if changed:
+            self._table = table
+            self.version = version
+        self.checked_at = time.monotonic()
+        return changed
+
+    def _changed(self, version: list | None) -> bool:
+        return self._table is None or version is None or version != self.version
+
+    def _missing(self, keys: Iterable[str]) -> list[str]:
+        # the keys in the table exist, the others are checked on the server
+        table = self._table or {}
+        return [key for key in dict.fromkeys(keys) if key not in table]
+
+    def _existing_request(self, keys: list[str]) -> DirectusRequest:
+        return self.directus.items("translations").no_cache().filter(Operators.In, key=keys).fields('key').limit(-1)
+
+    def _created(self, keys: list[str]):
+        if self._table is not None and keys:
+            self._table = {**self._table, **{key: {} for key in keys}}
+
+    def lookup(self, key: str, language: str, default: str | None = None) -> str | None:
+        """
+        The translation in the current table, without checking for changes
+        """
+        translation = (self._table or {}).get(key, {}).get(language)
+        return default if translation is None else translation
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the table if it changed, or anyway with force
+
+        :return: Whether the table was reloaded
+        """
+        version = None
+        if self.probe:
+            try:
+                version = [request.read().items_as_dict() for request in self._version_requests()]
+            except DirectusException as error:
+                self._probe_failed(error)
+        if not force and not self._changed(version):
+            return self._store(version, None)
+        return self._store(version, parse_translations(translations_request(self.directus).no_cache().read().items)
+                           or {})
+
+    @property
+    def table(self) -> Table:
+        """
+        All the translations, {key: {language: translation}}
+        """
+        if self._is_stale():
+            if self._table is None:
+                with self._lock:
+                    if self._table is None:
+                        self.refresh(force=True)
+            elif self._lock.acquire(blocking=False):
+                try:
+                    if self._is_stale():
+                        self.refresh()
+                except Exception as error:
+                    # like AsyncTranslationCache, the current table is kept and the refresh is tried again later
+                    logger.warning('Refreshing the translations failed (%s), keeping the current table', error)
+                finally:
+                    self._lock.release()
+        return self._table
+
+    def get(self, key: str, language: str, default: str | None = None) -> str | None:
+        translation = self.table.get(key, {}).get(language)
+        return default if translation is None else translation
+
+    def create(self, keys: Iterable[str]) -> BulkReport:
+        """
+        Create the keys that do not exist yet, in batches of `batch_size`
+        """
+        keys = self._missing(keys)
+        existing = set()
+        for chunk in _chunks(keys, self.batch_size):
+            existing.update(item['key'] for item in self._existing_request(chunk).read().items_as_dict() or [])
+        missing = [key for key in keys if key not in existing]
+        report = self.directus.items("translations").bulk_create(({"key": key} for key in missing),
+                                                                 batch_size=self.batch_size)
+        self._created([key for chunk in report.succeeded for key in missing[chunk.offset:chunk.offset + chunk.size]])
+        return report
+
+
+class AsyncTranslationCache(TranslationCache):
+    """
+    TranslationCache for AsyncDirectus, `await get(...)` checks for changes while lookup(...) reads the current table
+    """
+
+    def __init__(self, directus: AsyncDirectus, ttl: float = 60, probe: Sequence[str] = ('translations',),
+                 batch_size: int = 100):
+        super().__init__(directus, ttl, probe, batch_size)
+        self._refreshing = None
+
+    async def refresh(self, force: bool = False) -> bool:
+        version = None
+        if self.probe:
+            try:
+                version = [(await request.read()).items_as_dict() for request in self._version_requests()]
+            except DirectusException as error:
+                self._probe_failed(error)
+        if not force and not self._changed(version):
+            return self._store(version, None)
+        response = await translations_request(self.directus).no_cache().read()
+        return self._store(version, parse_translations(response.items) or {})
+
+    async def table(self) -> Table:
+        if self._is_stale():
+            # concurrent lookups share a single refresh, they wait for it only when there is no table yet
+            if self._refreshing is None:
+                self._refreshing = asyncio.ensure_future(self.refresh(force=self._table is None))
+                self._refreshing.add_done_callback(self._refreshed)
+            if self._table is None:
+                await asyncio.shield(self._refreshing)
+        return self._table
+
+    def _refreshed(self, task: asyncio.Future):
+        self._refreshing = None
+        # a failed refresh keeps the current table and is tried again on the next lookup
+        if not task.cancelled() and task.exception() is not None and self._table is not None:
+            logger.warning('Refreshing the translations failed (%s), keeping the current table', task.exception())
+
+    async def get(self, key: str, language: str, default: str | None = None) -> str | None:
+        translation = (await self.table()).get(key, {}).get(language)
+        return default if translation is None else translation
+
+    async def create(self, keys: Iterable[str]) -> BulkReport:
+        keys = self._missing(keys)
+        existing = set()
+        for chunk in _chunks(keys, self.batch_size):
+            existing.update(item['key'] for item in (await self._existing_request(chunk).read()).items_as_dict() or [])
+        missing = [key for key in keys if key not in existing]
+        report = await self.directus.items("translations").bulk_create(({"key": key} for key in missing),
+                                                                       batch_size=self.batch_size)
+        self._created([key for chunk in report.succeeded for key in missing[chunk.offset:chunk.offset + chunk.size]])
+        return report
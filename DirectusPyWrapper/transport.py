@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpxSession:
+    """
+    Minimal requests.Session look-alike on top of an httpx.Client, used by Directus for HTTP/2.
+    All the requests to a host are multiplexed over a few connections instead of one connection per request.
+    """
+
+    def __init__(self, client: httpx.Client):
+        self.client = client
+
+    def request(self, method: str, url: str, params=None, data=None, headers=None, auth=None, timeout=None,
+                stream: bool = False, extensions: dict = None) -> httpx.Response:
+        options = {} if timeout is None else {'timeout': timeout}
+        request = self.client.build_request(method, url, params=params, content=data, headers=headers,
+                                            extensions=extensions, **options)
+        return self.client.send(request, auth=auth, stream=stream)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+
+def create_session(pool_size: int | None = None, max_keepalive: int | None = None,
+                   keepalive_expiry: float | None = None, http2: bool = False) -> requests.Session | HttpxSession:
+    """
+    :param pool_size: Maximum number of connections per host
+    :param max_keepalive: How many idle connections are kept open, defaults to pool_size. With requests there is a
+                          single pool size, so it applies only when pool_size is None (HTTP/2 transport honors both)
+    :param keepalive_expiry: Seconds after which an idle connection is closed (HTTP/2 transport only)
+    :param http2: Use an httpx.Client with HTTP/2 instead of requests, needs the h2 package (pip install httpx[http2])
+    """
+    if http2:
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=max_keepalive or pool_size,
+                              keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else 5.0)
+        return HttpxSession(httpx.Client(http2=True, limits=limits, timeout=None))
+
+    session = requests.Session()
+    if pool_size is not None or max_keepalive is not None:
+        # urllib3 keeps pool_maxsize connections per host alive, with pool_block the requests
+        # exceeding pool_size wait for a free connection instead of opening throwaway ones.
+        # It can't cap the connections and the idle ones separately, so pool_size takes precedence
+        adapter = HTTPAdapter(pool_maxsize=pool_size or max_keepalive, pool_block=pool_size is not None)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
+
+
+def create_async_client(timeout: float | httpx.Timeout | None = None, pool_size: int | None = None,
+                        max_keepalive: int | None = None, keepalive_expiry: float = 5.0,
+                        http2: bool = False) -> httpx.AsyncClient:
+    """
+    Same options as create_session, a timeout of None keeps the httpx default (5 seconds)
+    """
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=max_keepalive or pool_size,
+                          keepalive_expiry=keepalive_expiry)
+    options = {} if timeout is None else {'timeout': timeout}
+    return httpx.AsyncClient(http2=http2, limits=limits, **options)
@@ -0,0 +1,199 @@
+"""
+Offline benchmarks of the wrapper against the in-process FakeDirectus, so no live Directus is needed.
+The results are written as JSON, to compare runs across commits:
+
+    python benchmarks.py --size 10000 --latency 0.001 --output benchmark.json
+    python benchmarks.py --only read filter --codec orjson
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import time
+from typing import Callable
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper._and import _and
+from DirectusPyWrapper._or import _or
+from DirectusPyWrapper.aggregation_operators import AggregationOperators
+from DirectusPyWrapper.directus_response import DirectusResponse
+from DirectusPyWrapper.filter import Filter
+from DirectusPyWrapper.filter_compiler import optimize_filter
+from DirectusPyWrapper.json_codec import get_codec
+from DirectusPyWrapper.logical_operators import LogicalOperators
+from DirectusPyWrapper.models import User, Role
+from DirectusPyWrapper.operators import Operators
+from fake_directus import FakeDirectus
+
+
+def measure(name: str, function: Callable, iterations: int, warmup: int = 1, items: int | None = None) -> dict:
+    """
+    Run `function` `iterations` times and summarize the latencies, in seconds
+
+    :param items: How many items one call processes, to report the items per second
+    """
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    total = sum(timings)
+    result = {'name': name, 'iterations': iterations, 'total': total, 'ops_per_second': iterations / total,
+              'mean': statistics.fmean(timings), 'min': timings[0], 'p50': timings[len(timings) // 2],
+              'p95': timings[min(int(len(timings) * 0.95), len(timings) - 1)], 'max': timings[-1]}
+    if items is not None:
+        result['items'] = items
+        result['items_per_second'] = items * iterations / total
+    return result
+
+
+def complex_filter():
+    return _and(Filter(Operators.Equals, LogicalOperators.Or, status="published", author=None),
+                _or(Filter(Operators.GreaterThan, views=100), Filter(Operators.In, id=list(range(50)))),
+                Filter(Operators.Contains, title="Article", **{"author.first_name": "First"}))
+
+
+def benchmark_auth(directus: Directus, server: FakeDirectus, iterations: int) -> list[dict]:
+    client = Directus(server.url, email=server.email, password=server.password, codec=directus.codec)
+    return [measure('auth.login', client.login, iterations),
+            measure('auth.refresh', client.refresh, iterations)]
+
+
+def benchmark_read(directus: Directus, server: FakeDirectus, iterations: int) -> list[dict]:
+    articles = lambda: directus.items("articles")
+    return [
+        measure('read.one', lambda: articles().read(id=1), iterations, items=1),
+        measure('read.page_search', lambda: articles().limit(100).read(), iterations, items=100),
+        measure('read.page_get', lambda: articles().limit(100).read(method="get"), iterations, items=100),
+        measure('read.filtered', lambda: articles().filters([complex_filter()]).sort("views", False).limit(100)
+                .read(), iterations),
+        measure('read.search', lambda: articles().search("Article 1").limit(100).read(), iterations),
+        measure('read.aggregate', lambda: articles().aggregate(AggregationOperators.Count).group_by("status").read(),
+                iterations),
+    ]
+
+
+def benchmark_pagination(directus: Directus, server: FakeDirectus, iterations: int) -> list[dict]:
+    size = len(server.collections['articles'])
+    articles = lambda: directus.items("articles")
+    return [
+        measure('pagination.iter_pages', lambda: sum(1 for _ in articles().iter_items(page_size=500)),
+                iterations, items=size),
+        measure('pagination.keyset', lambda: sum(1 for _ in articles().iter_items(page_size=500, keyset="id")),
+                iterations, items=size),
+        measure('pagination.read_all', lambda: articles().read_all(concurrency=4, page_size=500),
+                iterations, items=size),
+    ]
+
+
+def benchmark_bulk(directus: Directus, server: FakeDirectus, iterations: int) -> list[dict]:
+    count = 1000
+    created = []
+
+    def create():
+        report = directus.items("bulk").bulk_create(({"title": f"Bulk {i}"} for i in range(count)),
+                                                   batch_size=100, concurrency=4)
+        created.append(report.ids)
+
+    def update():
+        directus.items("bulk").bulk_update([{"id": id, "title": "Updated"} for id in created[-1]],
+                                           batch_size=100, concurrency=4)
+
+    def delete():
+        directus.items("bulk").bulk_delete(created.pop(), batch_size=100, concurrency=4)
+
+    server.collections['bulk'] = []
+    results = [measure('bulk.create', create, iterations, items=count),
+               measure('bulk.update', update, iterations, items=count)]
+    # every delete removes the items of one of the creates, including the warmup
+    results.append(measure('bulk.delete', delete, min(iterations, len(created) - 1), items=count))
+    return results
+
+
+def benchmark_filter(directus: Directus, server: FakeDirectus, iterations: int) -> list[dict]:
+    filter = complex_filter()
+    return [
+        measure('filter.to_dict', filter.to_dict, iterations * 100),
+        measure('filter.optimize', lambda: optimize_filter(filter.to_dict()), iterations * 100),
+        measure('filter.encode', lambda: directus.codec.dumps({"query": {"filter": filter}}), iterations * 100),
+        measure('filter.query_params', lambda: directus.items("articles").filters([filter])
+                ._query_params(directus.items("articles").filters([filter])._query()), iterations * 100),
+    ]
+
+
+def benchmark_parse(directus: Directus, server: FakeDirectus, iterations: int) -> list[dict]:
+    users = directus.items("directus_users").fields("*", "role.*").limit(-1).read().response
+    roles = directus.items("directus_roles").limit(-1).read().response
+    count = len(server.collections['directus_users'])
+
+    def parse(response, T):
+        return lambda: DirectusResponse(response, collection=T, codec=directus.codec).items
+
+    return [
+        measure('parse.decode', lambda: DirectusResponse(users, codec=directus.codec).items, iterations, items=count),
+        measure('parse.users', parse(users, User), iterations, items=count),
+        measure('parse.users_lazy', lambda: list(DirectusResponse(users, collection=User, codec=directus.codec)
+                                                 .lazy_items), iterations, items=count),
+        measure('parse.users_fast', lambda: DirectusResponse(users, collection=User, codec=directus.codec).items_fast,
+                iterations, items=count),
+        measure('parse.users_rows', lambda: DirectusResponse(users, codec=directus.codec).items_as_rows(),
+                iterations, items=count),
+        measure('parse.roles', parse(roles, Role), iterations * 10, items=len(server.collections['directus_roles'])),
+    ]
+
+
+BENCHMARKS = {'auth': benchmark_auth, 'read': benchmark_read, 'pagination': benchmark_pagination,
+              'bulk': benchmark_bulk, 'filter': benchmark_filter, 'parse': benchmark_parse}
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(size: int = 1000, latency: float = 0.0, iterations: int = 20, codec: str = 'json',
+        only: list[str] | None = None) -> dict:
+    with FakeDirectus(size=size, latency=latency) as server:
+        directus = Directus(server.url, token=server.static_token, codec=get_codec(codec))
+        results = []
+        for name, benchmark in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            results.extend(benchmark(directus, server, iterations))
+    return {'revision': git_revision(), 'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'parameters': {'size': size, 'latency': latency, 'iterations': iterations, 'codec': codec},
+            'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000, help='Items of the synthetic collections')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the fake server waits per request')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--codec', default='json', help='json, orjson or msgspec')
+    parser.add_argument('--only', nargs='*', choices=list(BENCHMARKS), help='Run only these groups')
+    parser.add_argument('--output', default='benchmark.json', help='Where to write the results')
+    args = parser.parse_args()
+
+    report = run(args.size, args.latency, args.iterations, args.codec, args.only)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    for result in report['results']:
+        items = f"{result['items_per_second']:>12.0f} items/s" if 'items_per_second' in result else ''
+        print(f"{result['name']:<24} {result['ops_per_second']:>10.1f} ops/s  p50 {result['p50'] * 1000:8.3f}ms  "
+              f"p95 {result['p95'] * 1000:8.3f}ms {items}")
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,486 @@
+"""
+In-process fake of the Directus REST API, used by the benchmarks and the tests that can't rely on a live Directus.
+It implements the auth, items, system collections (users, roles, files), search, aggregate, assets (with Range
+requests) and file upload endpoints over synthetic in-memory collections. With realtime=True it also serves the
+realtime WebSocket API (needs websockets) at websocket_url, publishing the changes made through the REST API.
+
+    with FakeDirectus(size=10_000, latency=0.002) as server:
+        directus = Directus(server.url, email=FakeDirectus.email, password=FakeDirectus.password)
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import email
+import email.policy
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+OPERATORS = {
+    '_eq': lambda value, arg: value == arg,
+    '_neq': lambda value, arg: value != arg,
+    '_lt': lambda value, arg: value is not None and value < arg,
+    '_lte': lambda value, arg: value is not None and value <= arg,
+    '_gt': lambda value, arg: value is not None and value > arg,
+    '_gte': lambda value, arg: value is not None and value >= arg,
+    '_in': lambda value, arg: value in arg,
+    '_nin': lambda value, arg: value not in arg,
+    '_null': lambda value, arg: value is None,
+    '_nnull': lambda value, arg: value is not None,
+    '_contains': lambda value, arg: value is not None and str(arg) in str(value),
+    '_ncontains': lambda value, arg: value is None or str(arg) not in str(value),
+    '_starts_with': lambda value, arg: str(value).startswith(str(arg)),
+    '_ends_with': lambda value, arg: str(value).endswith(str(arg)),
+    '_between': lambda value, arg: value is not None and arg[0] <= value <= arg[1],
+    '_empty': lambda value, arg: not value,
+    '_nempty': lambda value, arg: bool(value),
+}
+
+
+def matches(row: dict, filter: dict) -> bool:
+    for key, condition in filter.items():
+        if key == '_and':
+            if not all(matches(row, item) for item in condition):
+                return False
+        elif key == '_or':
+            if not any(matches(row, item) for item in condition):
+                return False
+        elif not any(operator in OPERATORS for operator in condition):
+            # a filter on the fields of a relation, unexpanded relations hold only the key and never match
+            if not isinstance(row.get(key), dict) or not matches(row[key], condition):
+                return False
+        else:
+            for operator, arg in condition.items():
+                if not OPERATORS[operator](row.get(key), arg):
+                    return False
+    return True
+
+
+def select(row: dict, fields: list[str]) -> dict:
+    if '*' in fields:
+        return row
+    selected = {}
+    for field in fields:
+        key, _, rest = field.partition('.')
+        if rest and isinstance(row.get(key), dict):
+            selected[key] = {**selected.get(key, {}), **select(row[key], [rest])}
+        elif key in row:
+            selected[key] = row[key]
+    return selected
+
+
+def aggregate(rows: list[dict], operations: dict, group_by: list[str]) -> list[dict]:
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row.get(field) for field in group_by), []).append(row)
+    result = []
+    for key, group in groups.items():
+        item = dict(zip(group_by, key))
+        for operation, field in operations.items():
+            values = [row.get(field) for row in group if row.get(field) is not None]
+            if operation in ('count', 'countAll'):
+                item[operation] = len(group) if field == '*' else len(values)
+            elif operation == 'countDistinct':
+                item[operation] = len(set(values))
+            elif operation == 'sum':
+                item[operation] = sum(values)
+            elif operation == 'avg':
+                item[operation] = sum(values) / len(values) if values else None
+            elif operation == 'min':
+                item[operation] = min(values, default=None)
+            elif operation == 'max':
+                item[operation] = max(values, default=None)
+        result.append(item)
+    return result
+
+
+def now() -> str:
+    # the date_created/date_updated format of Directus
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def synthetic_collections(size: int) -> dict[str, list[dict]]:
+    roles = [{'id': f'role-{i}', 'name': name} for i, name in enumerate(['Administrator', 'Editor', 'Viewer'])]
+    users = [{'id': f'user-{i}', 'first_name': f'First {i}', 'last_name': f'Last {i}', 'email': f'user{i}@example.com',
+              'status': 'active' if i % 10 else 'suspended', 'title': None, 'description': f'User number {i}',
+              'avatar': None, 'token': None, 'role': roles[i % len(roles)]} for i in range(size)]
+    articles = [{'id': i, 'title': f'Article {i}', 'status': ['published', 'draft', 'archived'][i % 3],
+                 'views': (i * 7919) % 1000, 'author': f'user-{i % max(size, 1)}',
+                 'date_created': f'2024-01-{i % 28 + 1:02d}T00:00:00.000Z', 'date_updated': None}
+                for i in range(1, size + 1)]
+    return {'directus_roles': roles, 'directus_users': users, 'directus_files': [], 'articles': articles}
+
+
+class FakeDirectusServer(ThreadingHTTPServer):
+    # many concurrent clients connect at once in the benchmarks
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class FakeDirectusHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and the body are written separately, with Nagle every response would wait for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status: int, body=None, validate: bool = False):
+        payload = b'' if body is None else json.dumps(body).encode()
+        self.send_payload(status, payload, 'application/json', validate=validate)
+
+    def send_payload(self, status: int, payload: bytes, content_type: str, headers: dict = None,
+                     validate: bool = False):
+        headers = dict(headers or {})
+        if validate:
+            # reads and assets get an ETag, a request sending it back gets a 304 without body
+            headers['ETag'] = f'"{hashlib.sha1(payload).hexdigest()}"'
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                status, payload = 304, b''
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding') != 'chunked':
+            return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = b''
+        while size := int(self.rfile.readline().split(b';')[0], 16):
+            body += self.rfile.read(size)
+            self.rfile.readline()
+        self.rfile.readline()
+        return body
+
+    def error(self, status: int, code: str, message: str):
+        self.send_json(status, {'errors': [{'message': message, 'extensions': {'code': code}}]})
+
+    def handle_request(self):
+        server: FakeDirectus = self.server.fake
+        raw = self.read_body()
+        body = json.loads(raw) if raw and 'json' in self.headers.get('Content-Type', 'application/json') else None
+        url = urlparse(self.path)
+        server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        if url.path.startswith('/auth/'):
+            return self.auth(server, url.path, body)
+        if self.headers.get('Authorization') not in {f'Bearer {token}' for token in server.tokens}:
+            return self.error(401, 'INVALID_CREDENTIALS', 'Invalid user credentials.')
+        if url.path.startswith('/assets/'):
+            return self.asset(server, url.path.split('/')[2])
+        if url.path == '/files' and self.command == 'POST':
+            return self.upload(server, raw)
+        match = re.fullmatch(r'/(?:items/(?P<collection>[^/]+)|(?P<system>users|roles|files))(?:/(?P<id>[^/]+))?',
+                             url.path)
+        if match is None:
+            return self.error(404, 'ROUTE_NOT_FOUND', f'Route {url.path} doesn\'t exist.')
+        collection = match['collection'] or f'directus_{match["system"]}'
+        if collection not in server.collections:
+            return self.error(403, 'FORBIDDEN', 'You don\'t have permission to access this.')
+        rows = server.collections[collection]
+        self.collection = collection
+        id = match['id']
+        if id == 'me' and collection == 'directus_users':
+            id = rows[0]['id'] if rows else None
+
+        if self.command in ('GET', 'SEARCH'):
+            query = (body or {}).get('query', {}) if self.command == 'SEARCH' else \
+                {key: values if key == 'sort' else values[0]
+                 for key, values in parse_qs(url.query).items()}
+            return self.read(rows, query, id)
+        with server.lock:
+            if self.command == 'POST':
+                return self.create(rows, body)
+            if self.command == 'PATCH':
+                return self.update(rows, body, id)
+            if self.command == 'DELETE':
+                return self.delete(server, collection, body, id)
+        self.error(405, 'METHOD_NOT_ALLOWED', self.command)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = do_SEARCH = handle_request
+
+    def auth(self, server, path: str, body: dict | None):
+        if path == '/auth/logout':
+            return self.send_json(204)
+        if path == '/auth/login':
+            if not body or body.get('email') != server.email or body.get('password') != server.password:
+                return self.error(401, 'INVALID_CREDENTIALS', 'Invalid user credentials.')
+        elif path != '/auth/refresh' or not body or body.get('refresh_token') not in server.refresh_tokens:
+            return self.error(401, 'INVALID_TOKEN', 'Invalid token.')
+        else:
+            with server.lock:
+                server.refreshes += 1
+        access_token, refresh_token = server.issue_tokens()
+        self.send_json(200, {'data': {'access_token': access_token, 'refresh_token': refresh_token,
+                                      'expires': server.expires}})
+
+    def asset(self, server, id: str):
+        if id not in server.assets:
+            return self.error(403, 'FORBIDDEN', 'You don\'t have permission to access this.')
+        content = server.assets[id]
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        status, headers = 200, {'Accept-Ranges': 'bytes'}
+        range = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        # with an If-Range of another version the whole asset is sent
+        if range and self.headers.get('If-Range', etag) == etag:
+            headers['ETag'] = etag
+            start = int(range[1])
+            end = min(int(range[2]) if range[2] else len(content) - 1, len(content) - 1)
+            if start >= len(content):
+                self.send_payload(416, b'', 'application/octet-stream', {'Content-Range': f'bytes */{len(content)}'})
+                return
+            status, headers['Content-Range'] = 206, f'bytes {start}-{end}/{len(content)}'
+            content = content[start:end + 1]
+        self.send_payload(status, content, 'application/octet-stream', headers, validate=status == 200)
+
+    def upload(self, server, raw: bytes):
+        message = email.message_from_bytes(f'Content-Type: {self.headers["Content-Type"]}\r\n\r\n'.encode() + raw,
+                                           policy=email.policy.HTTP)
+        item = {'id': str(uuid.uuid4())}
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            if part.get_filename() is None:
+                item[name] = part.get_content()
+                continue
+            content = part.get_payload(decode=True)
+            item.update(filename_download=part.get_filename(), type=part.get_content_type(), filesize=len(content))
+            server.assets[item['id']] = content
+        server.collections['directus_files'].append(item)
+        self.send_json(200, {'data': item})
+
+    def read(self, rows: list[dict], query: dict, id: str | None):
+        query = {key: json.loads(value) if key in ('filter', 'aggregate', 'deep') and isinstance(value, str) else value
+                 for key, value in query.items()}
+        fields = query.get('fields', '*')
+        fields = fields.split(',') if isinstance(fields, str) else fields
+        if id is not None:
+            found = next((row for row in rows if str(row['id']) == id), None)
+            if found is None:
+                return self.error(403, 'FORBIDDEN', 'You don\'t have permission to access this.')
+            return self.send_json(200, {'data': select(found, fields)}, validate=True)
+
+        result = [row for row in rows if matches(row, query.get('filter') or {})]
+        if query.get('search'):
+            search = str(query['search']).lower()
+            result = [row for row in result if any(search in str(value).lower() for value in row.values())]
+        filter_count = len(result)
+        if 'aggregate' in query:
+            group_by = query.get('groupBy') or []
+            group_by = group_by.split(',') if isinstance(group_by, str) else group_by
+            return self.send_json(200, {'data': aggregate(result, query['aggregate'], group_by)}, validate=True)
+
+        sort = query.get('sort') or []
+        for field in reversed(sort.split(',') if isinstance(sort, str) else sort):
+            result.sort(key=lambda row: (row.get(field.lstrip('-')) is None, row.get(field.lstrip('-'))),
+                        reverse=field.startswith('-'))
+        limit = int(query.get('limit', 100))
+        offset = (int(query['page']) - 1) * limit if 'page' in query else int(query.get('offset', 0))
+        if limit >= 0:
+            result = result[offset:offset + limit]
+        else:
+            result = result[offset:]
+        response = {'data': [select(row, fields) for row in result]}
+        if query.get('meta'):
+            response['meta'] = {'filter_count': filter_count, 'total_count': len(rows)}
+        self.send_json(200, response, validate=True)
+
+    def create(self, rows: list[dict], body):
+        items = body if isinstance(body, list) else [body]
+        next_id = max((row['id'] for row in rows if isinstance(row['id'], int)), default=0) + 1
+        for offset, item in enumerate(items):
+            item.setdefault('id', next_id + offset)
+            if rows and 'date_created' in rows[0]:
+                item.setdefault('date_created', now())
+            rows.append(item)
+        self.server.fake.publish(self.collection, 'create', items)
+        self.send_json(200, {'data': items if isinstance(body, list) else items[0]})
+
+    def update(self, rows: list[dict], body, id: str | None):
+        if id is not None:
+            keys, data = [id], body
+        elif isinstance(body, list):
+            by_id = {str(item['id']): item for item in body}
+            updated = []
+            for row in rows:
+                if str(row['id']) in by_id:
+                    row.update(by_id[str(row['id'])], date_updated=now())
+                    updated.append(row)
+            self.server.fake.publish(self.collection, 'update', updated)
+            return self.send_json(200, {'data': updated})
+        else:
+            keys, data = [str(key) for key in body.get('keys', [])], body.get('data', {})
+        updated = [row for row in rows if str(row['id']) in keys]
+        for row in updated:
+            row.update(data, date_updated=now())
+        self.server.fake.publish(self.collection, 'update', updated)
+        self.send_json(200, {'data': updated[0] if id is not None and updated else updated})
+
+    def delete(self, server, collection: str, body, id: str | None):
+        keys = {id} if id is not None else {str(key) for key in (body or [])}
+        # the keys of the delete events are strings, as in the urls
+        deleted = [str(row['id']) for row in server.collections[collection] if str(row['id']) in keys]
+        server.collections[collection] = [row for row in server.collections[collection] if str(row['id']) not in keys]
+        server.publish(collection, 'delete', deleted)
+        self.send_json(204)
+
+
+class FakeRealtime:
+    """
+    The realtime WebSocket API of a FakeDirectus, served from an event loop in its own thread
+    """
+
+    def __init__(self, fake: FakeDirectus):
+        self.fake = fake
+        self.connections: dict = {}
+        self.loop = asyncio.new_event_loop()
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f'ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/websocket'
+
+    async def handle(self, websocket):
+        from websockets import ConnectionClosed
+        subscriptions = self.connections[websocket] = {}
+        authenticated = False
+        try:
+            async for raw in websocket:
+                message = json.loads(raw)
+                type, uid = message.get('type'), message.get('uid')
+                if type == 'auth':
+                    authenticated = message.get('access_token') in self.fake.tokens
+                    status = {'status': 'ok'} if authenticated else \
+                        {'status': 'error', 'error': {'code': 'AUTHENTICATION_FAILED', 'message': 'Invalid token'}}
+                    await websocket.send(json.dumps({'type': 'auth', **status}))
+                elif type == 'subscribe':
+                    if not authenticated or message.get('collection') not in self.fake.collections:
+                        await websocket.send(json.dumps({'type': 'subscribe', 'status': 'error', 'uid': uid, 'error': {
+                            'code': 'FORBIDDEN', 'message': 'You don\'t have permission to access this.'}}))
+                        continue
+                    fields = (message.get('query') or {}).get('fields') or ['*']
+                    subscriptions[uid] = (message['collection'], fields, message.get('event'))
+                    rows = self.fake.collections[message['collection']]
+                    await websocket.send(json.dumps({'type': 'subscription', 'event': 'init', 'uid': uid,
+                                                     'data': [select(row, fields) for row in rows]}))
+                elif type == 'unsubscribe':
+                    subscriptions.pop(uid, None)
+        except ConnectionClosed:
+            pass
+        finally:
+            del self.connections[websocket]
+
+    def _publish(self, collection: str, event: str, data: list):
+        for websocket, subscriptions in self.connections.items():
+            for uid, (subscribed, fields, only) in subscriptions.items():
+                if subscribed == collection and only in (None, event):
+                    items = data if event == 'delete' else [select(row, fields) for row in data]
+                    message = {'type': 'subscription', 'event': event, 'uid': uid, 'data': items}
+                    asyncio.ensure_future(websocket.send(json.dumps(message)))
+
+    def publish(self, collection: str, event: str, data: list):
+        # the rows are copied since the request thread keeps changing them
+        self.loop.call_soon_threadsafe(self._publish, collection, event, [
+            dict(row) if isinstance(row, dict) else row for row in data])
+
+    def disconnect(self):
+        """
+        Close all the connections, as a restart of the server would
+        """
+        for websocket in list(self.connections):
+            asyncio.run_coroutine_threadsafe(websocket.close(), self.loop).result()
+
+    def start(self):
+        from websockets.asyncio.server import serve
+        started = threading.Event()
+
+        async def listen():
+            self.server = await serve(self.handle, '127.0.0.1', 0)
+            started.set()
+
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(listen(), self.loop)
+        started.wait()
+
+    def stop(self):
+        async def close():
+            self.server.close()
+            await self.server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class FakeDirectus:
+    """
+    :param size: Number of items of the synthetic collections (articles, directus_users)
+    :param latency: Seconds every request waits before it is answered, to simulate the network and the database
+    :param expires: Lifetime of the issued access tokens in milliseconds
+    :param realtime: Serve the realtime WebSocket API as well, at websocket_url
+    """
+    email = 'admin@example.com'
+    password = 'password'
+    static_token = 'static-token'
+
+    def __init__(self, size: int = 1000, latency: float = 0.0, expires: int = 900000, realtime: bool = False):
+        self.collections = synthetic_collections(size)
+        self.latency = latency
+        self.expires = expires
+        self.tokens = {self.static_token}
+        self.refresh_tokens = set()
+        self.assets: dict[str, bytes] = {}
+        self.requests = 0
+        self.refreshes = 0
+        self.lock = threading.Lock()
+        self._issued = 0
+        self.server = FakeDirectusServer(('127.0.0.1', 0), FakeDirectusHandler)
+        self.server.fake = self
+        self.realtime = FakeRealtime(self) if realtime else None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    @property
+    def websocket_url(self) -> str:
+        return self.realtime.url
+
+    def publish(self, collection: str, event: str, data: list):
+        if self.realtime is not None:
+            self.realtime.publish(collection, event, data)
+
+    def issue_tokens(self) -> tuple[str, str]:
+        with self.lock:
+            self._issued += 1
+            access_token, refresh_token = f'access-{self._issued}', f'refresh-{self._issued}'
+            self.tokens.add(access_token)
+            self.refresh_tokens.add(refresh_token)
+        return access_token, refresh_token
+
+    def start(self) -> 'FakeDirectus':
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        if self.realtime is not None:
+            self.realtime.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.realtime is not None:
+            self.realtime.stop()
+
+    def __enter__(self) -> 'FakeDirectus':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
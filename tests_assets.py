@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import unittest
+
+from DirectusPyWrapper import Directus, AsyncDirectus
+from DirectusPyWrapper.assets import MultipartBody
+from fake_directus import FakeDirectus
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=1).start()
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token)
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'asset.bin')
+        self.content = bytes(range(256)) * 40
+        self.server.assets['asset'] = self.content
+
+    def tearDown(self):
+        self.folder.cleanup()
+        self.server.stop()
+
+    def interrupt(self, size: int):
+        # a download that stopped after `size` bytes
+        self.assertEqual(self.directus.download_file('asset', self.path), len(self.content))
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
+        with open(f'{self.path}.validator', 'w') as f:
+            # the ETag of the asset, saved when the download started
+            f.write(f'"{hashlib.sha1(self.content).hexdigest()}"')
+
+    def read(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_resume(self):
+        self.interrupt(1000)
+        self.assertEqual(self.directus.download_file('asset', self.path, resume=True), len(self.content))
+        self.assertEqual(self.read(), self.content)
+        self.assertFalse(os.path.exists(f'{self.path}.validator'))
+
+    def test_resume_of_a_changed_asset(self):
+        self.interrupt(1000)
+        self.server.assets['asset'] = b'changed' * 100
+        self.assertEqual(self.directus.download_file('asset', self.path, resume=True), 700)
+        self.assertEqual(self.read(), b'changed' * 100)
+
+    def test_resume_of_a_complete_download(self):
+        self.assertEqual(self.directus.download_file('asset', self.path), len(self.content))
+        requests_made = self.server.requests
+        self.assertEqual(self.directus.download_file('asset', self.path, resume=True), len(self.content))
+        self.assertEqual(self.server.requests, requests_made + 1)
+
+    def test_resume_of_a_larger_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(self.content + b'stale')
+        self.assertEqual(self.directus.download_file('asset', self.path, resume=True), len(self.content))
+        self.assertEqual(self.read(), self.content)
+
+    def test_async_download(self):
+        async def download():
+            async with AsyncDirectus(self.server.url, token=FakeDirectus.static_token) as directus:
+                sizes = [await directus.download_file('asset', self.path)]
+                with open(self.path, 'r+b') as f:
+                    f.truncate(1000)
+                sizes.append(await directus.download_file('asset', self.path, resume=True))
+                with open(self.path, 'ab') as f:
+                    f.write(b'stale')
+                sizes.append(await directus.download_file('asset', self.path, resume=True))
+                part = os.path.join(self.folder.name, 'parts.bin')
+                sizes.append(await directus.download_file('asset', part, parallel=3, part_size=1000))
+                with open(part, 'rb') as f:
+                    self.assertEqual(f.read(), self.content)
+                return sizes
+
+        self.assertEqual(asyncio.run(download()), [len(self.content)] * 4)
+        self.assertEqual(self.read(), self.content)
+
+    def test_multipart_names_are_escaped(self):
+        body = MultipartBody(open(os.devnull, 'rb'), 'a"b\r\nContent-Type: text/html.txt', fields={'ti"tle': 'x'})
+        body.file.close()
+        self.assertIn(b'name="ti%22tle"', body.head)
+        self.assertIn(b'filename="a%22b%0D%0AContent-Type: text/html.txt"\r\n', body.head)
+        self.assertEqual(body.head.count(b'Content-Type'), 2)
+
+    def test_parallel(self):
+        size = self.directus.download_file('asset', self.path, parallel=3, part_size=1000)
+        self.assertEqual(size, len(self.content))
+        self.assertEqual(self.read(), self.content)
+
+    def test_async_upload(self):
+        with open(self.path, 'wb') as f:
+            f.write(self.content)
+
+        async def upload():
+            async with AsyncDirectus(self.server.url, token=FakeDirectus.static_token) as directus:
+                return (await directus.upload_file(self.path, title='Asset')).item
+
+        item = asyncio.run(upload())
+        self.assertEqual((item['title'], item['filesize']), ('Asset', len(self.content)))
+        self.assertEqual(self.server.assets[item['id']], self.content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import datetime
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from DirectusPyWrapper import Directus, AsyncDirectus
+from fake_directus import FakeDirectus
+
+CONCURRENCY = 8
+
+
+class TestSingleFlightRefresh(unittest.TestCase):
+    def setUp(self):
+        # the latency keeps the refresh in flight while the other requests arrive
+        self.server = FakeDirectus(size=5, latency=0.05).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def read_concurrently(self, directus: Directus) -> list:
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+            futures = [executor.submit(lambda: directus.items("articles").read().items) for _ in range(CONCURRENCY)]
+            return [future.result() for future in futures]
+
+    def test_rejected_token(self):
+        directus = Directus(self.server.url, email=FakeDirectus.email, password=FakeDirectus.password)
+        self.server.tokens.discard(directus.token)
+        self.assertTrue(all(len(items) == 5 for items in self.read_concurrently(directus)))
+        self.assertEqual(self.server.refreshes, 1)
+
+    def test_expiring_token(self):
+        directus = Directus(self.server.url, email=FakeDirectus.email, password=FakeDirectus.password)
+        directus.expiration_time = datetime.datetime.now()
+        self.assertTrue(all(len(items) == 5 for items in self.read_concurrently(directus)))
+        self.assertEqual(self.server.refreshes, 1)
+
+    def test_async_rejected_token(self):
+        async def read():
+            async with AsyncDirectus(self.server.url, email=FakeDirectus.email,
+                                     password=FakeDirectus.password) as directus:
+                self.server.tokens.discard(directus.token)
+                return await asyncio.gather(*[directus.items("articles").read() for _ in range(CONCURRENCY)])
+
+        self.assertTrue(all(len(response.items) == 5 for response in asyncio.run(read())))
+        self.assertEqual(self.server.refreshes, 1)
+
+    def test_async_expiring_token(self):
+        async def read():
+            async with AsyncDirectus(self.server.url, email=FakeDirectus.email,
+                                     password=FakeDirectus.password) as directus:
+                directus.expiration_time = datetime.datetime.now()
+                return await asyncio.gather(*[directus.items("articles").read() for _ in range(CONCURRENCY)])
+
+        self.assertTrue(all(len(response.items) == 5 for response in asyncio.run(read())))
+        self.assertEqual(self.server.refreshes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
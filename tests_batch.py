@@ -0,0 +1,84 @@
+import unittest
+
+import requests
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper.aggregation_operators import AggregationOperators
+from DirectusPyWrapper.directus_batch import DirectusBatch, graphql_selection, graphql_value
+from DirectusPyWrapper.directus_response import DirectusResponse, DirectusException
+from DirectusPyWrapper.models import User
+
+
+def response(body: bytes) -> DirectusResponse:
+    raw = requests.Response()
+    raw.status_code = 200
+    raw._content = body
+    return DirectusResponse(raw)
+
+
+class TestGraphQL(unittest.TestCase):
+    def setUp(self):
+        # nothing is sent, the batches are only rendered
+        self.directus = Directus("http://directus.local", token="token")
+        self.batch = DirectusBatch(self.directus)
+
+    def test_value(self):
+        self.assertEqual(graphql_value({"_or": [{"status": {"_eq": "draft"}}, {"views": {"_gt": 1.5}}]}),
+                         '{_or: [{status: {_eq: "draft"}}, {views: {_gt: 1.5}}]}')
+        self.assertEqual(graphql_value(["a\"b", None, True]), '["a\\"b", null, true]')
+
+    def test_selection(self):
+        self.assertEqual(graphql_selection("id,title, author.name,author.role.id"),
+                         "id title author { name role { id } }")
+        with self.assertRaises(ValueError):
+            graphql_selection("id,author.*")
+
+    def test_reads_and_aliases(self):
+        self.batch.read(self.directus.items("articles").fields("id", "title").filter(status="published")
+                        .sort("id", False).limit(5))
+        self.batch.read(self.directus.items("articles").fields("id"), id=3)
+        self.batch.read(self.directus.collection(User).fields("id", "email"), id="me")
+        self.assertEqual([read.to_graphql() for read in self.batch.reads], [
+            'q0: articles(filter: {status: {_eq: "published"}}, sort: ["-id"], limit: 5) { id title }',
+            'q1: articles_by_id(id: 3) { id }',
+            'q2: users_me { id email }'])
+
+    def test_system_collections_go_to_their_endpoint(self):
+        articles = self.batch.read(self.directus.items("articles").fields("id"))
+        users = self.batch.read(self.directus.items("directus_users").fields("id"))
+        roles = self.batch.read(self.directus.items("directus_roles").fields("id"))
+        self.assertEqual(self.batch._queries(), {"http://directus.local/graphql": [articles],
+                                                 "http://directus.local/graphql/system": [users, roles]})
+        self.assertEqual(DirectusBatch._payload([users, roles]),
+                         {"query": "query { q1: users { id } q2: roles { id } }"})
+
+    def test_aggregates(self):
+        count = self.batch.read(self.directus.items("articles").aggregate().group_by("status"))
+        distinct = self.batch.read(self.directus.items("articles").aggregate(AggregationOperators.CountDistinct,
+                                                                             "author"))
+        self.assertEqual(count.to_graphql(), 'q0: articles_aggregated(groupBy: ["status"]) { countAll group }')
+        self.assertEqual(distinct.to_graphql(), 'q1: articles_aggregated { countDistinct { author } }')
+        with self.assertRaises(ValueError):
+            self.batch.read(self.directus.items("articles").aggregate(AggregationOperators.Sum)).to_graphql()
+        self.assertEqual(count.parse([{"group": {"status": "draft"}, "countAll": 3}]),
+                         [{"status": "draft", "count": 3}])
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            self.batch.read(self.directus.items("articles")).to_graphql()
+        with self.assertRaises(ValueError):
+            self.batch.read(self.directus.items("articles").fields("id").include_count()).to_graphql()
+
+    def test_split(self):
+        articles = self.batch.read(self.directus.items("articles").fields("id"))
+        users = self.batch.read(self.directus.collection(User).fields("id"))
+        self.batch._split(response(b'{"data": {"q0": [{"id": 1}], "q1": [{"id": "u"}]}}'), [articles, users])
+        self.assertEqual(articles.response.items, [{"id": 1}])
+        self.assertEqual(users.response.items, [User(id="u")])
+        with self.assertRaises(DirectusException):
+            self.batch._split(response(b'{"errors": [{"message": "Bad", "extensions": {"code": "GRAPHQL"}}]}'),
+                              [articles])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import time
+import unittest
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper.cache import MemoryCache, ResponseCache
+from fake_directus import FakeDirectus
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_ttl(self):
+        cache = MemoryCache()
+        cache.set("a", 1, "articles", ttl=0.05)
+        cache.set("b", 2, "articles")
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual((cache.get("b"), len(cache)), (2, 1))
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_size=2)
+        cache.set("a", 1, "articles")
+        cache.set("b", 2, "articles")
+        cache.get("a")
+        cache.set("c", 3, "users")
+        self.assertEqual([cache.get(key) for key in "abc"], [1, None, 3])
+
+    def test_invalidate(self):
+        cache = MemoryCache()
+        cache.set("a", 1, "articles")
+        cache.set("b", 2, "users")
+        cache.invalidate("articles")
+        self.assertEqual([cache.get("a"), cache.get("b")], [None, 2])
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=5).start()
+        self.cache = ResponseCache(collection_ttls={"directus_users": 0.05})
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token, cache=self.cache)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def sent(self, request) -> int:
+        # the requests that reached the server to read it
+        requests_made = self.server.requests
+        request.read()
+        return self.server.requests - requests_made
+
+    def test_hits(self):
+        published = self.directus.items("articles").filter(status="published")
+        self.assertEqual([self.sent(published), self.sent(published)], [1, 0])
+        self.assertEqual(self.sent(self.directus.items("articles").filter(status="draft")), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+        self.assertEqual(self.sent(self.directus.items("articles").no_cache()), 1)
+
+    def test_collection_ttl(self):
+        users = self.directus.items("directus_users")
+        self.assertEqual([self.sent(users), self.sent(users)], [1, 0])
+        time.sleep(0.1)
+        self.assertEqual(self.sent(users), 1)
+
+    def test_writes_invalidate_the_collection(self):
+        articles, users = self.directus.items("articles"), self.directus.items("directus_users")
+        articles.read(), users.read()
+        for write in [lambda: self.directus.items("articles").create_one({"title": "New"}),
+                      lambda: self.directus.items("articles").update_one(1, {"title": "Changed"}),
+                      lambda: self.directus.items("articles").delete_one(2)]:
+            write()
+            self.assertEqual(self.sent(articles), 1)
+        self.assertEqual(self.sent(users), 0)
+        self.assertEqual(self.directus.items("articles").read(id=1).item["title"], "Changed")
+
+    def test_users_dont_share_entries(self):
+        other = Directus(self.server.url, email=FakeDirectus.email, password=FakeDirectus.password, cache=self.cache)
+        self.assertEqual([self.sent(self.directus.items("articles")), self.sent(other.items("articles")),
+                          self.sent(other.items("articles"))], [1, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
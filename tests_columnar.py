@@ -0,0 +1,41 @@
+import unittest
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+from DirectusPyWrapper.columnar import record_batch
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class Article(BaseModel):
+    id: int
+    views: Optional[int] = None
+    price: Optional[Decimal] = None
+    rating: Optional[float] = None
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestRecordBatch(unittest.TestCase):
+    names = ["id", "views", "price", "rating"]
+
+    def test_strings_are_coerced(self):
+        # bigInteger and decimal fields come as strings
+        batch = record_batch([{"id": 1, "views": "12", "price": "2.50", "rating": "4.5"}], self.names, Article)
+        self.assertEqual(batch.schema.field("views").type, pyarrow.int64())
+        self.assertEqual(batch.to_pylist(), [{"id": 1, "views": 12, "price": "2.50", "rating": 4.5}])
+
+    def test_mixed_values(self):
+        data = [{"id": 1, "views": "12", "price": 1.5}, {"id": 2, "views": 3, "price": "2.50", "rating": 4}]
+        batch = record_batch(data, self.names, Article)
+        self.assertEqual(batch.column("views").to_pylist(), [12, 3])
+        self.assertEqual(batch.column("price").to_pylist(), ["1.5", "2.50"])
+        self.assertEqual(batch.column("rating").to_pylist(), [None, 4.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+from DirectusPyWrapper._and import _and
+from DirectusPyWrapper._or import _or
+from DirectusPyWrapper.filter import Filter
+from DirectusPyWrapper.filter_compiler import optimize_filter
+from DirectusPyWrapper.operators import Operators
+from DirectusPyWrapper.query import Param
+
+
+class TestFilterCompiler(unittest.TestCase):
+    def test_flattens_nested_groups(self):
+        self.assertEqual(optimize_filter({"_and": [{"_and": [{"a": {"_eq": 1}}, {"_and": [{"b": {"_eq": 2}}]}]},
+                                                   {"c": {"_gt": 3}}]}),
+                         {"a": {"_eq": 1}, "b": {"_eq": 2}, "c": {"_gt": 3}})
+        self.assertEqual(optimize_filter({"_or": [{"_or": [{"a": {"_gt": 1}}, {"b": {"_gt": 2}}]}, {"c": {"_gt": 3}}]}),
+                         {"_or": [{"a": {"_gt": 1}}, {"b": {"_gt": 2}}, {"c": {"_gt": 3}}]})
+
+    def test_keeps_mixed_groups(self):
+        filter = {"_and": [{"_or": [{"a": {"_gt": 1}}, {"b": {"_gt": 2}}]}, {"_or": [{"c": {"_gt": 3}},
+                                                                                      {"d": {"_gt": 4}}]}]}
+        self.assertEqual(optimize_filter(filter), filter)
+
+    def test_repeated_field_is_not_merged_under_and(self):
+        self.assertEqual(optimize_filter({"_and": [{"a": {"_gt": 1}}, {"a": {"_lt": 5}}]}),
+                         {"_and": [{"a": {"_gt": 1}}, {"a": {"_lt": 5}}]})
+
+    def test_deduplicates(self):
+        self.assertEqual(optimize_filter({"_and": [{"a": {"_eq": 1}}, {"b": {"_eq": 2}}, {"a": {"_eq": 1}}]}),
+                         {"a": {"_eq": 1}, "b": {"_eq": 2}})
+        self.assertEqual(optimize_filter({"_or": [{"a": {"_contains": "x"}}, {"a": {"_contains": "x"}}]}),
+                         {"a": {"_contains": "x"}})
+
+    def test_merges_equals_into_in(self):
+        self.assertEqual(optimize_filter({"_or": [{"a": {"_eq": 1}}, {"a": {"_eq": 2}}, {"b": {"_eq": 3}},
+                                                  {"a": {"_in": [2, 4]}}]}),
+                         {"_or": [{"a": {"_in": [1, 2, 4]}}, {"b": {"_eq": 3}}]})
+        # 1 and True are different values, and null needs _null
+        self.assertEqual(optimize_filter({"_or": [{"a": {"_eq": 1}}, {"a": {"_eq": True}}]}),
+                         {"a": {"_in": [1, True]}})
+        self.assertEqual(optimize_filter({"_or": [{"a": {"_eq": 1}}, {"a": {"_eq": None}}]}),
+                         {"_or": [{"a": {"_eq": 1}}, {"a": {"_eq": None}}]})
+
+    def test_equals_are_not_merged_under_and(self):
+        self.assertEqual(optimize_filter({"_and": [{"a": {"_eq": 1}}, {"a": {"_eq": 2}}]}),
+                         {"_and": [{"a": {"_eq": 1}}, {"a": {"_eq": 2}}]})
+
+    def test_relation_operators(self):
+        filter = {"tags": {"_some": {"name": {"_eq": "x"}, "id": {"_gt": 1}}}}
+        self.assertEqual(optimize_filter(filter), filter)
+        self.assertEqual(optimize_filter({"_or": [{"tags": {"_some": {"name": {"_eq": "x"}}}},
+                                                  {"tags": {"_some": {"name": {"_eq": "y"}}}}]}),
+                         {"tags": {"_some": {"name": {"_in": ["x", "y"]}}}})
+        # a post without tag x or without tag y is not a post without both
+        filter = {"_or": [{"tags": {"_none": {"name": {"_eq": "x"}}}}, {"tags": {"_none": {"name": {"_eq": "y"}}}}]}
+        self.assertEqual(optimize_filter(filter), filter)
+        self.assertEqual(optimize_filter({"_and": [{"tags": {"_none": {"name": {"_eq": "x"}}}},
+                                                   {"tags": {"_none": {"name": {"_eq": "x"}}}}]}),
+                         {"tags": {"_none": {"name": {"_eq": "x"}}}})
+
+    def test_conditions_of_a_relation_stay_together(self):
+        # on a one-to-many relation both have to match the same tag
+        filter = {"tags": {"_and": [{"name": {"_eq": "x"}}, {"name": {"_eq": "y"}}]}}
+        self.assertEqual(optimize_filter(filter), filter)
+        self.assertEqual(optimize_filter({"tags": {"name": {"_eq": "x"}, "id": {"_gt": 1}}}),
+                         {"tags": {"name": {"_eq": "x"}, "id": {"_gt": 1}}})
+
+    def test_deep_dotted_keys(self):
+        filter = Filter(Operators.Equals, **{"author.role.name": "Editor", "author.role.policies.name": "Admin"})
+        self.assertEqual(filter.to_dict(), {"_and": [{"author": {"role": {"name": {"_eq": "Editor"}}}},
+                                                     {"author": {"role": {"policies": {"name": {"_eq": "Admin"}}}}}]})
+        self.assertEqual(Filter(Operators.Equals, **{"a.b.c.d": None}).compile(),
+                         {"a": {"b": {"c": {"d": {"_null": None}}}}})
+
+    def test_filters(self):
+        filter = _and(_and(Filter(Operators.Equals, status="a")), Filter(Operators.Equals, status="a"),
+                      _or(Filter(Operators.Equals, id=1), Filter(Operators.Equals, id=2)))
+        self.assertEqual(filter.compile(), {"status": {"_eq": "a"}, "id": {"_in": [1, 2]}})
+        self.assertIs(filter.compile(), filter.compile())
+        self.assertEqual(filter.__json__(), filter.compile())
+
+    def test_params(self):
+        filter = _or(Filter(Operators.Equals, id=Param("a")), Filter(Operators.Equals, id=Param("b")))
+        self.assertEqual(str(filter.compile()), "{'id': {'_in': [Param('a'), Param('b')]}}")
+
+    def test_compiled_filters_are_immutable(self):
+        filter = _and(Filter(Operators.Equals, x=1))
+        filter.compile()
+        with self.assertRaises(AttributeError):
+            filter.filters.append(Filter(Operators.Equals, y=2))
+        with self.assertRaises(TypeError):
+            filter.filters[0].filters["y"] = 2
+        with self.assertRaises(AttributeError):
+            filter.filters = (Filter(Operators.Equals, y=2),)
+        with self.assertRaises(AttributeError):
+            filter.filters[0].operator = Operators.NotEqual
+        self.assertEqual(filter.compile(), {"x": {"_eq": 1}})
+
+    def test_empty(self):
+        self.assertEqual(optimize_filter({}), {})
+        self.assertEqual(_and().compile(), {"_and": []})
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            optimize_filter({"a": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper.cache import ResponseCache
+from DirectusPyWrapper.instrumentation import Exporter, Instrumentation
+from fake_directus import FakeDirectus
+
+
+class Recorder(Exporter):
+    def __init__(self):
+        self.requests = []
+
+    def export_request(self, metrics):
+        self.requests.append(metrics)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=5).start()
+        self.recorder = Recorder()
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token, cache=ResponseCache(),
+                                 instrumentation=Instrumentation([self.recorder]))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_metrics(self):
+        response = self.directus.items("articles").read()
+        self.assertIs(response.metrics, self.recorder.requests[-1])
+        self.assertEqual(response.metrics.status_code, 200)
+        self.assertFalse(response.metrics.cache_hit)
+        self.assertGreater(response.metrics.response_bytes, 0)
+
+    def test_cache_hits_have_their_own_metrics(self):
+        fetched = self.directus.items("articles").read()
+        cached = self.directus.items("articles").read()
+        self.assertTrue(cached.metrics.cache_hit)
+        self.assertIs(cached.metrics, self.recorder.requests[-1])
+        self.assertFalse(fetched.metrics.cache_hit)
+        self.assertEqual(cached.items, fetched.items)
+
+
+if __name__ == '__main__':
+    unittest.main()
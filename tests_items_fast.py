@@ -0,0 +1,49 @@
+import unittest
+from typing import Optional
+
+import requests
+from pydantic import BaseModel, Field
+
+from DirectusPyWrapper.directus_response import DirectusResponse
+
+
+class Author(BaseModel):
+    name: str
+
+
+class Article(BaseModel):
+    id: int
+    title: str = "Untitled"
+    tags: list = Field(default_factory=list)
+    author: Optional[Author] = None
+
+
+def response(data) -> DirectusResponse:
+    raw = requests.Response()
+    raw.status_code = 200
+    raw._content = requests.compat.json.dumps({"data": data}).encode()
+    return DirectusResponse(raw)
+
+
+class TestItemsFast(unittest.TestCase):
+    def test_like_model_construct(self):
+        item, = response([{"id": 1, "author": {"name": "Panos"}}]).items_fast_as(Article)
+        self.assertEqual(item, Article.model_construct(id=1, author=Author(name="Panos")))
+        self.assertEqual(item.model_fields_set, {"id", "author"})
+        self.assertIsInstance(item.author, Author)
+
+    def test_extra_fields_are_ignored(self):
+        item, = response([{"id": 1, "title": "First", "extra": 1}]).items_fast_as(Article)
+        self.assertEqual(item.__dict__, {"id": 1, "title": "First", "tags": [], "author": None})
+        # a missing field and an extra one, as many keys as the model has fields
+        item, = response([{"title": "First", "tags": [], "author": None, "extra": 1}]).items_fast_as(Article)
+        self.assertEqual(item.__dict__, {"title": "First", "tags": [], "author": None})
+
+    def test_mutable_defaults_are_not_shared(self):
+        first, second = response([{"id": 1}, {"id": 2}]).items_fast_as(Article)
+        first.tags.append("python")
+        self.assertEqual(second.tags, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
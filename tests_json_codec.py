@@ -0,0 +1,61 @@
+import json
+import unittest
+from enum import Enum
+
+from DirectusPyWrapper._or import _or
+from DirectusPyWrapper.aggregation_operators import AggregationOperators
+from DirectusPyWrapper.filter import Filter
+from DirectusPyWrapper.json_codec import CODECS, JsonCodec, get_codec
+from DirectusPyWrapper.operators import Operators
+
+
+class Status(Enum):
+    Published = "published"
+
+
+class TestCodecs(unittest.TestCase):
+    def codecs(self):
+        for name in CODECS:
+            with self.subTest(codec=name):
+                try:
+                    yield get_codec(name)
+                except ImportError:
+                    self.skipTest(f"{name} is not installed")
+
+    def test_round_trip(self):
+        value = {"data": [{"id": 1, "title": "Καλώς ήρθατε", "views": 2.5, "tags": None, "draft": False}],
+                 "meta": {"filter_count": 1}}
+        for codec in self.codecs():
+            self.assertEqual(codec.loads(codec.dumps(value)), value)
+            self.assertEqual(codec.loads(codec.dumps(value).decode()), value)
+
+    def test_filters_and_enums(self):
+        filter = _or(Filter(Operators.Equals, status=Status.Published), Filter(Operators.GreaterThan, views=10))
+        query = {"query": {"filter": filter, "aggregate": {AggregationOperators.Count.value: "*"},
+                           "meta": AggregationOperators.CountDistinct}}
+        expected = {"query": {"filter": {"_or": [{"status": {"_eq": "published"}}, {"views": {"_gt": 10}}]},
+                              "aggregate": {"count": "*"}, "meta": "countDistinct"}}
+        for codec in self.codecs():
+            self.assertEqual(json.loads(codec.dumps(query)), expected)
+
+    def test_unsupported_values(self):
+        for codec in self.codecs():
+            with self.assertRaises(TypeError):
+                codec.dumps({"value": object()})
+
+    def test_decode_errors(self):
+        for codec in self.codecs():
+            for data in [b'{"data": [1, 2', b'not json', '{"data": }']:
+                with self.assertRaises(json.JSONDecodeError):
+                    codec.loads(data)
+
+    def test_get_codec(self):
+        codec = JsonCodec()
+        self.assertIs(get_codec(codec), codec)
+        self.assertEqual(get_codec(None).name, "json")
+        with self.assertRaises(ValueError):
+            get_codec("ujson")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import unittest
+from typing import ClassVar
+
+import requests
+from pydantic import BaseModel, field_validator
+
+from DirectusPyWrapper.directus_response import DirectusResponse, LazyItems
+
+
+class Article(BaseModel):
+    id: int
+    title: str
+
+    validated: ClassVar[list] = []
+
+    @field_validator("id")
+    @classmethod
+    def count(cls, value):
+        cls.validated.append(value)
+        return value
+
+
+def response(count: int = 5) -> DirectusResponse:
+    raw = requests.Response()
+    raw.status_code = 200
+    raw._content = json.dumps({"data": [{"id": i, "title": f"Article {i}"} for i in range(count)]}).encode()
+    return DirectusResponse(raw, collection=Article)
+
+
+class TestLazyItems(unittest.TestCase):
+    def setUp(self):
+        Article.validated = []
+
+    def test_validated_when_accessed(self):
+        items = response().lazy_items
+        self.assertIsInstance(items, LazyItems)
+        self.assertEqual(len(items), 5)
+        self.assertEqual(Article.validated, [])
+        self.assertEqual((items[3].id, items[3].title), (3, "Article 3"))
+        self.assertEqual(items[-1].id, 4)
+        self.assertEqual([item.id for item in items[1:3]], [1, 2])
+        self.assertEqual(Article.validated, [3, 4, 1, 2])
+        self.assertIs(items[1], items[1])
+
+    def test_iteration(self):
+        items = response().lazy_items
+        iterator = iter(items)
+        self.assertEqual(next(iterator).id, 0)
+        self.assertEqual(Article.validated, [0])
+        self.assertEqual([item.id for item in iterator], [1, 2, 3, 4])
+        list(items)
+        self.assertEqual(Article.validated, [0, 1, 2, 3, 4])
+
+    def test_memoized_on_the_response(self):
+        parsed = response()
+        self.assertIs(parsed.lazy_items, parsed.lazy_items)
+        self.assertIs(parsed.items, parsed.items)
+        self.assertIs(parsed.items_as_dict(), parsed.items_as_dict())
+        self.assertEqual(len(Article.validated), 5)
+        self.assertIsNone(response(0).lazy_items)
+
+
+if __name__ == '__main__':
+    unittest.main()
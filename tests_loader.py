@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+
+from DirectusPyWrapper import Directus, AsyncDirectus
+from DirectusPyWrapper.directus_response import DirectusException
+from fake_directus import FakeDirectus
+
+
+class TestDataLoader(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=20).start()
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_one_request_per_window(self):
+        loader = self.directus.loader(window=0.05)
+        requests_made = self.server.requests
+        futures = [loader.load("articles", id) for id in [3, 1, 2, 3, 99]]
+        self.assertIs(futures[0], futures[3])
+        self.assertEqual([item and item["id"] for item in (future.result(timeout=5) for future in futures)],
+                         [3, 1, 2, 3, None])
+        self.assertEqual((self.server.requests - requests_made, loader.requests), (1, 1))
+
+    def test_memoized(self):
+        loader = self.directus.loader()
+        self.assertEqual(loader.load_many("articles", [1, 2]), [
+            self.server.collections["articles"][0], self.server.collections["articles"][1]])
+        loader.load("articles", 2).result()
+        self.assertEqual(loader.requests, 1)
+        loader.clear("articles", 2)
+        loader.load("articles", 2).result(timeout=5)
+        self.assertEqual(loader.requests, 2)
+
+    def test_full_batch_is_sent_right_away(self):
+        loader = self.directus.loader(window=60, max_batch=3)
+        futures = [loader.load("articles", id) for id in [1, 2, 3]]
+        # the window is a minute, only the full batch can have been sent
+        self.assertEqual([future.result(timeout=5)["id"] for future in futures], [1, 2, 3])
+        pending = loader.load("articles", 4)
+        self.assertFalse(pending.done())
+        loader.dispatch()
+        self.assertEqual(pending.result(timeout=5)["id"], 4)
+        self.assertEqual(loader.requests, 2)
+
+    def test_errors_reach_every_caller_and_are_retried(self):
+        loader = self.directus.loader(window=0.05)
+        articles = self.server.collections.pop("articles")
+        futures = [loader.load("articles", id) for id in [1, 2]]
+        for future in futures:
+            self.assertIsInstance(future.exception(timeout=5), DirectusException)
+        self.server.collections["articles"] = articles
+        self.assertEqual(loader.load("articles", 1).result(timeout=5)["id"], 1)
+        self.assertEqual(loader.requests, 2)
+
+
+class TestAsyncDataLoader(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=20).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_loader(self, load, **options):
+        async def run():
+            async with AsyncDirectus(self.server.url, token=FakeDirectus.static_token) as directus:
+                loader = directus.loader(**options)
+                return await load(loader), loader.requests
+
+        return asyncio.run(run())
+
+    def test_gather_in_one_tick(self):
+        async def load(loader):
+            return await asyncio.gather(*(loader.load("articles", id) for id in [5, 6, 5, 99]))
+
+        items, requests_made = self.run_loader(load)
+        self.assertEqual([item and item["id"] for item in items], [5, 6, 5, None])
+        self.assertEqual(requests_made, 1)
+
+    def test_full_batches(self):
+        async def load(loader):
+            return await loader.load_many("articles", range(1, 8))
+
+        items, requests_made = self.run_loader(load, max_batch=3)
+        self.assertEqual([item["id"] for item in items], list(range(1, 8)))
+        self.assertEqual(requests_made, 3)
+
+    def test_errors_are_retried(self):
+        async def load(loader):
+            articles = self.server.collections.pop("articles")
+            results = await asyncio.gather(loader.load("articles", 1), loader.load("articles", 2),
+                                           return_exceptions=True)
+            self.server.collections["articles"] = articles
+            return results, await loader.load("articles", 1)
+
+        (results, item), requests_made = self.run_loader(load)
+        self.assertTrue(all(isinstance(result, DirectusException) for result in results))
+        self.assertEqual((item["id"], requests_made), (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+
+from DirectusPyWrapper._or import _or
+from DirectusPyWrapper.filter import Filter
+from DirectusPyWrapper.local_query import LocalCollection, compile_filter, select
+from DirectusPyWrapper.operators import Operators
+
+
+def articles() -> list[dict]:
+    return [
+        {"id": 1, "title": "First", "status": "published", "views": 10, "author": {"name": "Panos"},
+         "tags": [{"name": "python"}, {"name": "directus"}]},
+        {"id": 2, "title": "Second", "status": "draft", "views": None, "author": {"name": "Maria"},
+         "tags": [{"name": "python"}]},
+        {"id": 3, "title": None, "status": "published", "views": 30, "author": None, "tags": []},
+        {"id": 4, "title": "Fourth", "status": None, "views": 5, "author": {"name": "Panos"}, "tags": None},
+    ]
+
+
+def matching(filter) -> list[int]:
+    predicate = compile_filter(filter)
+    return [item["id"] for item in articles() if predicate(item)]
+
+
+class TestCompileFilter(unittest.TestCase):
+    def test_comparisons(self):
+        self.assertEqual(matching({"status": {"_eq": "published"}}), [1, 3])
+        self.assertEqual(matching({"views": {"_gt": 5}}), [1, 3])
+        self.assertEqual(matching({"views": {"_between": [5, 10]}}), [1, 4])
+        self.assertEqual(matching({"views": {"_null": True}}), [2])
+        self.assertEqual(matching({"title": {"_icontains": "F"}}), [1, 4])
+
+    def test_negations_exclude_null(self):
+        self.assertEqual(matching({"status": {"_neq": "published"}}), [2])
+        self.assertEqual(matching({"status": {"_nin": ["draft"]}}), [1, 3])
+        self.assertEqual(matching({"title": {"_ncontains": "ir"}}), [2, 4])
+        self.assertEqual(matching({"title": {"_nstarts_with": "F"}}), [2])
+        self.assertEqual(matching({"title": {"_nends_with": "d"}}), [1, 4])
+        self.assertEqual(matching({"views": {"_nbetween": [5, 10]}}), [3])
+        self.assertEqual(matching({"views": {"_nnull": True}}), [1, 3, 4])
+
+    def test_logical(self):
+        self.assertEqual(matching({"_or": [{"status": {"_eq": "draft"}}, {"views": {"_gte": 30}}]}), [2, 3])
+        self.assertEqual(matching({"_and": [{"status": {"_eq": "published"}}, {"views": {"_lt": 20}}]}), [1])
+
+    def test_relations(self):
+        self.assertEqual(matching({"author": {"name": {"_eq": "Panos"}}}), [1, 4])
+        self.assertEqual(matching({"tags": {"name": {"_eq": "directus"}}}), [1])
+        self.assertEqual(matching({"tags": {"_some": {"name": {"_eq": "python"}}}}), [1, 2])
+        self.assertEqual(matching({"tags": {"_none": {"name": {"_eq": "directus"}}}}), [2, 3, 4])
+
+    def test_filters(self):
+        filter = _or(Filter(Operators.Equals, status="draft"), Filter(Operators.Equals, status=None))
+        self.assertEqual(matching(filter), [2, 4])
+        self.assertEqual(matching(Filter(Operators.Equals, **{"author.name": "Maria"})), [2])
+
+    def test_unsupported_operator(self):
+        with self.assertRaises(NotImplementedError):
+            compile_filter({"location": {"_intersects": {}}})
+
+    def test_select(self):
+        self.assertEqual(select(articles()[0], ["id", "author.name", "tags.name"]),
+                         {"id": 1, "author": {"name": "Panos"}, "tags": [{"name": "python"}, {"name": "directus"}]})
+
+
+class TestLocalCollection(unittest.TestCase):
+    def setUp(self):
+        self.local = LocalCollection(articles(), indexes=["status"])
+
+    def ids(self, request) -> list[int]:
+        return [item["id"] for item in request.read().items]
+
+    def test_indexed_filters(self):
+        self.assertEqual(self.ids(self.local.items().filter(status="published")), [1, 3])
+        self.assertEqual(self.ids(self.local.items().filters([_or(Filter(Operators.Equals, status="draft"),
+                                                                  Filter(Operators.Equals, id=4))])), [2, 4])
+
+    def test_sort_limit_and_pages(self):
+        self.assertEqual(self.ids(self.local.items().sort("views")), [4, 1, 3, 2])
+        self.assertEqual(self.ids(self.local.items().sort("views", False)), [2, 3, 1, 4])
+        self.assertEqual(self.ids(self.local.items().sort("id").limit(2).page(2)), [3, 4])
+        self.assertEqual(self.ids(self.local.items().sort("id").limit(2).offset(1)), [2, 3])
+        # without a limit there is a single page
+        self.assertEqual(self.ids(self.local.items().sort("id").limit(-1).page(2)), [1, 2, 3, 4])
+
+    def test_sort_on_related_fields(self):
+        self.assertEqual(self.ids(self.local.items().sort("author.name")), [2, 1, 4, 3])
+        self.assertEqual(self.ids(self.local.items().sort("author.name", False).sort("id", False)), [3, 4, 1, 2])
+        with self.assertRaises(NotImplementedError):
+            self.local.items().sort("tags.name").read()
+
+    def test_compiled_filters_are_reused(self):
+        for _ in range(3):
+            self.assertEqual(self.ids(self.local.items().filter(views=10)), [1])
+        self.assertEqual(len(self.local._predicates), 1)
+        filter = {"title": {"_icontains": "f"}}
+        self.assertIs(self.local._predicate(filter), self.local._predicate(dict(filter)))
+
+    def test_fields_and_count(self):
+        response = self.local.items().fields("id", "author.name").filter(status="published").include_count().read()
+        self.assertEqual(response.items, [{"id": 1, "author": {"name": "Panos"}}, {"id": 3, "author": None}])
+        self.assertEqual((response.filtered_count, response.total_count), (2, 4))
+
+    def test_read_one(self):
+        self.assertEqual(self.local.items().read(id=2).item["title"], "Second")
+        self.assertEqual(self.local.items().read(id=9).status_code, 403)
+
+    def test_upsert_and_remove(self):
+        self.local.upsert([{"id": 5, "status": "draft"}, {"id": 2, "status": "published"}])
+        self.local.remove([1])
+        self.assertEqual(self.ids(self.local.items().filter(status="published")), [2, 3])
+        self.assertEqual(self.ids(self.local.items().filter(status="draft")), [5])
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.local.items().create_one({"title": "New"})
+        with self.assertRaises(NotImplementedError):
+            self.local.items().aggregate().read()
+
+
+if __name__ == '__main__':
+    unittest.main()
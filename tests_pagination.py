@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+from DirectusPyWrapper import Directus, AsyncDirectus
+from fake_directus import FakeDirectus
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=20).start()
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def ids(self, items) -> list[int]:
+        return [item["id"] for item in items]
+
+    def test_pages(self):
+        self.assertEqual(self.ids(self.directus.items("articles").iter_items(page_size=7)), list(range(1, 21)))
+
+    def test_keyset(self):
+        items = self.directus.items("articles").filter(status="published").iter_items(page_size=3, keyset="id")
+        expected = self.ids(self.directus.items("articles").filter(status="published").limit(-1).read().items)
+        self.assertEqual(self.ids(items), expected)
+
+    def test_ignores_the_page_of_the_request(self):
+        request = self.directus.items("articles").limit(5).page(3).offset(2)
+        self.assertEqual(self.ids(request.iter_items(page_size=7)), list(range(1, 21)))
+        self.assertEqual(self.ids(request.iter_items(page_size=7, keyset="id")), list(range(1, 21)))
+
+    def test_read_all(self):
+        response = self.directus.items("articles").sort("-id").read_all(concurrency=3, page_size=6)
+        self.assertEqual(self.ids(response.items), list(range(20, 0, -1)))
+
+    def test_read_all_filtered(self):
+        request = self.directus.items("articles").filter(status="published")
+        expected = self.ids(request.limit(-1).read().items)
+        response = self.directus.items("articles").filter(status="published").read_all(page_size=3)
+        self.assertEqual(self.ids(response.items), expected)
+        self.assertEqual(response.filtered_count, len(expected))
+
+    def test_read_all_single_page(self):
+        requests_made = self.server.requests
+        self.assertEqual(self.ids(self.directus.items("articles").read_all(page_size=50).items), list(range(1, 21)))
+        self.assertEqual(self.server.requests, requests_made + 1)
+
+    def test_read_all_limit_and_offset(self):
+        self.assertEqual(self.ids(self.directus.items("articles").limit(10).read_all(page_size=3).items),
+                         list(range(1, 11)))
+        self.assertEqual(self.ids(self.directus.items("articles").limit(5).offset(12).read_all(page_size=2).items),
+                         list(range(13, 18)))
+        self.assertEqual(self.ids(self.directus.items("articles").limit(8).page(3).read_all(page_size=3).items),
+                         list(range(17, 21)))
+
+    def test_async_read_all(self):
+        async def read():
+            async with AsyncDirectus(self.server.url, token=FakeDirectus.static_token) as directus:
+                return (await directus.items("articles").limit(7).offset(2).read_all(page_size=3)).items
+
+        self.assertEqual(self.ids(asyncio.run(read())), list(range(3, 10)))
+
+    def test_async_keyset(self):
+        async def read():
+            async with AsyncDirectus(self.server.url, token=FakeDirectus.static_token) as directus:
+                return [item async for item in directus.items("articles").page(2).iter_items(page_size=7, keyset="id")]
+
+        self.assertEqual(self.ids(asyncio.run(read())), list(range(1, 21)))
+
+
+if __name__ == '__main__':
+    unittest.main()
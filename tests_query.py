@@ -0,0 +1,69 @@
+import unittest
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper._or import _or
+from DirectusPyWrapper.filter import Filter
+from DirectusPyWrapper.instrumentation import Instrumentation
+from DirectusPyWrapper.operators import Operators
+from DirectusPyWrapper.query import Param, Query
+from fake_directus import FakeDirectus
+
+
+class TestQuery(unittest.TestCase):
+    def test_builders_dont_change_the_parent(self):
+        base = Query("articles").fields("id", "title")
+        published = base.filter(status="published")
+        latest = published.sort("date_created", False).limit(10)
+        self.assertEqual(dict(base.params), {"fields": "id,title"})
+        self.assertNotIn("sort", published.params)
+        self.assertEqual((latest.params["limit"], latest.params["sort"]), (10, ["-date_created"]))
+        with self.assertRaises(AttributeError):
+            base.collection = "users"
+        with self.assertRaises(TypeError):
+            base.params["limit"] = 1
+
+    def test_bind_nested_params(self):
+        compiled = Query("articles").filters([_or(Filter(Operators.Equals, status=Param("status")),
+                                                  Filter(Operators.In, id=[1, Param("id")]))]) \
+            .limit(Param("limit")).compile()
+        self.assertEqual(compiled.names, {"status", "id", "limit"})
+        self.assertIsNone(compiled.body)
+        bound = compiled.bind(status="draft", id=7, limit=5)
+        self.assertEqual(bound.query, {"filter": {"_or": [{"status": {"_eq": "draft"}}, {"id": {"_in": [1, 7]}}]},
+                                       "limit": 5})
+        self.assertIsNotNone(bound.body)
+        # the compiled query keeps its placeholders
+        self.assertEqual(len(compiled.parameters), 3)
+        partially = compiled.bind(limit=1)
+        self.assertEqual(partially.names, {"status", "id"})
+
+    def test_unknown_and_unbound_params(self):
+        compiled = Query("articles").filter(status=Param("status")).compile()
+        with self.assertRaises(ValueError):
+            compiled.bind(status="draft", views=1)
+        with self.assertRaises(ValueError):
+            compiled.read(None)
+
+
+class TestCompiledQueryRead(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=20).start()
+        self.sent = []
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token, instrumentation=Instrumentation(
+            before_request=[lambda method, url, kwargs: self.sent.append(kwargs.get("data"))]))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_read_sends_the_encoded_body(self):
+        compiled = Query("articles").fields("id").filter(status=Param("status")).sort("id").compile()
+        bound = compiled.bind(status="draft")
+        response = bound.read(self.directus)
+        self.assertIs(self.sent[-1], bound.body)
+        expected = self.directus.items("articles").fields("id").filter(status="draft").sort("id").read()
+        self.assertEqual(response.items, expected.items)
+        self.assertEqual(bound.read(self.directus, method="get").items, expected.items)
+
+
+if __name__ == '__main__':
+    unittest.main()
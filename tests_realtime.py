@@ -0,0 +1,129 @@
+import asyncio
+import queue
+import time
+import unittest
+
+from DirectusPyWrapper import Directus, AsyncDirectus
+from DirectusPyWrapper.realtime import mirror
+from DirectusPyWrapper.sync import MemoryStore
+from fake_directus import FakeDirectus
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+
+def wait_for(condition, timeout: float = 2) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@unittest.skipIf(websockets is None, "needs websockets")
+class TestRealtime(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=20, realtime=True).start()
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token)
+        self.realtime = self.directus.realtime(url=self.server.websocket_url, reconnect_delay=0.05, heartbeat=0.2)
+        self.events = queue.Queue()
+
+    def tearDown(self):
+        self.realtime.stop()
+        self.server.stop()
+
+    def next_event(self, event: str):
+        while True:
+            received = self.events.get(timeout=2)
+            if received.event == event:
+                return received
+
+    def test_subscribe(self):
+        subscription = self.realtime.subscribe(self.directus.items("articles").fields("id", "title"), self.events.put)
+        self.realtime.start()
+        self.assertTrue(subscription.ready.wait(2))
+        init = self.next_event("init")
+        self.assertEqual(len(init.items), 20)
+        self.assertEqual(set(init.items[0]), {"id", "title"})
+
+    def test_events(self):
+        subscription = self.realtime.subscribe("articles", self.events.put)
+        self.realtime.start()
+        self.assertTrue(subscription.ready.wait(2))
+        created = self.directus.items("articles").create_one({"title": "New"}).item
+        self.assertEqual(self.next_event("create").keys, [created["id"]])
+        self.directus.items("articles").update_one(3, {"title": "Changed"})
+        self.assertEqual(self.next_event("update").items[0]["title"], "Changed")
+        self.directus.items("articles").delete_one(4)
+        self.assertEqual(self.next_event("delete").keys, ["4"])
+
+    def test_only_event(self):
+        subscription = self.realtime.subscribe("articles", self.events.put, event="delete")
+        self.realtime.start()
+        self.assertTrue(subscription.ready.wait(2))
+        self.assertEqual(self.events.get(timeout=2).event, "init")
+        self.directus.items("articles").update_one(3, {"title": "Changed"})
+        self.directus.items("articles").delete_one(4)
+        self.assertEqual(self.events.get(timeout=2).event, "delete")
+
+    def test_reconnect(self):
+        subscription = self.realtime.subscribe("articles", self.events.put)
+        self.realtime.start()
+        self.assertTrue(subscription.ready.wait(2))
+        self.server.realtime.disconnect()
+        self.assertTrue(wait_for(lambda: self.realtime.connections == 2 and subscription.ready.is_set()))
+        self.directus.items("articles").update_one(5, {"title": "After reconnect"})
+        self.assertEqual(self.next_event("update").items[0]["title"], "After reconnect")
+
+    def test_callback_failure(self):
+        def callback(event):
+            if event.event == "update" and event.items[0]["id"] == 1:
+                raise ValueError("Broken callback")
+            self.events.put(event)
+
+        subscription = self.realtime.subscribe("articles", callback)
+        # the updates of the mirror fail on the missing primary key
+        self.realtime.subscribe("articles", mirror(MemoryStore()), primary_key="missing")
+        self.realtime.start()
+        self.assertTrue(subscription.ready.wait(2))
+        with self.assertLogs("DirectusPyWrapper", "ERROR") as logs:
+            self.directus.items("articles").update_one(1, {"title": "First"})
+            self.directus.items("articles").update_one(2, {"title": "Second"})
+            self.assertEqual(self.next_event("update").items[0]["id"], 2)
+        self.assertTrue(any("Broken callback" in line for line in logs.output))
+        self.assertTrue(any("KeyError" in line for line in logs.output))
+        self.assertEqual(self.realtime.connections, 1)
+
+    def test_rejected_token(self):
+        directus = Directus(self.server.url, token="unknown")
+        self.realtime = directus.realtime(url=self.server.websocket_url, reconnect_delay=0.05)
+        subscription = self.realtime.subscribe("articles", self.events.put)
+        with self.assertLogs("DirectusPyWrapper", "WARNING"):
+            self.realtime.start()
+            self.assertTrue(wait_for(lambda: self.realtime.connections >= 2))
+        # it keeps trying, so it recovers once the token is accepted
+        self.server.tokens.add("unknown")
+        self.assertTrue(subscription.ready.wait(2))
+
+    def test_async_iterator(self):
+        async def main():
+            async with AsyncDirectus(self.server.url, token=FakeDirectus.static_token) as directus:
+                realtime = directus.realtime(url=self.server.websocket_url)
+                subscription = realtime.subscribe("articles")
+                task = asyncio.create_task(realtime.run())
+                self.assertEqual((await asyncio.wait_for(anext(subscription), 2)).event, "init")
+                await asyncio.to_thread(self.directus.items("articles").update_one, 6, {"title": "Async"})
+                event = await asyncio.wait_for(anext(subscription), 2)
+                await realtime.close()
+                self.assertTrue(task.done())
+                return event
+
+        event = asyncio.run(main())
+        self.assertEqual((event.event, event.items[0]["title"]), ("update", "Async"))
+
+
+if __name__ == '__main__':
+    unittest.main()
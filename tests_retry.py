@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper.directus_response import DirectusException
+from DirectusPyWrapper.retry import RetryPolicy, TokenBucket, parse_retry_after
+
+
+class FailingDirectusHandler(BaseHTTPRequestHandler):
+    """
+    Answers every request with the next status of `server.failures`, and with 200 when they run out
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def handle_request(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.requests.append((self.command, time.monotonic()))
+        status, headers = self.server.failures.pop(0) if self.server.failures else (200, {})
+        headers = {"Content-Type": "application/json", **headers}
+        if headers["Content-Type"] == "text/html":
+            # e.g. the error page of a proxy
+            payload = b"<html><body>502 Bad Gateway</body></html>"
+        else:
+            if status == 200:
+                body = {"data": [{"id": 1}]}
+            else:
+                body = {"errors": [{"message": "Injected failure", "extensions": {"code": "INJECTED"}}]}
+            payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = do_SEARCH = handle_request
+
+
+class TestRetry(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FailingDirectusHandler)
+        self.server.failures = []
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def directus(self, **kwargs):
+        return Directus(self.url, token="token", session=requests.Session(), **kwargs)
+
+    def test_no_retry_by_default(self):
+        self.server.failures = [(503, {})]
+        with self.assertRaises(DirectusException):
+            self.directus().items("articles").read()
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_retry_transient_errors(self):
+        self.server.failures = [(502, {}), (503, {}), (504, {})]
+        retry = RetryPolicy(total=3, backoff_factor=0.01)
+        response = self.directus(retry=retry).items("articles").read()
+        self.assertTrue(response.is_success)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_give_up_after_total(self):
+        self.server.failures = [(503, {})] * 3
+        with self.assertRaises(DirectusException):
+            self.directus(retry=RetryPolicy(total=2, backoff_factor=0.01)).items("articles").read()
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_post_not_retried(self):
+        self.server.failures = [(503, {})]
+        with self.assertRaises(DirectusException):
+            self.directus(retry=RetryPolicy(backoff_factor=0.01)).items("articles").create_one({"title": "x"})
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_post_retried_on_429_with_retry_after(self):
+        self.server.failures = [(429, {"Retry-After": "0.2"})]
+        response = self.directus(retry=RetryPolicy(backoff_factor=0.01)).items("articles").create_one({"title": "x"})
+        self.assertTrue(response.is_success)
+        (_, first), (_, second) = self.server.requests
+        self.assertGreaterEqual(second - first, 0.2)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        directus = self.directus(rate_limiter=bucket)
+        start = time.monotonic()
+        for _ in range(5):
+            directus.items("articles").read()
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 20)
+
+
+    def test_bulk_error_without_json(self):
+        self.server.failures = [(502, {"Content-Type": "text/html"})]
+        report = self.directus().items("articles").bulk_update([{"id": 1}], retries=0)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.errors[0].status_code, 502)
+
+    def test_bulk_update_retried(self):
+        self.server.failures = [(503, {})]
+        report = self.directus().items("articles").bulk_update([{"id": 1}], retry_delay=0.01)
+        self.assertTrue(report.ok)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_bulk_create_not_retried(self):
+        self.server.failures = [(503, {})]
+        report = self.directus().items("articles").bulk_create([{"title": "x"}], retry_delay=0.01)
+        self.assertFalse(report.ok)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_bulk_create_retried_on_429(self):
+        self.server.failures = [(429, {})]
+        report = self.directus().items("articles").bulk_create([{"title": "x"}], retry_delay=0.01)
+        self.assertTrue(report.ok)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_bulk_not_retried_on_top_of_the_policy(self):
+        self.server.failures = [(503, {})] * 3
+        directus = self.directus(retry=RetryPolicy(total=1, backoff_factor=0.01))
+        report = directus.items("articles").bulk_update([{"id": 1}], retry_delay=0.01)
+        self.assertFalse(report.ok)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
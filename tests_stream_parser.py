@@ -0,0 +1,79 @@
+import codecs
+import io
+import json
+import unittest
+
+import requests
+
+from DirectusPyWrapper.directus_stream_response import DirectusStreamResponse, JsonStreamParser
+
+DOCUMENT = {
+    "meta": {"total_count": 3, "filter_count": 3},
+    "data": [
+        {"id": 1, "title": "Quote \" and backslash \\ and slash /", "views": 2.5e3, "score": -0.125,
+         "tags": [["a", ["b", []]], {"nested": [1, [2, [3]]]}], "draft": False, "author": None},
+        {"id": 2, "title": "Καλώς ήρθατε é 😀 \n\t", "views": 12, "tags": [], "draft": True},
+        [1, "two", [3.0, {"four": [None]}]],
+    ],
+    "extra": "after the data, with a ] and a }",
+}
+
+
+def parse(chunks) -> tuple[list, dict]:
+    # the bytes are decoded as DirectusStreamResponse does, so characters may be split as well
+    parser, decoder = JsonStreamParser(), codecs.getincrementaldecoder('utf-8')()
+    items = [item for chunk in chunks for item in parser.feed(decoder.decode(chunk))]
+    items += parser.feed(decoder.decode(b'', final=True), final=True)
+    return items, parser.document
+
+
+class TestJsonStreamParser(unittest.TestCase):
+    def setUp(self):
+        self.raw = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+        self.expected = (DOCUMENT["data"], {key: value for key, value in DOCUMENT.items() if key != "data"})
+
+    def test_whole_document(self):
+        self.assertEqual(parse([self.raw]), self.expected)
+
+    def test_every_split(self):
+        for split in range(1, len(self.raw)):
+            with self.subTest(split=split):
+                self.assertEqual(parse([self.raw[:split], self.raw[split:]]), self.expected)
+
+    def test_single_bytes(self):
+        self.assertEqual(parse([self.raw[i:i + 1] for i in range(len(self.raw))]), self.expected)
+
+    def test_escaped_document(self):
+        # ASCII only, the escapes \" \\ \uXXXX themselves are split
+        raw = json.dumps(DOCUMENT, indent=2).encode()
+        self.assertEqual(parse([raw[i:i + 1] for i in range(len(raw))]), self.expected)
+        raw = rb'{"data": ["a\/b", "\ud83d\ude00", "\"]"]}'
+        self.assertEqual(parse([raw[i:i + 1] for i in range(len(raw))]), (["a/b", "😀", '"]'], {}))
+
+    def test_numbers_at_the_end_of_a_chunk(self):
+        raw = b'{"data": [12, 2.5, -1e3], "meta": {"total_count": 345}}'
+        for split in range(1, len(raw)):
+            with self.subTest(split=split):
+                self.assertEqual(parse([raw[:split], raw[split:]]), ([12, 2.5, -1e3], {"meta": {"total_count": 345}}))
+
+    def test_single_item(self):
+        self.assertEqual(parse([b'{"data": {"id"', b': 1}}']), ([{"id": 1}], {}))
+        self.assertEqual(parse([b'{"data": nu', b'll}']), ([], {}))
+
+    def test_truncated(self):
+        with self.assertRaises(json.JSONDecodeError):
+            parse([self.raw[:-2]])
+
+
+class TestDirectusStreamResponse(unittest.TestCase):
+    def test_items_and_meta(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(json.dumps(DOCUMENT, ensure_ascii=False).encode())
+        stream = DirectusStreamResponse(response, chunk_size=7)
+        self.assertEqual(list(stream), DOCUMENT["data"])
+        self.assertEqual((stream.total_count, stream.filtered_count), (3, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from DirectusPyWrapper import Directus, AsyncDirectus
+from DirectusPyWrapper.models import User
+from DirectusPyWrapper.sync import AsyncCollectionSync, CollectionSync, MemoryStore
+from fake_directus import FakeDirectus
+
+
+class TestCollectionSync(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=20).start()
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_incremental_runs(self):
+        # the sort of the request is replaced by the keyset pagination on the primary key
+        sync = CollectionSync(self.directus.items("articles").sort("title"), MemoryStore(), page_size=7)
+        self.assertEqual(sync.run().upserted, 20)
+        self.assertEqual(sync.run().upserted, 0)
+        self.directus.items("articles").update_one(3, {"title": "Changed"})
+        result = sync.run()
+        self.assertEqual(result.upserted, 1)
+        self.assertEqual(sync.store.get(3)["title"], "Changed")
+        self.assertEqual(sync.run().upserted, 0)
+
+    def test_items_written_at_the_mark(self):
+        sync = CollectionSync(self.directus.items("articles"), MemoryStore())
+        mark = sync.run().mark
+        # written after the run, with the same date as the mark
+        created = self.directus.items("articles").create_one({"title": "Late", "date_created": mark}).item
+        self.assertEqual(sync.run().upserted, 1)
+        self.assertEqual(sync.store.get(created["id"])["title"], "Late")
+        self.assertEqual(sync.run().upserted, 0)
+
+    def test_reconcile(self):
+        sync = CollectionSync(self.directus.items("articles"), MemoryStore())
+        sync.run()
+        self.directus.items("articles").delete_one(5)
+        self.assertEqual(sync.run(reconcile=True).deleted, 1)
+        self.assertIsNone(sync.store.get(5))
+        self.assertEqual(len(sync.store), 19)
+
+    def test_reconcile_typed_collection(self):
+        sync = CollectionSync(self.directus.collection(User), MemoryStore())
+        self.assertEqual(sync.run(reconcile=True).deleted, 0)
+        del self.server.collections["directus_users"][4]
+        self.assertEqual(sync.run(reconcile=True).deleted, 1)
+        self.assertIsNone(sync.store.get("user-4"))
+
+    def test_async_reconcile_typed_collection(self):
+        async def run():
+            async with AsyncDirectus(self.server.url, token=FakeDirectus.static_token) as directus:
+                sync = AsyncCollectionSync(directus.collection(User), MemoryStore())
+                await sync.run()
+                del self.server.collections["directus_users"][4]
+                return await sync.run(reconcile=True)
+
+        self.assertEqual(asyncio.run(run()).deleted, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+import requests
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper.directus_response import DirectusException, DirectusResponse
+from DirectusPyWrapper.translations import TranslationCache
+from fake_directus import FakeDirectus
+
+
+def error(status_code: int) -> DirectusException:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b'{"errors": [{"message": "Failure", "extensions": {"code": "FAILURE"}}]}'
+    try:
+        DirectusResponse(response)
+    except DirectusException as e:
+        return e
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=1).start()
+        self.server.collections['translations'] = [
+            {'id': 1, 'key': 'welcome', 'date_created': '2024-01-01T00:00:00.000Z', 'date_updated': None,
+             'translations': [{'languages_code': 'el-GR', 'translation': 'Καλώς ήρθατε'}]}]
+        self.directus = Directus(self.server.url, token=FakeDirectus.static_token)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_lookups_are_cached(self):
+        cache = TranslationCache(self.directus, ttl=60)
+        self.assertEqual(cache.get('welcome', 'el-GR'), 'Καλώς ήρθατε')
+        requests_made = self.server.requests
+        self.assertEqual(cache.get('missing', 'el-GR', default='Missing'), 'Missing')
+        self.assertEqual(self.server.requests, requests_made)
+
+    def test_reloads_when_changed(self):
+        cache = TranslationCache(self.directus, ttl=0)
+        cache.get('welcome', 'el-GR')
+        self.assertFalse(cache.refresh())
+        report = cache.create(['welcome', 'goodbye'])
+        self.assertEqual(report.ids, [2])
+        self.assertTrue(cache.refresh())
+        self.assertIn('goodbye', cache.table)
+
+    def test_failed_refresh_keeps_the_table(self):
+        cache = TranslationCache(self.directus, ttl=0)
+        cache.get('welcome', 'el-GR')
+        del self.server.collections['translations']
+        with self.assertLogs('DirectusPyWrapper', 'WARNING'):
+            self.assertEqual(cache.get('welcome', 'el-GR'), 'Καλώς ήρθατε')
+
+    def test_probe_of_a_collection_that_cant_be_read(self):
+        cache = TranslationCache(self.directus, ttl=0, probe=['missing'])
+        self.assertEqual(cache.get('welcome', 'el-GR'), 'Καλώς ήρθατε')
+        self.assertEqual(cache.probe, [])
+
+    def test_probe_kept_on_server_errors(self):
+        cache = TranslationCache(self.directus)
+        with self.assertRaises(DirectusException):
+            cache._probe_failed(error(503))
+        self.assertEqual(cache.probe, ['translations'])
+        cache._probe_failed(error(404))
+        self.assertEqual(cache.probe, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+
+import httpx
+import requests
+
+from DirectusPyWrapper import Directus
+from DirectusPyWrapper.transport import HttpxSession, create_async_client, create_session
+from fake_directus import FakeDirectus
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+
+class TestCreateSession(unittest.TestCase):
+    def adapter(self, session: requests.Session):
+        return session.get_adapter("https://directus.example.com")
+
+    def test_default(self):
+        session = create_session()
+        self.assertIsInstance(session, requests.Session)
+        self.assertEqual((self.adapter(session)._pool_maxsize, self.adapter(session)._pool_block), (10, False))
+
+    def test_pool_size(self):
+        adapter = self.adapter(create_session(pool_size=32, max_keepalive=4))
+        self.assertEqual((adapter._pool_maxsize, adapter._pool_block), (32, True))
+        adapter = self.adapter(create_session(max_keepalive=4))
+        self.assertEqual((adapter._pool_maxsize, adapter._pool_block), (4, False))
+
+    def test_async_client(self):
+        async def create():
+            async with create_async_client(timeout=3, pool_size=8, max_keepalive=2, keepalive_expiry=1.5) as client:
+                pool = client._transport._pool
+                return client.timeout, pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry
+
+        self.assertEqual(asyncio.run(create()), (httpx.Timeout(3), 8, 2, 1.5))
+
+
+@unittest.skipIf(h2 is None, "h2 is not installed")
+class TestHttpxSession(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeDirectus(size=5).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_round_trip(self):
+        session = create_session(pool_size=4, keepalive_expiry=1.5, http2=True)
+        self.assertIsInstance(session, HttpxSession)
+        self.assertEqual(session.client._transport._pool._keepalive_expiry, 1.5)
+        directus = Directus(self.server.url, token=FakeDirectus.static_token, session=session)
+        try:
+            self.assertEqual(len(directus.items("articles").read().items), 5)
+            created = directus.items("articles").create_one({"title": "New"}).item
+            self.assertEqual(directus.items("articles").read(id=created["id"], method="get").item["title"], "New")
+        finally:
+            session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()